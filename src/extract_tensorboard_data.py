@@ -26,9 +26,8 @@ except ImportError:
 try:
     from tensorboard.backend.event_processing.event_accumulator import EventAccumulator
 except ImportError:
-    print("ERROR: tensorboard package not found.")
-    print("Install with: pip install tensorboard")
-    sys.exit(1)
+    # Checked in main() and extract_scalars(), so the filters can be imported without it (dashboard)
+    EventAccumulator = None
 
 
 def find_tensorboard_logs(training_dir: Path) -> Optional[Path]:
@@ -51,11 +50,15 @@ def find_tensorboard_logs(training_dir: Path) -> Optional[Path]:
     return None
 
 
-def extract_scalars(log_dir: Path) -> Dict[str, List[Dict]]:
+def extract_scalars(log_dir: Path, verbose: bool = True) -> Dict[str, List[Dict]]:
     """
     Extract all scalar data from TensorBoard event files.
     Returns a dictionary mapping tag names to lists of (step, value) pairs.
+    Raises ImportError if tensorboard is not installed.
     """
+    if EventAccumulator is None:
+        raise ImportError("tensorboard package not found (pip install tensorboard)")
+    
     # Create EventAccumulator
     ea = EventAccumulator(str(log_dir))
     ea.Reload()
@@ -64,10 +67,12 @@ def extract_scalars(log_dir: Path) -> Dict[str, List[Dict]]:
     scalar_tags = ea.Tags().get('scalars', [])
     
     if not scalar_tags:
-        print(f"Warning: No scalar data found in {log_dir}")
+        if verbose:
+            print(f"Warning: No scalar data found in {log_dir}")
         return {}
     
-    print(f"Found {len(scalar_tags)} scalar tags")
+    if verbose:
+        print(f"Found {len(scalar_tags)} scalar tags")
     
     # Extract data for each tag
     extracted_data = {}
@@ -86,11 +91,20 @@ def extract_scalars(log_dir: Path) -> Dict[str, List[Dict]]:
         ]
         
         extracted_data[tag] = data_points
-        print(f"  - {tag}: {len(data_points)} data points")
+        if verbose:
+            print(f"  - {tag}: {len(data_points)} data points")
     
     return extracted_data
 
 
+def values_by_step(points: List[Dict]) -> Dict[int, float]:
+    """step -> value of a tag's points (the first one when a step repeats)."""
+    values = {}
+    for point in points:
+        values.setdefault(point["step"], point["value"])
+    return values
+
+
 def filter_action_distribution(scalars: Dict[str, List[Dict]]) -> List[Dict]:
     """
     Extract action distribution percentages over time.
@@ -113,6 +127,7 @@ def filter_action_distribution(scalars: Dict[str, List[Dict]]) -> List[Dict]:
                 all_steps.add(point["step"])
     
     # Build combined data points
+    values = {tag: values_by_step(scalars[tag]) for tag in action_tags if tag in scalars}
     result = []
     for step in sorted(all_steps):
         point = {"step": step}
@@ -121,15 +136,8 @@ def filter_action_distribution(scalars: Dict[str, List[Dict]]) -> List[Dict]:
             # Extract the action name from tag (e.g., "Actions/JumpPercentage" -> "jump")
             action_name = tag.replace("Actions/", "").replace("Percentage", "").lower()
             
-            # Find value for this step
-            value = None
-            if tag in scalars:
-                for data_point in scalars[tag]:
-                    if data_point["step"] == step:
-                        value = data_point["value"]
-                        break
-            
-            point[action_name] = value
+            # Value for this step
+            point[action_name] = values[tag].get(step) if tag in values else None
         
         result.append(point)
     
@@ -203,27 +211,15 @@ def filter_losses(scalars: Dict[str, List[Dict]]) -> List[Dict]:
             all_steps.add(point["step"])
     
     # Build combined data points
+    policy_values = values_by_step(scalars[policy_tag]) if policy_tag else {}
+    value_values = values_by_step(scalars[value_tag]) if value_tag else {}
     result = []
     for step in sorted(all_steps):
         point = {"step": step}
         
-        # Get policy loss
-        policy_loss = None
-        if policy_tag:
-            for data_point in scalars[policy_tag]:
-                if data_point["step"] == step:
-                    policy_loss = data_point["value"]
-                    break
-        point["policy_loss"] = policy_loss
-        
-        # Get value loss
-        value_loss = None
-        if value_tag:
-            for data_point in scalars[value_tag]:
-                if data_point["step"] == step:
-                    value_loss = data_point["value"]
-                    break
-        point["value_loss"] = value_loss
+        # Get policy loss and value loss
+        point["policy_loss"] = policy_values.get(step)
+        point["value_loss"] = value_values.get(step)
         
         result.append(point)
     
@@ -249,6 +245,14 @@ def filter_entropy(scalars: Dict[str, List[Dict]]) -> List[Dict]:
     ]
 
 
+# run_logs/ files of the time series graphs (Graphs 2, 7 and 8) and the filters building their "data" rows
+SERIES_FILES = {
+    "action_distribution_over_time.json": filter_action_distribution,
+    "losses_over_time.json": filter_losses,
+    "entropy_over_time.json": filter_entropy,
+}
+
+
 def filter_episode_data(scalars: Dict[str, List[Dict]]) -> List[Dict]:
     """
     Extract episode data (length, max distance, success) from TensorBoard.
@@ -277,31 +281,16 @@ def filter_episode_data(scalars: Dict[str, List[Dict]]) -> List[Dict]:
             all_steps.add(point["step"])
     
     # Build episode data (each step represents an episode checkpoint)
+    lengths = values_by_step(scalars[length_tag]) if has_length else {}
+    max_distances = values_by_step(scalars[max_distance_tag]) if has_max_distance else {}
+    total_rewards = values_by_step(scalars[reward_tag]) if has_reward else {}
     episodes = []
     episode_number = 1
     
     for step in sorted(all_steps):
-        length = None
-        max_distance = None
-        total_reward = None
-        
-        if has_length:
-            for point in scalars[length_tag]:
-                if point["step"] == step:
-                    length = point["value"]
-                    break
-        
-        if has_max_distance:
-            for point in scalars[max_distance_tag]:
-                if point["step"] == step:
-                    max_distance = point["value"]
-                    break
-        
-        if has_reward:
-            for point in scalars[reward_tag]:
-                if point["step"] == step:
-                    total_reward = point["value"]
-                    break
+        length = lengths.get(step)
+        max_distance = max_distances.get(step)
+        total_reward = total_rewards.get(step)
         
         # Only add if we have meaningful data
         if length is not None or max_distance is not None:
@@ -339,6 +328,11 @@ def main():
     
     args = parser.parse_args()
     
+    if EventAccumulator is None:
+        print("ERROR: tensorboard package not found.")
+        print("Install with: pip install tensorboard")
+        sys.exit(1)
+    
     # Determine training directory
     script_dir = Path(__file__).parent
     results_dir = script_dir / args.results_dir
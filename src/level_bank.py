@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Seeded level bank for the parkour environment.
+
+Generates large corpora of platform layouts (TrainingArea.GeneratePlatforms +
+UpdateTargetPosition) in vectorized chunks and writes them to a memory-mapped
+bank on disk, together with per-layout difficulty statistics so seeds can be
+picked without replaying them in Unity.
+
+Every layout is a pure function of its 64-bit seed (counter-based splitmix64
+hashing), so a layout is identical no matter how the bank was chunked, and a
+single seed can be regenerated on its own.
+
+Bank layout (one directory):
+    bank.json       - metadata (count, base seed, generator config)
+    platforms.npy   - float32 (count, platform_count, 3): left, right, top
+    target_x.npy    - float32 (count,)
+    stats.npy       - structured per-layout difficulty statistics
+
+Usage:
+    python level_bank.py generate --count 1000000 --output level_banks/default
+    python level_bank.py info level_banks/default
+    python level_bank.py select level_banks/default --sort min-jump-margin --limit 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from parkour_sim import CharacterConfig, layouts_from_uniforms
+
+
+BANK_FORMAT_VERSION = 1
+
+# Per-layout difficulty statistics (stats.npy)
+STATS_DTYPE = np.dtype([
+    ('seed', np.uint64),
+    ('course_length', np.float32),   # target_x (spawn at x=0)
+    ('max_gap', np.float32),
+    ('mean_gap', np.float32),
+    ('height_variance', np.float32),
+    ('max_rise', np.float32),        # largest upward step between platforms
+    ('max_drop', np.float32),        # largest downward step between platforms
+    ('required_jumps', np.int16),    # transitions that can't be walked
+    ('sprint_jumps', np.int16),      # jumps a jog-speed jump can't clear
+    ('impossible_jumps', np.int16),  # jumps even a sprint jump can't clear
+    ('min_jump_margin', np.float32), # tightest jog-jump reach minus distance needed
+])
+
+STAT_NAMES = [name for name in STATS_DTYPE.names if name != 'seed']
+
+DEFAULT_CHUNK_SIZE = 65536
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer on uint64 arrays (wrapping arithmetic)."""
+    x = x + _GOLDEN
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def seed_uniforms(seeds: np.ndarray, num_draws: int) -> np.ndarray:
+    """
+    Counter-based uniforms in [0, 1): draw k of seed s is hash(hash(s) + k).
+    Returns float64 array of shape (len(seeds), num_draws).
+    """
+    keys = _splitmix64(np.asarray(seeds, dtype=np.uint64))
+    counters = np.arange(num_draws, dtype=np.uint64) * _GOLDEN
+    with np.errstate(over='ignore'):
+        bits = _splitmix64(keys[:, None] + counters[None, :])
+    # Top 53 bits -> double in [0, 1)
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def layouts_from_seeds(seeds: np.ndarray, config: Optional[CharacterConfig] = None) -> Dict[str, np.ndarray]:
+    """Generate one layout per seed (same dict as parkour_sim.generate_platforms)."""
+    config = config or CharacterConfig()
+    count = config.platform_count
+    u = seed_uniforms(seeds, 4 * count)
+    return layouts_from_uniforms(u[:, :count], u[:, count:2 * count],
+                                 u[:, 2 * count:3 * count], u[:, 3 * count:], config)
+
+
+def _jump_reach(speed: float, rise: np.ndarray, config: CharacterConfig, dt: float) -> np.ndarray:
+    """
+    Ballistic horizontal reach of a jump at `speed` landing `rise` units higher
+    (jumpForce up, gravity down, one frame of jumpForwardBoost). -inf if the
+    rise is above the jump apex.
+    """
+    c = config
+    disc = c.jump_force ** 2 + 2.0 * c.gravity * rise
+    airtime = (c.jump_force + np.sqrt(np.maximum(disc, 0.0))) / -c.gravity
+    reach = speed * airtime + c.jump_forward_boost * dt
+    return np.where(disc >= 0.0, reach, -np.inf)
+
+
+def layout_stats(layouts: Dict[str, np.ndarray], seeds: np.ndarray,
+                 config: Optional[CharacterConfig] = None, dt: float = 0.02) -> np.ndarray:
+    """
+    Difficulty statistics for a batch of layouts.
+    
+    Jump counts are a ballistic estimate: a transition needs a jump when the gap
+    is wider than the controller or the rise is above stepOffset, and needs a
+    sprint when a jog-speed jump from the edge falls short.
+    """
+    c = config or CharacterConfig()
+    lefts = layouts['lefts']
+    rights = layouts['rights']
+    tops = layouts['tops']
+    
+    gaps = lefts[:, 1:] - rights[:, :-1]
+    rises = np.diff(tops, axis=1)
+    # Center travels from right edge + radius (last supported spot) to left edge - radius
+    needed = gaps - 2.0 * c.controller_radius
+    
+    needs_jump = (needed > 0.0) | (rises > c.controller_step_offset)
+    jog_reach = _jump_reach(c.move_speed, rises, c, dt)
+    sprint_reach = _jump_reach(c.sprint_speed, rises, c, dt)
+    
+    stats = np.zeros(len(seeds), dtype=STATS_DTYPE)
+    stats['seed'] = seeds
+    stats['course_length'] = layouts['target_x']
+    stats['max_gap'] = gaps.max(axis=1)
+    stats['mean_gap'] = gaps.mean(axis=1)
+    stats['height_variance'] = tops.var(axis=1)
+    stats['max_rise'] = np.maximum(rises.max(axis=1), 0.0)
+    stats['max_drop'] = np.maximum(-rises.min(axis=1), 0.0)
+    stats['required_jumps'] = needs_jump.sum(axis=1)
+    stats['sprint_jumps'] = (needs_jump & (jog_reach < needed)).sum(axis=1)
+    stats['impossible_jumps'] = (needs_jump & (sprint_reach < needed)).sum(axis=1)
+    margins = np.where(needs_jump, jog_reach - needed, np.inf)
+    stats['min_jump_margin'] = np.where(needs_jump.any(axis=1), margins.min(axis=1), 0.0)
+    return stats
+
+
+def generate_bank(output: Path, count: int, base_seed: int = 0,
+                  config: Optional[CharacterConfig] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE, verbose: bool = True) -> Path:
+    """
+    Write `count` layouts with seeds base_seed .. base_seed + count - 1 to a bank
+    directory, chunk by chunk into memory-mapped .npy files.
+    """
+    config = config or CharacterConfig()
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    p = config.platform_count
+    
+    platforms = np.lib.format.open_memmap(output / 'platforms.npy', mode='w+',
+                                          dtype=np.float32, shape=(count, p, 3))
+    target_x = np.lib.format.open_memmap(output / 'target_x.npy', mode='w+',
+                                         dtype=np.float32, shape=(count,))
+    stats = np.lib.format.open_memmap(output / 'stats.npy', mode='w+',
+                                      dtype=STATS_DTYPE, shape=(count,))
+    
+    start = time.perf_counter()
+    for lo in range(0, count, chunk_size):
+        hi = min(lo + chunk_size, count)
+        seeds = np.arange(base_seed + lo, base_seed + hi, dtype=np.uint64)
+        layouts = layouts_from_seeds(seeds, config)
+        platforms[lo:hi, :, 0] = layouts['lefts']
+        platforms[lo:hi, :, 1] = layouts['rights']
+        platforms[lo:hi, :, 2] = layouts['tops']
+        target_x[lo:hi] = layouts['target_x']
+        stats[lo:hi] = layout_stats(layouts, seeds, config)
+        if verbose:
+            rate = hi / (time.perf_counter() - start)
+            print(f"\r  {hi:,}/{count:,} layouts ({rate:,.0f}/sec)", end='', flush=True)
+    if verbose:
+        print()
+    
+    for array in (platforms, target_x, stats):
+        array.flush()
+    del platforms, target_x, stats
+    
+    metadata = {
+        'format_version': BANK_FORMAT_VERSION,
+        'count': count,
+        'base_seed': base_seed,
+        'platform_count': p,
+        'created': datetime.now().isoformat(),
+        'config': asdict(config),
+    }
+    with open(output / 'bank.json', 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return output
+
+
+class LevelBank:
+    """Read-only, memory-mapped view of a level bank directory."""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / 'bank.json', 'r') as f:
+            self.metadata = json.load(f)
+        self.config = CharacterConfig(**self.metadata['config'])
+        self.platforms = np.load(self.path / 'platforms.npy', mmap_mode='r')
+        self.target_x = np.load(self.path / 'target_x.npy', mmap_mode='r')
+        self.stats = np.load(self.path / 'stats.npy', mmap_mode='r')
+    
+    def __len__(self) -> int:
+        return len(self.target_x)
+    
+    def layouts(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Layouts at the given bank indices (same dict as generate_platforms)."""
+        indices = np.asarray(indices)
+        platforms = np.asarray(self.platforms[indices], dtype=np.float64)
+        return {
+            'lefts': platforms[:, :, 0],
+            'rights': platforms[:, :, 1],
+            'tops': platforms[:, :, 2],
+            'target_x': np.asarray(self.target_x[indices], dtype=np.float64),
+        }
+    
+    def select(self, filters: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+               sort: Optional[str] = None, descending: bool = False,
+               limit: Optional[int] = None) -> np.ndarray:
+        """
+        Bank indices whose stats fall in the given {stat: (min, max)} ranges,
+        optionally sorted by a stat and truncated to `limit`.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, (low, high) in (filters or {}).items():
+            column = self.stats[name]
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        indices = np.nonzero(mask)[0]
+        
+        if sort:
+            keys = np.asarray(self.stats[sort][indices])
+            order = np.argsort(-keys if descending else keys, kind='stable')
+            indices = indices[order]
+        if limit is not None:
+            indices = indices[:limit]
+        return indices
+    
+    def sampler(self, indices: Optional[np.ndarray] = None) -> Callable:
+        """
+        Layout source for ParkourBatchEnv.set_layout_source: samples layouts
+        uniformly from `indices` (default: the whole bank).
+        """
+        pool = np.arange(len(self)) if indices is None else np.asarray(indices)
+        if len(pool) == 0:
+            raise ValueError("Cannot sample from an empty selection")
+        
+        def source(rng: np.random.Generator, count: int) -> Dict[str, np.ndarray]:
+            return self.layouts(pool[rng.integers(0, len(pool), size=count)])
+        return source
+
+
+def _parse_filters(args) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """Collect --min-<stat>/--max-<stat> arguments into select() filters."""
+    filters = {}
+    for name in STAT_NAMES:
+        low = getattr(args, f'min_{name}')
+        high = getattr(args, f'max_{name}')
+        if low is not None or high is not None:
+            filters[name] = (low, high)
+    return filters
+
+
+def print_info(bank: LevelBank):
+    """Print bank metadata and a summary of every difficulty statistic."""
+    meta = bank.metadata
+    print("=" * 80)
+    print(f"LEVEL BANK: {bank.path}")
+    print("=" * 80)
+    print(f"Layouts:   {meta['count']:,} (seeds {meta['base_seed']:,} .. {meta['base_seed'] + meta['count'] - 1:,})")
+    print(f"Platforms: {meta['platform_count']} per layout")
+    print(f"Created:   {meta['created']}")
+    print()
+    print(f"{'Statistic':<18} {'Min':>10} {'Mean':>10} {'P50':>10} {'P95':>10} {'Max':>10}")
+    print("-" * 72)
+    for name in STAT_NAMES:
+        column = np.asarray(bank.stats[name], dtype=np.float64)
+        p50, p95 = np.percentile(column, [50, 95])
+        print(f"{name:<18} {column.min():>10.2f} {column.mean():>10.2f} "
+              f"{p50:>10.2f} {p95:>10.2f} {column.max():>10.2f}")
+
+
+def print_selection(bank: LevelBank, indices: np.ndarray, columns: List[str]):
+    """Print the selected layouts' seeds and stats as a table."""
+    header = f"{'Index':>10} {'Seed':>12} " + ' '.join(f"{name:>16}" for name in columns)
+    print(header)
+    print("-" * len(header))
+    for i in indices:
+        row = bank.stats[i]
+        values = ' '.join(f"{float(row[name]):>16.2f}" for name in columns)
+        print(f"{i:>10} {int(row['seed']):>12} {values}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate and query seeded parkour level banks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python level_bank.py generate --count 1000000 --output level_banks/default
+  python level_bank.py info level_banks/default
+  python level_bank.py select level_banks/default --sort max-gap --descending --limit 20
+  python level_bank.py select level_banks/default --sort min-jump-margin --limit 50
+  python level_bank.py select level_banks/default --min-sprint-jumps 4 --max-impossible-jumps 0
+        """
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    gen = subparsers.add_parser('generate', help='Generate a new level bank')
+    gen.add_argument('--count', type=int, default=1000000, help='Number of layouts (default: 1000000)')
+    gen.add_argument('--seed', type=int, default=0, help='First layout seed (default: 0)')
+    gen.add_argument('--output', type=str, default='level_banks/default', help='Bank directory')
+    gen.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                     help=f'Layouts generated per vectorized call (default: {DEFAULT_CHUNK_SIZE})')
+    gen.add_argument('--config', type=str, default=None,
+                     help='JSON file with CharacterConfig overrides (snake_case or camelCase keys)')
+    
+    info = subparsers.add_parser('info', help='Show bank metadata and difficulty distribution')
+    info.add_argument('bank', type=str, help='Bank directory')
+    
+    select = subparsers.add_parser('select', help='Find seeds matching difficulty filters')
+    select.add_argument('bank', type=str, help='Bank directory')
+    select.add_argument('--sort', type=lambda name: name.replace('-', '_'), choices=STAT_NAMES,
+                        default=None, help='Statistic to sort by')
+    select.add_argument('--descending', action='store_true', help='Sort from highest to lowest')
+    select.add_argument('--limit', type=int, default=20, help='Maximum layouts to show (default: 20)')
+    for name in STAT_NAMES:
+        flag = name.replace('_', '-')
+        select.add_argument(f'--min-{flag}', type=float, default=None, help=argparse.SUPPRESS)
+        select.add_argument(f'--max-{flag}', type=float, default=None, help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'generate':
+        config = CharacterConfig()
+        if args.config:
+            with open(args.config, 'r') as f:
+                config = CharacterConfig.from_dict(json.load(f))
+        print(f"Generating {args.count:,} layouts into {args.output}...")
+        start = time.perf_counter()
+        generate_bank(Path(args.output), args.count, args.seed, config, args.chunk_size)
+        elapsed = time.perf_counter() - start
+        print(f"✓ Done in {elapsed:.1f}s ({args.count / elapsed:,.0f} layouts/sec)")
+        return
+    
+    bank_path = Path(args.bank)
+    if not (bank_path / 'bank.json').exists():
+        print(f"[FAIL] Not a level bank: {bank_path}")
+        sys.exit(1)
+    bank = LevelBank(bank_path)
+    
+    if args.command == 'info':
+        print_info(bank)
+    else:
+        filters = _parse_filters(args)
+        indices = bank.select(filters, args.sort, args.descending, args.limit)
+        matches = len(bank.select(filters)) if args.limit is not None else len(indices)
+        print(f"{matches:,} of {len(bank):,} layouts match")
+        print()
+        columns = [args.sort] if args.sort else []
+        columns += [name for name in ('max_gap', 'height_variance', 'sprint_jumps', 'min_jump_margin')
+                    if name not in columns]
+        print_selection(bank, indices, columns)
+
+
+if __name__ == "__main__":
+    main()
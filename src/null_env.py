@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Null-physics stand-in for the Unity player, for benchmarking trainer overhead.
+
+Speaks the ML-Agents environment protocol (gRPC, communication version 1.5.0)
+exactly like the Unity Editor does: mlagents-learn listens on a port and this
+process connects to it. It exposes the ParkourRunner behavior (14-float vector
+observation, one discrete branch of 5 actions) for N agents and answers every
+step with precomputed synthetic observations and rewards, so the measured
+throughput is the cost of mlagents-learn itself (TorchPolicy.evaluate,
+communicator, buffer updates and PPO updates).
+
+Start the trainer without --env (it waits for the "Editor"), then start this:
+    mlagents-learn parkour_config.yaml --run-id=null_env_bench --force
+    python null_env.py                          # Default: 28 agents, port 5004
+
+Usage:
+    python null_env.py [--port 5004] [--num-agents 28] [--episode-length 1000]
+"""
+
+import argparse
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+try:
+    import grpc
+    from mlagents_envs.communicator_objects.agent_info_pb2 import AgentInfoProto
+    from mlagents_envs.communicator_objects.brain_parameters_pb2 import ActionSpecProto, BrainParametersProto
+    from mlagents_envs.communicator_objects.capabilities_pb2 import UnityRLCapabilitiesProto
+    from mlagents_envs.communicator_objects.command_pb2 import QUIT, RESET
+    from mlagents_envs.communicator_objects.header_pb2 import HeaderProto
+    from mlagents_envs.communicator_objects.observation_pb2 import NONE as COMPRESSION_NONE
+    from mlagents_envs.communicator_objects.observation_pb2 import DEFAULT as OBSERVATION_DEFAULT
+    from mlagents_envs.communicator_objects.observation_pb2 import ObservationProto
+    from mlagents_envs.communicator_objects.unity_message_pb2 import UnityMessageProto
+    from mlagents_envs.communicator_objects.unity_output_pb2 import UnityOutputProto
+    from mlagents_envs.communicator_objects.unity_rl_initialization_output_pb2 import (
+        UnityRLInitializationOutputProto,
+    )
+    from mlagents_envs.communicator_objects.unity_rl_output_pb2 import UnityRLOutputProto
+    from mlagents_envs.communicator_objects.unity_to_external_pb2_grpc import UnityToExternalProtoStub
+except ImportError:
+    print("Error: mlagents-envs is not installed")
+    print("Install with: pip install mlagents-envs==1.1.0")
+    sys.exit(1)
+
+
+# Matches the Unity side (com.unity.ml-agents 4.0.0)
+COMMUNICATION_VERSION = "1.5.0"
+PACKAGE_VERSION = "4.0.0"
+ENVIRONMENT_NAME = "NullParkourEnv"
+
+# ParkourRunner behavior spec (ParkourAgent.CollectObservations / OnActionReceived)
+BEHAVIOR_NAME = "ParkourRunner?team=0"
+OBSERVATION_SIZE = 14
+DISCRETE_BRANCHES = [5]
+
+# DimensionPropertyProto.NONE, what VectorSensor reports
+DIMENSION_PROPERTY_NONE = 1
+
+# Synthetic per-decision reward: roughly the progress reward of a jogging agent
+STEP_REWARD = 0.03
+
+MAX_MESSAGE_LENGTH = 1024 * 1024 * 64
+
+
+def build_capabilities() -> UnityRLCapabilitiesProto:
+    """Capabilities advertised by com.unity.ml-agents 4.0.0."""
+    return UnityRLCapabilitiesProto(
+        baseRLCapabilities=True,
+        concatenatedPngObservations=True,
+        compressedChannelMapping=True,
+        hybridActions=True,
+        trainingAnalytics=True,
+        variableLengthObservation=True,
+        multiAgentGroups=True,
+    )
+
+
+def build_brain_parameters() -> BrainParametersProto:
+    """BrainParameters for the ParkourRunner behavior."""
+    return BrainParametersProto(
+        brain_name=BEHAVIOR_NAME,
+        is_training=True,
+        action_spec=ActionSpecProto(
+            num_continuous_actions=0,
+            num_discrete_actions=len(DISCRETE_BRANCHES),
+            discrete_branch_sizes=DISCRETE_BRANCHES,
+        ),
+    )
+
+
+class NullParkourEnv:
+    """
+    Synthetic ParkourRunner agents. Observations are drawn once up front and
+    cycled, so producing a step costs almost nothing beyond protobuf encoding.
+    """
+    
+    def __init__(self, num_agents: int, episode_length: int, seed: int = 0):
+        self.num_agents = num_agents
+        self.episode_length = episode_length
+        rng = np.random.default_rng(seed)
+        # A small pool of plausible observations (normalized raycasts/stamina in [0, 1])
+        pool = rng.random((64, OBSERVATION_SIZE)).astype(np.float32)
+        pool[:, 0] = rng.uniform(0.0, 1300.0, size=64)
+        self.observation_pool: List[List[float]] = pool.tolist()
+        # Stagger episode ends so agents don't all reset on the same step
+        self.episode_steps = rng.integers(0, episode_length, size=num_agents)
+        self.step_count = 0
+        self.infos = [self._new_info(agent_id) for agent_id in range(num_agents)]
+    
+    def _new_info(self, agent_id: int) -> AgentInfoProto:
+        observation = ObservationProto(
+            shape=[OBSERVATION_SIZE],
+            compression_type=COMPRESSION_NONE,
+            dimension_properties=[DIMENSION_PROPERTY_NONE],
+            observation_type=OBSERVATION_DEFAULT,
+            name=f"VectorSensor_size{OBSERVATION_SIZE}",
+        )
+        observation.float_data.data.extend(self.observation_pool[agent_id % len(self.observation_pool)])
+        return AgentInfoProto(id=agent_id, reward=0.0, done=False, max_step_reached=False,
+                              observations=[observation])
+    
+    def reset(self) -> UnityRLOutputProto:
+        """Fresh episode for every agent."""
+        self.episode_steps[:] = 0
+        for info in self.infos:
+            info.reward = 0.0
+            info.done = False
+            info.max_step_reached = False
+        return self._output()
+    
+    def step(self) -> UnityRLOutputProto:
+        """Advance every agent one decision and report the new AgentInfos."""
+        self.step_count += 1
+        self.episode_steps += 1
+        ended = self.episode_steps >= self.episode_length
+        pool = self.observation_pool
+        for agent_id, info in enumerate(self.infos):
+            data = info.observations[0].float_data.data
+            data[:] = pool[(agent_id + self.step_count) % len(pool)]
+            info.reward = STEP_REWARD
+            # Ended episodes report an interrupted timeout (like ParkourAgent's episodeTimeout)
+            info.done = bool(ended[agent_id])
+            info.max_step_reached = info.done
+        self.episode_steps[ended] = 0
+        return self._output()
+    
+    def _output(self) -> UnityRLOutputProto:
+        output = UnityRLOutputProto()
+        output.agentInfos[BEHAVIOR_NAME].value.extend(self.infos)
+        return output
+
+
+def wrap(output: UnityOutputProto = None) -> UnityMessageProto:
+    """UnityMessageProto with a 200 header, like RpcCommunicator.WrapMessage."""
+    message = UnityMessageProto(header=HeaderProto(status=200))
+    if output is not None:
+        message.unity_output.CopyFrom(output)
+    return message
+
+
+def run(port: int, num_agents: int, episode_length: int, max_steps: int,
+        report_interval: float, connect_timeout: float):
+    """Connect to mlagents-learn on `port` and serve synthetic steps until told to quit."""
+    channel = grpc.insecure_channel(
+        f"localhost:{port}",
+        options=[('grpc.max_send_message_length', MAX_MESSAGE_LENGTH),
+                 ('grpc.max_receive_message_length', MAX_MESSAGE_LENGTH)],
+    )
+    print(f"Connecting to trainer on port {port}...")
+    try:
+        grpc.channel_ready_future(channel).result(timeout=connect_timeout)
+    except grpc.FutureTimeoutError:
+        print(f"[FAIL] No trainer listening on port {port}")
+        print("Start mlagents-learn without --env first (it waits for the Editor).")
+        sys.exit(1)
+    stub = UnityToExternalProtoStub(channel)
+    env = NullParkourEnv(num_agents, episode_length)
+    
+    # Handshake (RpcCommunicator.Initialize): send academy parameters, then an
+    # empty message whose reply is the first real input.
+    init_output = UnityOutputProto(rl_initialization_output=UnityRLInitializationOutputProto(
+        name=ENVIRONMENT_NAME,
+        communication_version=COMMUNICATION_VERSION,
+        package_version=PACKAGE_VERSION,
+        capabilities=build_capabilities(),
+    ))
+    reply = stub.Exchange(wrap(init_output))
+    if reply.header.status != 200:
+        print(f"[FAIL] Trainer rejected handshake: {reply.header.message}")
+        sys.exit(1)
+    init_input = reply.unity_input.rl_initialization_input
+    print(f"[OK] Connected (trainer package {init_input.package_version}, "
+          f"protocol {init_input.communication_version}, seed {init_input.seed})")
+    reply = stub.Exchange(wrap())
+    
+    brain_sent = False
+    steps = 0
+    round_trip = 0.0
+    local = 0.0
+    window_start = time.perf_counter()
+    window_steps = 0
+    start = window_start
+    
+    print(f"Serving {num_agents} synthetic ParkourRunner agents "
+          f"(episode length {episode_length} decisions)")
+    print("=" * 80)
+    while reply.header.status == 200:
+        rl_input = reply.unity_input.rl_input
+        if rl_input.command == QUIT:
+            break
+        
+        t0 = time.perf_counter()
+        rl_output = env.reset() if rl_input.command == RESET else env.step()
+        output = UnityOutputProto(rl_output=rl_output)
+        if not brain_sent:
+            # Brain parameters go out with the first output that has agents of the behavior
+            output.rl_initialization_output.brain_parameters.extend([build_brain_parameters()])
+            brain_sent = True
+        message = wrap(output)
+        t1 = time.perf_counter()
+        try:
+            reply = stub.Exchange(message)
+        except grpc.RpcError:
+            # Trainer shut down its server (max_steps reached or Ctrl+C)
+            break
+        t2 = time.perf_counter()
+        
+        local += t1 - t0
+        round_trip += t2 - t1
+        steps += 1
+        window_steps += 1
+        if t2 - window_start >= report_interval:
+            rate = window_steps / (t2 - window_start)
+            print(f"  step {steps:>8,} | {rate:>8,.1f} steps/sec | "
+                  f"{rate * num_agents:>10,.0f} agent-decisions/sec | "
+                  f"trainer {round_trip / steps * 1000:.2f} ms/step, env {local / steps * 1000:.3f} ms/step")
+            window_start = t2
+            window_steps = 0
+        if max_steps and steps >= max_steps:
+            break
+    
+    elapsed = time.perf_counter() - start
+    channel.close()
+    print("=" * 80)
+    print("NULL ENV SUMMARY")
+    print("=" * 80)
+    if steps == 0:
+        print("No steps exchanged")
+        return
+    print(f"Steps exchanged:         {steps:,}")
+    print(f"Agent decisions:         {steps * num_agents:,}")
+    print(f"Wall time:               {elapsed:.1f}s")
+    print(f"Steps/sec:               {steps / elapsed:,.1f}")
+    print(f"Agent decisions/sec:     {steps * num_agents / elapsed:,.0f}")
+    print(f"Trainer time per step:   {round_trip / steps * 1000:.3f} ms")
+    print(f"Null env time per step:  {local / steps * 1000:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Null-physics ParkourRunner environment for trainer throughput benchmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Terminal 1: trainer waits for an "Editor" on port 5004
+  mlagents-learn parkour_config.yaml --run-id=null_env_bench --force
+  
+  # Terminal 2: connect the null environment
+  python null_env.py
+  python null_env.py --num-agents 112 --max-steps 20000
+        """
+    )
+    parser.add_argument('--port', '--mlagents-port', type=int, default=5004,
+                        help='Trainer port (default: 5004, mlagents-learn base port)')
+    parser.add_argument('--num-agents', type=int, default=28,
+                        help='Synthetic agents (default: 28, one per TrainingArea in the scene)')
+    parser.add_argument('--episode-length', type=int, default=1000,
+                        help='Decisions per synthetic episode (default: 1000)')
+    parser.add_argument('--max-steps', type=int, default=0,
+                        help='Stop after this many exchanges (default: 0, run until the trainer stops)')
+    parser.add_argument('--report-interval', type=float, default=5.0,
+                        help='Seconds between throughput reports (default: 5)')
+    parser.add_argument('--connect-timeout', type=float, default=60.0,
+                        help='Seconds to wait for the trainer (default: 60)')
+    
+    args = parser.parse_args()
+    run(args.port, args.num_agents, args.episode_length, args.max_steps,
+        args.report_interval, args.connect_timeout)
+
+
+if __name__ == "__main__":
+    main()
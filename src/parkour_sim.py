@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Vectorized NumPy re-implementation of the ParkourAgent environment.
+
+Steps thousands of parkour episodes at once with array operations so that
+training experiments and reward analysis don't need the Unity player.
+
+Mirrors the Unity side as closely as a 2D (x/y) model allows:
+- ParkourAgent.OnActionReceived: idle/jump/jog/sprint/roll gating, stamina
+  costs, sprint cooldown, reward terms and episode termination
+- ParkourAgent.FixedUpdate: stamina drain/regen, movement, gravity
+- ParkourAgent.CollectObservations: the 14-float observation layout
+  (to-target, velocity, grounded, 5 down raycasts, forward raycast, stamina)
+- TrainingArea.GeneratePlatforms / UpdateTargetPosition: platform layouts
+- CharacterConfig: all physics constants and reward weights
+
+One env step is one agent decision. Like the DecisionRequester on the agent
+prefab (DecisionPeriod 5, TakeActionsBetweenDecisions), each decision is
+repeated for `decision_period` physics steps of Time.fixedDeltaTime (0.02s).
+
+Usage:
+    python parkour_sim.py --benchmark                      # Default: 4096 envs
+    python parkour_sim.py --benchmark --num-envs 16384 --steps 500
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# Action indices (ParkourAgent: 0=idle, 1=jump, 2=jog, 3=sprint, 4=roll)
+IDLE, JUMP, JOG, SPRINT, ROLL = 0, 1, 2, 3, 4
+NUM_ACTIONS = 5
+ACTION_NAMES = ['idle', 'jump', 'jog', 'sprint', 'roll']
+
+OBSERVATION_SIZE = 14
+
+# Same keys and order as TrainingLogger.RewardComponents / reward_components.json
+REWARD_COMPONENTS = [
+    'progressReward',
+    'rollBaseReward',
+    'rollStyleBonus',
+    'targetReachReward',
+    'groundedReward',
+    'lowStaminaPenalty',
+    'timePenalty',
+    'fallPenalty',
+]
+
+# End reasons (TrainingLogger.EndEpisode endReason)
+END_SUCCESS, END_FELL, END_TIMEOUT = 0, 1, 2
+END_REASONS = ['Success', 'Fell', 'Timeout']
+
+
+@dataclass
+class CharacterConfig:
+    """
+    Python mirror of CharacterConfig.cs (defaults match the ScriptableObject)
+    plus the hardcoded constants from ParkourAgent.cs and TrainingArea.cs.
+    """
+    # Movement
+    move_speed: float = 6.0
+    sprint_speed: float = 12.0
+    jump_force: float = 8.0
+    jump_forward_boost: float = 10.0
+    gravity: float = -20.0
+    grounded_velocity_reset: float = -2.0
+    
+    # Stamina
+    max_stamina: float = 100.0
+    stamina_consumption_rate: float = 20.0
+    jump_stamina_cost: float = 20.0
+    roll_stamina_cost: float = 60.0
+    stamina_regen_rate: float = 30.0
+    low_stamina_penalty: float = -0.002
+    
+    # RL agent settings
+    progress_reward_multiplier: float = 0.1
+    time_penalty: float = -0.001
+    target_reach_distance: float = 2.0
+    target_reach_reward: float = 10.0
+    fall_threshold: float = -5.0
+    fall_penalty: float = -1.0
+    episode_timeout: float = 100.0
+    obstacle_raycast_distance: float = 10.0
+    
+    # Style rewards
+    roll_base_reward: float = 0.5
+    roll_style_bonus: float = 1.5
+    style_episode_frequency: float = 0.4
+    
+    # Hardcoded in ParkourAgent.cs
+    grounded_reward: float = 0.001
+    sprint_cooldown_duration: float = 0.5
+    roll_duration: float = 0.6
+    roll_speed_multiplier: float = 1.5
+    
+    # CharacterController on the agent prefab
+    controller_radius: float = 0.5
+    controller_height: float = 2.0
+    controller_step_offset: float = 0.3
+    
+    # TrainingArea.cs serialized defaults
+    platform_count: int = 20
+    platform_thickness: float = 10.0
+    gap_min: float = 2.5
+    gap_max: float = 4.5
+    platform_width_min: float = 20.0
+    platform_width_max: float = 28.0
+    long_platform_probability: float = 0.8
+    long_platform_multiplier: float = 3.0
+    height_change_min: float = -0.6
+    height_change_max: float = 1.2
+    absolute_height_min: float = -0.5
+    absolute_height_max: float = 5.0
+    target_offset: float = 5.0
+    spawn_height: float = 1.25
+    
+    @classmethod
+    def from_dict(cls, values: Dict) -> 'CharacterConfig':
+        """
+        Build a config from a dict of overrides.
+        Accepts both snake_case field names and the camelCase names used in
+        CharacterConfig.cs (e.g. 'progressRewardMultiplier').
+        """
+        known = {f.name for f in fields(cls)}
+        kwargs = {}
+        for key, value in values.items():
+            name = _snake_case(key)
+            if name not in known:
+                raise KeyError(f"Unknown CharacterConfig field: {key}")
+            kwargs[name] = value
+        return cls(**kwargs)
+
+
+def _snake_case(name: str) -> str:
+    """Convert a camelCase CharacterConfig name to snake_case."""
+    out = []
+    for ch in name:
+        if ch.isupper():
+            out.append('_')
+            out.append(ch.lower())
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def generate_platforms(rng: np.random.Generator, num_layouts: int,
+                       config: CharacterConfig) -> Dict[str, np.ndarray]:
+    """
+    Vectorized TrainingArea.GeneratePlatforms for `num_layouts` arenas.
+    
+    Returns platform left/right edges and top heights, shape (num_layouts, platform_count),
+    and the target x position from UpdateTargetPosition, shape (num_layouts,).
+    """
+    shape = (num_layouts, config.platform_count)
+    return layouts_from_uniforms(rng.random(shape), rng.random(shape),
+                                 rng.random(shape), rng.random(shape), config)
+
+
+def layouts_from_uniforms(height_u: np.ndarray, width_u: np.ndarray, long_u: np.ndarray,
+                          gap_u: np.ndarray, config: CharacterConfig) -> Dict[str, np.ndarray]:
+    """
+    Build platform layouts from [0, 1) draws, shape (num_layouts, platform_count) each.
+    
+    Split out of generate_platforms so other random sources (e.g. the per-seed
+    hashes in level_bank.py) produce exactly the same layouts.
+    """
+    c = config
+    num_layouts, count = height_u.shape
+    
+    # Heights: random walk clamped to the absolute range, first platform at 0
+    changes = c.height_change_min + (c.height_change_max - c.height_change_min) * height_u
+    tops = np.empty((num_layouts, count))
+    tops[:, 0] = np.clip(0.0, c.absolute_height_min, c.absolute_height_max)
+    for i in range(1, count):
+        tops[:, i] = np.clip(tops[:, i - 1] + changes[:, i],
+                             c.absolute_height_min, c.absolute_height_max)
+    
+    # Widths: 80% of platforms are "long" (3x the base width)
+    widths = c.platform_width_min + (c.platform_width_max - c.platform_width_min) * width_u
+    widths = np.where(long_u < c.long_platform_probability, widths * c.long_platform_multiplier, widths)
+    
+    # Gaps (edge-to-edge); platform 0 is centered on the spawn point
+    gaps = c.gap_min + (c.gap_max - c.gap_min) * gap_u
+    gaps[:, 0] = 0.0
+    
+    lefts = np.empty((num_layouts, count))
+    lefts[:, 0] = -widths[:, 0] / 2.0
+    # left_i = right_{i-1} + gap_i  =>  cumulative sum of previous widths and gaps
+    offsets = np.cumsum(widths[:, :-1] + gaps[:, 1:], axis=1)
+    lefts[:, 1:] = lefts[:, :1] + offsets
+    rights = lefts + widths
+    
+    return {
+        'lefts': lefts,
+        'rights': rights,
+        'tops': tops,
+        'target_x': rights[:, -1] + c.target_offset,
+    }
+
+
+class ParkourBatchEnv:
+    """
+    Batch of independent parkour arenas stepped together with NumPy.
+    
+    Episodes that end are reset automatically (like ML-Agents' EndEpisode),
+    so `step` always returns observations for the next decision.
+    """
+    
+    def __init__(self, num_envs: int, config: Optional[CharacterConfig] = None,
+                 seed: Optional[int] = None, decision_period: int = 5,
+                 fixed_delta_time: float = 0.02):
+        self.num_envs = num_envs
+        self.config = config or CharacterConfig()
+        self.decision_period = decision_period
+        self.dt = fixed_delta_time
+        self.rng = np.random.default_rng(seed)
+        self.layout_source = None
+        
+        n = num_envs
+        p = self.config.platform_count
+        self.lefts = np.zeros((n, p))
+        self.rights = np.zeros((n, p))
+        self.tops = np.zeros((n, p))
+        self.target_x = np.zeros(n)
+        
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.vy = np.zeros(n)
+        # controller.velocity (actual displacement per physics step)
+        self.velocity_x = np.zeros(n)
+        self.velocity_y = np.zeros(n)
+        self.grounded = np.zeros(n, dtype=bool)
+        self.stamina = np.zeros(n)
+        self.action = np.zeros(n, dtype=np.int64)
+        self.prev_action = np.full(n, -1, dtype=np.int64)
+        self.last_sprint_end = np.full(n, -1.0)
+        self.just_jumped = np.zeros(n, dtype=bool)
+        self.rolling = np.zeros(n, dtype=bool)
+        self.roll_start = np.zeros(n)
+        self.style_enabled = np.zeros(n, dtype=bool)
+        # Per-env Time.time stand-in (never reset, like the Unity clock)
+        self.clock = np.zeros(n)
+        self.episode_timer = np.zeros(n)
+        self.last_progress_x = np.zeros(n)
+        self.start_x = np.zeros(n)
+        self.max_distance = np.zeros(n)
+        
+        self.episode_reward = np.zeros(n)
+        self.reward_components = np.zeros((n, len(REWARD_COMPONENTS)))
+        self.action_counts = np.zeros((n, NUM_ACTIONS), dtype=np.int64)
+        
+        self._arange = np.arange(n)
+    
+    def set_layout_source(self, source) -> None:
+        """
+        Use `source(rng, count)` instead of generate_platforms to produce layouts.
+        The callable must return the same dict as generate_platforms.
+        """
+        self.layout_source = source
+    
+    # ------------------------------------------------------------------
+    # Episode management
+    # ------------------------------------------------------------------
+    
+    def reset(self) -> np.ndarray:
+        """Reset every arena and return the first observations."""
+        self._reset_envs(self._arange)
+        return self._observe()
+    
+    def _reset_envs(self, idx: np.ndarray) -> None:
+        """OnEpisodeBegin + TrainingArea.ResetArea for the given env indices."""
+        if len(idx) == 0:
+            return
+        c = self.config
+        
+        if self.layout_source is not None:
+            layout = self.layout_source(self.rng, len(idx))
+        else:
+            layout = generate_platforms(self.rng, len(idx), c)
+        self.lefts[idx] = layout['lefts']
+        self.rights[idx] = layout['rights']
+        self.tops[idx] = layout['tops']
+        self.target_x[idx] = layout['target_x']
+        
+        self.x[idx] = 0.0
+        self.y[idx] = c.spawn_height
+        self.vy[idx] = 0.0
+        self.velocity_x[idx] = 0.0
+        self.velocity_y[idx] = 0.0
+        self.grounded[idx] = False
+        self.stamina[idx] = c.max_stamina
+        self.action[idx] = IDLE
+        self.prev_action[idx] = -1
+        self.last_sprint_end[idx] = -1.0
+        self.just_jumped[idx] = False
+        self.rolling[idx] = False
+        self.roll_start[idx] = 0.0
+        self.style_enabled[idx] = self.rng.random(len(idx)) < c.style_episode_frequency
+        self.episode_timer[idx] = 0.0
+        self.last_progress_x[idx] = 0.0
+        self.start_x[idx] = 0.0
+        self.max_distance[idx] = 0.0
+        
+        self.episode_reward[idx] = 0.0
+        self.reward_components[idx] = 0.0
+        self.action_counts[idx] = 0
+    
+    # ------------------------------------------------------------------
+    # Stepping
+    # ------------------------------------------------------------------
+    
+    def step(self, actions: np.ndarray):
+        """
+        Apply one decision per env (repeated for decision_period physics steps).
+        
+        Returns (obs, rewards, dones, info). For envs that finished an episode,
+        `obs` already holds the first observation of the next episode and
+        info['terminal_obs'] holds the final observation of the finished one.
+        info['episodes'] summarizes finished episodes (TrainingLogger fields).
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        rewards = np.zeros(self.num_envs)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        end_reason = np.full(self.num_envs, -1, dtype=np.int64)
+        
+        for _ in range(self.decision_period):
+            live = ~dones
+            step_reward, step_done, step_reason = self._physics_step(actions, live)
+            rewards += step_reward
+            end_reason = np.where(step_done, step_reason, end_reason)
+            dones |= step_done
+        
+        obs = self._observe()
+        info = {}
+        done_idx = np.nonzero(dones)[0]
+        if len(done_idx):
+            info['terminal_obs'] = obs[done_idx].copy()
+            info['episodes'] = {
+                'env_index': done_idx,
+                'total_reward': self.episode_reward[done_idx].copy(),
+                'length': self.episode_timer[done_idx].copy(),
+                'max_distance': self.max_distance[done_idx].copy(),
+                'success': end_reason[done_idx] == END_SUCCESS,
+                'end_reason': end_reason[done_idx],
+                'style_enabled': self.style_enabled[done_idx].copy(),
+                'reward_components': self.reward_components[done_idx].copy(),
+                'action_counts': self.action_counts[done_idx].copy(),
+            }
+            self._reset_envs(done_idx)
+            obs[done_idx] = self._observe(done_idx)
+        
+        return obs, rewards.astype(np.float32), dones, info
+    
+    def _physics_step(self, requested: np.ndarray, live: np.ndarray):
+        """One academy step: OnActionReceived followed by FixedUpdate."""
+        c = self.config
+        dt = self.dt
+        n = self.num_envs
+        
+        self.clock += np.where(live, dt, 0.0)
+        
+        # --- OnActionReceived: action gating ---
+        a = requested.copy()
+        a[(a == SPRINT) & (self.stamina <= 0.0)] = JOG
+        cooldown = ((a == SPRINT) & (self.last_sprint_end >= 0.0) &
+                    (self.clock - self.last_sprint_end < c.sprint_cooldown_duration))
+        a[cooldown] = JOG
+        stopped_sprint = live & (self.prev_action == SPRINT) & (a != SPRINT)
+        self.last_sprint_end = np.where(stopped_sprint, self.clock, self.last_sprint_end)
+        self.prev_action = np.where(live, a, self.prev_action)
+        a[(a == JUMP) & (self.stamina < c.jump_stamina_cost)] = IDLE
+        a[(a == ROLL) & ((self.stamina < c.roll_stamina_cost) | self.rolling)] = IDLE
+        self.action = np.where(live, a, self.action)
+        
+        self.episode_timer += np.where(live, dt, 0.0)
+        # Action counts use the requested (original) action, like LogEpisodeStats
+        np.add.at(self.action_counts, (self._arange[live], requested[live]), 1)
+        
+        jump = live & (a == JUMP) & self.grounded
+        self.stamina = np.where(jump, np.maximum(0.0, self.stamina - c.jump_stamina_cost), self.stamina)
+        self.vy = np.where(jump, c.jump_force, self.vy)
+        self.just_jumped |= jump
+        
+        roll = live & (a == ROLL) & self.grounded & ~self.rolling
+        self.stamina = np.where(roll, np.maximum(0.0, self.stamina - c.roll_stamina_cost), self.stamina)
+        self.rolling |= roll
+        self.roll_start = np.where(roll, self.clock, self.roll_start)
+        
+        # --- OnActionReceived: rewards ---
+        components = np.zeros((n, len(REWARD_COMPONENTS)))
+        
+        progress = self.x - self.last_progress_x
+        components[:, 0] = np.where(progress > 0.0, progress * c.progress_reward_multiplier, 0.0)
+        self.last_progress_x = np.where(live, self.x, self.last_progress_x)
+        self.max_distance = np.where(live, np.maximum(self.max_distance, self.x - self.start_x),
+                                     self.max_distance)
+        
+        components[:, 4] = np.where(self.grounded, c.grounded_reward, 0.0)
+        components[:, 5] = np.where(self.stamina / c.max_stamina < 0.2, c.low_stamina_penalty, 0.0)
+        rolled = (a == ROLL) & self.rolling
+        components[:, 1] = np.where(rolled, c.roll_base_reward, 0.0)
+        components[:, 2] = np.where(rolled & self.style_enabled, c.roll_style_bonus, 0.0)
+        components[:, 6] = c.time_penalty
+        
+        reached = live & (np.abs(self.x - self.target_x) < c.target_reach_distance)
+        components[:, 3] = np.where(reached, c.target_reach_reward, 0.0)
+        
+        fell = live & ~reached & (self.y < c.fall_threshold)
+        timed_out = live & ~reached & ~fell & (self.episode_timer > c.episode_timeout)
+        failed = fell | timed_out
+        components[:, 7] = np.where(failed, c.fall_penalty, 0.0)
+        
+        components[~live] = 0.0
+        step_reward = components.sum(axis=1)
+        self.reward_components += components
+        self.episode_reward += step_reward
+        
+        done = reached | failed
+        reason = np.where(reached, END_SUCCESS, np.where(fell, END_FELL, END_TIMEOUT))
+        
+        # --- FixedUpdate: stamina, movement, gravity ---
+        moving = live & ~done
+        a = self.action
+        sprinting = moving & (a == SPRINT) & (self.stamina > 0.0)
+        drained = np.maximum(0.0, self.stamina - c.stamina_consumption_rate * dt)
+        emptied = sprinting & (drained <= 0.0)
+        regen = moving & ~sprinting & (a != SPRINT) & (a != JUMP) & (a != ROLL)
+        self.stamina = np.where(sprinting, drained, self.stamina)
+        self.stamina = np.where(regen, np.minimum(c.max_stamina, self.stamina + c.stamina_regen_rate * dt),
+                                self.stamina)
+        self.action = np.where(emptied, JOG, self.action)
+        self.last_sprint_end = np.where(emptied, self.clock, self.last_sprint_end)
+        a = self.action
+        
+        roll_over = self.rolling & (self.clock - self.roll_start >= c.roll_duration)
+        self.rolling = np.where(moving, self.rolling & ~roll_over, self.rolling)
+        
+        dx = np.zeros(n)
+        dx += np.where(a == JOG, c.move_speed * dt, 0.0)
+        dx += np.where((a == SPRINT) & (self.stamina > 0.0), c.sprint_speed * dt, 0.0)
+        dx += np.where(self.just_jumped, c.jump_forward_boost * dt, 0.0)
+        dx += np.where(self.rolling, c.sprint_speed * c.roll_speed_multiplier * dt, 0.0)
+        self.just_jumped = np.where(moving, False, self.just_jumped)
+        
+        vy = np.where(~self.grounded, self.vy + c.gravity * dt,
+                      np.where(self.vy < 0.0, c.grounded_velocity_reset, self.vy))
+        self.vy = np.where(moving, vy, self.vy)
+        
+        new_x, new_y, grounded = self._move(self.x + dx, self.y + self.vy * dt)
+        self.velocity_x = np.where(moving, (new_x - self.x) / dt, self.velocity_x)
+        self.velocity_y = np.where(moving, (new_y - self.y) / dt, self.velocity_y)
+        self.x = np.where(moving, new_x, self.x)
+        self.y = np.where(moving, new_y, self.y)
+        self.grounded = np.where(moving, grounded, self.grounded)
+        
+        return step_reward, done, reason
+    
+    def _platform_index(self, x: np.ndarray) -> np.ndarray:
+        """Index of the last platform whose left edge is <= x (-1 if none)."""
+        return (self.lefts <= x[:, None]).sum(axis=1) - 1
+    
+    def _move(self, target_x: np.ndarray, target_y: np.ndarray):
+        """
+        CharacterController.Move against the platform boxes: blocks horizontal
+        movement into taller platforms and snaps onto platform tops.
+        """
+        c = self.config
+        r = c.controller_radius
+        last = self.lefts.shape[1] - 1
+        
+        # Wall collision with the next platform ahead of the capsule center
+        current = self._platform_index(self.x)
+        ahead = np.clip(current + 1, 0, last)
+        has_ahead = current < last
+        wall_left = self.lefts[self._arange, ahead]
+        wall_top = self.tops[self._arange, ahead]
+        blocks = (has_ahead & (target_x + r > wall_left) &
+                  (wall_top > self.y + c.controller_step_offset) &
+                  (wall_top - c.platform_thickness < self.y + c.controller_height))
+        new_x = np.where(blocks, np.minimum(target_x, wall_left - r), target_x)
+        
+        # Ground under the capsule footprint
+        idx = self._platform_index(new_x + r)
+        safe = np.clip(idx, 0, last)
+        supported = (idx >= 0) & (self.rights[self._arange, safe] >= new_x - r)
+        ground = np.where(supported, self.tops[self._arange, safe], -np.inf)
+        lands = supported & (target_y <= ground) & (self.y >= ground - c.controller_step_offset)
+        new_y = np.where(lands, ground, target_y)
+        return new_x, new_y, lands
+    
+    # ------------------------------------------------------------------
+    # Observations
+    # ------------------------------------------------------------------
+    
+    def _observe(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """CollectObservations for all envs (or the given indices)."""
+        c = self.config
+        if idx is None:
+            idx = self._arange
+        x = self.x[idx]
+        y = self.y[idx]
+        lefts = self.lefts[idx]
+        rights = self.rights[idx]
+        tops = self.tops[idx]
+        rows = np.arange(len(idx))
+        last = lefts.shape[1] - 1
+        
+        obs = np.zeros((len(idx), OBSERVATION_SIZE), dtype=np.float32)
+        # Target position relative to the agent (target sits at spawn height)
+        obs[:, 0] = self.target_x[idx] - x
+        obs[:, 1] = c.spawn_height - y
+        obs[:, 2] = 0.0
+        # controller.velocity
+        obs[:, 3] = self.velocity_x[idx]
+        obs[:, 4] = self.velocity_y[idx]
+        obs[:, 5] = 0.0
+        obs[:, 6] = self.grounded[idx].astype(np.float32)
+        
+        # Down raycasts 2/4/6/8/10 units ahead, origin 0.5 above the feet, 10 units long
+        max_ray = 10.0
+        origin_y = y + 0.5
+        for k, forward in enumerate((2.0, 4.0, 6.0, 8.0, 10.0)):
+            px = x + forward
+            pidx = (lefts <= px[:, None]).sum(axis=1) - 1
+            safe = np.clip(pidx, 0, last)
+            over = (pidx >= 0) & (rights[rows, safe] >= px)
+            dist = origin_y - tops[rows, safe]
+            hit = over & (dist >= 0.0) & (dist <= max_ray)
+            obs[:, 7 + k] = np.where(hit, dist / max_ray, 1.0)
+        
+        # Forward obstacle raycast from the feet
+        ray = c.obstacle_raycast_distance
+        ahead = (lefts <= x[:, None]).sum(axis=1)
+        has_ahead = ahead <= last
+        safe = np.clip(ahead, 0, last)
+        wall_dist = lefts[rows, safe] - x
+        wall_top = tops[rows, safe]
+        hit = (has_ahead & (wall_dist <= ray) & (wall_top > y) &
+               (wall_top - c.platform_thickness <= y))
+        obs[:, 12] = np.where(hit, wall_dist / ray, 1.0)
+        
+        obs[:, 13] = self.stamina[idx] / c.max_stamina
+        return obs
+
+
+def random_policy(rng: np.random.Generator, num_envs: int) -> np.ndarray:
+    """Uniform random actions, biased towards forward movement like an early policy."""
+    return rng.choice(NUM_ACTIONS, size=num_envs, p=[0.1, 0.15, 0.35, 0.3, 0.1])
+
+
+def run_benchmark(num_envs: int, steps: int, seed: int, decision_period: int) -> Dict[str, float]:
+    """Step `num_envs` arenas with a random policy and report throughput."""
+    env = ParkourBatchEnv(num_envs, seed=seed, decision_period=decision_period)
+    rng = np.random.default_rng(seed)
+    env.reset()
+    
+    episodes = 0
+    successes = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, dones, info = env.step(random_policy(rng, num_envs))
+        if 'episodes' in info:
+            episodes += len(info['episodes']['env_index'])
+            successes += int(info['episodes']['success'].sum())
+    elapsed = time.perf_counter() - start
+    
+    decisions = num_envs * steps
+    return {
+        'elapsed_seconds': elapsed,
+        'decisions_per_second': decisions / elapsed,
+        'physics_steps_per_second': decisions * decision_period / elapsed,
+        'episodes': episodes,
+        'success_rate': successes / episodes if episodes else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Vectorized NumPy parkour environment (Unity-free)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python parkour_sim.py --benchmark                       # 4096 envs, 1000 decisions
+  python parkour_sim.py --benchmark --num-envs 16384      # Bigger batch
+        """
+    )
+    parser.add_argument('--benchmark', action='store_true', help='Run the throughput benchmark')
+    parser.add_argument('--num-envs', type=int, default=4096, help='Number of parallel arenas (default: 4096)')
+    parser.add_argument('--steps', type=int, default=1000, help='Decisions per env (default: 1000)')
+    parser.add_argument('--decision-period', type=int, default=5, help='Physics steps per decision (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    
+    args = parser.parse_args()
+    
+    if not args.benchmark:
+        parser.print_help()
+        return
+    
+    print(f"Benchmarking {args.num_envs:,} envs x {args.steps:,} decisions "
+          f"(decision period {args.decision_period})...")
+    stats = run_benchmark(args.num_envs, args.steps, args.seed, args.decision_period)
+    print("=" * 80)
+    print(f"Elapsed:              {stats['elapsed_seconds']:.2f}s")
+    print(f"Decisions/sec:        {stats['decisions_per_second']:,.0f}")
+    print(f"Physics steps/sec:    {stats['physics_steps_per_second']:,.0f}")
+    print(f"Episodes finished:    {stats['episodes']:,}")
+    print(f"Success rate:         {stats['success_rate'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Liveness signal for in-progress runs: results/<run-id>/run_logs/heartbeat.json.
+
+The training wrappers (train_with_progress.py, train_sim.py) keep this small file
+fresh while a run trains, so scanners (utils/check_failed_runs.py, the dashboard)
+can tell a live run from a finished or crashed one with a single small read
+instead of parsing timers.json / training_status.json while they are being written.
+
+A background thread rewrites the file every `interval` seconds (atomically, via a
+temp file + os.replace), carrying the latest step/reward reported by the trainer.
+On exit the state becomes "finished", "failed" or "interrupted". A run that died
+without saying so keeps state "running" but its "updated" time goes stale.
+
+The heartbeat is only written once run_logs/ exists, so mlagents-learn still
+creates the run directory itself (it refuses to start in an existing one).
+
+Usage:
+    with RunHeartbeat(run_dir, run_id, max_steps=max_steps, trainer='train_sim') as heartbeat:
+        ...
+        heartbeat.update(step=step, reward=mean_reward)
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+HEARTBEAT_FILENAME = 'heartbeat.json'
+HEARTBEAT_VERSION = 1
+# Seconds between rewrites; readers treat a few missed beats as a dead run
+DEFAULT_INTERVAL = 15.0
+
+
+class RunHeartbeat:
+    """Periodically rewrites run_logs/heartbeat.json for one run."""
+    
+    def __init__(self, run_dir: Path, run_id: str, max_steps: Optional[int] = None,
+                 trainer: str = '', interval: float = DEFAULT_INTERVAL):
+        self.path = Path(run_dir) / 'run_logs' / HEARTBEAT_FILENAME
+        self.interval = interval
+        now = time.time()
+        self.data: Dict = {
+            'version': HEARTBEAT_VERSION,
+            'run_id': run_id,
+            'trainer': trainer,
+            'pid': os.getpid(),
+            'host': socket.gethostname(),
+            'state': 'running',
+            'phase': 'training',
+            'started': now,
+            'updated': now,
+            'interval': interval,
+            'step': None,
+            'max_steps': max_steps,
+            'reward': None,
+            'step_time': None,
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def update(self, step: Optional[int] = None, reward: Optional[float] = None,
+               phase: Optional[str] = None):
+        """Record progress; written out with the next beat."""
+        with self._lock:
+            if step is not None and step != self.data['step']:
+                self.data['step'] = int(step)
+                self.data['step_time'] = time.time()
+            if reward is not None:
+                self.data['reward'] = float(reward)
+            if phase is not None:
+                self.data['phase'] = phase
+    
+    def beat(self) -> bool:
+        """Write the heartbeat now. Returns False if run_logs/ doesn't exist yet or the write failed."""
+        if not self.path.parent.is_dir():
+            return False
+        with self._lock:
+            self.data['updated'] = time.time()
+            payload = json.dumps(self.data, indent=2)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError:
+            # e.g. a reader holding the file open on Windows; the next beat retries
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.beat()
+    
+    def start(self) -> 'RunHeartbeat':
+        self.beat()
+        self._thread = threading.Thread(target=self._run, name='run-heartbeat', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, state: str = 'finished'):
+        """Stop beating and record the final state."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+        with self._lock:
+            self.data['state'] = state
+            self.data['phase'] = None
+        self.beat()
+    
+    def __enter__(self) -> 'RunHeartbeat':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None or (exc_type is SystemExit and not exc.code):
+            state = 'finished'
+        elif issubclass(exc_type, KeyboardInterrupt):
+            state = 'interrupted'
+        else:
+            state = 'failed'
+        self.stop(state)
+        return False
@@ -0,0 +1,845 @@
+#!/usr/bin/env python3
+"""
+CPU PPO trainer for the vectorized parkour simulator (no Unity, no mlagents-learn).
+
+Reads the same trainer config as mlagents-learn (e.g. parkour_config.yaml) and
+follows the ML-Agents PPO semantics for batch_size, buffer_size, beta, epsilon,
+lambd, num_epoch, time_horizon, gamma and the linear/constant schedules, so
+hyperparameters can be iterated on quickly before a Unity run.
+
+Results go to results/<run-id> in the mlagents-learn layout (configuration.yaml,
+run_logs/timers.json, run_logs/training_status.json, checkpoints), so the
+dashboard, check_failed_runs.py and the figure tools work unchanged.
+Run-id is generated automatically (format: sim_training_YYYYMMDD_HHMMSS).
+
+Usage:
+    python train_sim.py parkour_config.yaml
+    python train_sim.py parkour_config.yaml --num-envs 512 --max-steps 500000
+"""
+
+import argparse
+import json
+import math
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+try:
+    import torch
+    from torch import nn
+except ImportError:
+    print("Error: PyTorch is not installed")
+    print("Install with: pip install torch")
+    sys.exit(1)
+
+from parkour_sim import (ACTION_NAMES, END_TIMEOUT, NUM_ACTIONS, OBSERVATION_SIZE,
+                         REWARD_COMPONENTS, CharacterConfig, ParkourBatchEnv)
+from run_heartbeat import RunHeartbeat
+
+
+# ML-Agents defaults for anything the trainer config leaves out
+DEFAULT_HYPERPARAMETERS = {
+    'batch_size': 1024,
+    'buffer_size': 10240,
+    'learning_rate': 3.0e-4,
+    'beta': 5.0e-3,
+    'epsilon': 0.2,
+    'lambd': 0.95,
+    'num_epoch': 3,
+    'shared_critic': False,
+    'learning_rate_schedule': 'linear',
+}
+DEFAULT_NETWORK_SETTINGS = {
+    'normalize': False,
+    'hidden_units': 128,
+    'num_layers': 2,
+}
+DEFAULT_BEHAVIOR_SETTINGS = {
+    'trainer_type': 'ppo',
+    'checkpoint_interval': 500000,
+    'keep_checkpoints': 5,
+    'max_steps': 500000,
+    'time_horizon': 64,
+    'summary_freq': 50000,
+}
+
+# Floors of ML-Agents' linear decay (ModelUtils.DecayedValue)
+SCHEDULE_MINIMUMS = {
+    'learning_rate': 1.0e-10,
+    'epsilon': 0.1,
+    'beta': 1.0e-5,
+}
+
+# Same bound ML-Agents' Normalizer applies to normalized observations
+NORMALIZER_CLIP = 5.0
+
+# Real episodes kept per summary in episode_data.json / reward_components.json
+EPISODES_PER_SUMMARY = 20
+
+# version_number output of ML-Agents' ONNX export (checked by the Unity inference engine)
+MODEL_EXPORT_VERSION = 3
+
+
+def load_behavior_settings(config_file: str) -> Tuple[str, Dict]:
+    """Read the first behavior from a trainer config and fill in ML-Agents defaults."""
+    with open(config_file, 'r') as f:
+        config = yaml.safe_load(f)
+    
+    behavior_name, behavior = next(iter(config['behaviors'].items()))
+    if behavior.get('trainer_type', 'ppo') != 'ppo':
+        raise ValueError(f"train_sim.py only supports PPO (got {behavior['trainer_type']})")
+    
+    settings = dict(DEFAULT_BEHAVIOR_SETTINGS)
+    settings.update({k: v for k, v in behavior.items()
+                     if k not in ('hyperparameters', 'network_settings', 'reward_signals')})
+    
+    hyperparameters = dict(DEFAULT_HYPERPARAMETERS)
+    hyperparameters.update(behavior.get('hyperparameters') or {})
+    # beta/epsilon schedules follow learning_rate_schedule unless set (ML-Agents behavior)
+    hyperparameters.setdefault('beta_schedule', hyperparameters['learning_rate_schedule'])
+    hyperparameters.setdefault('epsilon_schedule', hyperparameters['learning_rate_schedule'])
+    settings['hyperparameters'] = hyperparameters
+    
+    network_settings = dict(DEFAULT_NETWORK_SETTINGS)
+    network_settings.update(behavior.get('network_settings') or {})
+    settings['network_settings'] = network_settings
+    
+    extrinsic = {'gamma': 0.99, 'strength': 1.0}
+    extrinsic.update((behavior.get('reward_signals') or {}).get('extrinsic') or {})
+    settings['reward_signals'] = {'extrinsic': extrinsic}
+    
+    return behavior_name, settings
+
+
+def generate_run_id() -> str:
+    """Generate a run-id based on current date and time with 'sim_training' prefix."""
+    return f"sim_training_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def decayed_value(schedule: str, initial: float, minimum: float, step: int, max_steps: int) -> float:
+    """ML-Agents ScheduleType: 'linear' decays to `minimum` at max_steps, 'constant' doesn't."""
+    if schedule == 'constant':
+        return initial
+    progress = min(step, max_steps) / max_steps
+    return max(initial - (initial - minimum) * progress, minimum)
+
+
+class HierarchicalTimer:
+    """
+    Minimal stand-in for mlagents_envs.timers: nested named blocks with total,
+    count and self time, plus gauges, serialized in the timers.json format.
+    """
+    
+    def __init__(self):
+        self.root = self._node()
+        self.stack = [self.root]
+        self.gauges: Dict[str, Dict] = {}
+        self.start = time.perf_counter()
+    
+    @staticmethod
+    def _node() -> Dict:
+        return {'total': 0.0, 'count': 0, 'children': {}}
+    
+    @contextmanager
+    def __call__(self, name: str):
+        node = self.stack[-1]['children'].setdefault(name, self._node())
+        self.stack.append(node)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            node['total'] += time.perf_counter() - start
+            node['count'] += 1
+            self.stack.pop()
+    
+    def set_gauge(self, name: str, value: float):
+        """Same semantics as mlagents_envs.timers.set_gauge (latest value, min, max, count)."""
+        value = float(value)
+        gauge = self.gauges.get(name)
+        if gauge is None:
+            self.gauges[name] = {'value': value, 'min': value, 'max': value, 'count': 1}
+        else:
+            gauge['value'] = value
+            gauge['min'] = min(gauge['min'], value)
+            gauge['max'] = max(gauge['max'], value)
+            gauge['count'] += 1
+    
+    def _serialize(self, node: Dict) -> Dict:
+        children = {name: self._serialize(child) for name, child in node['children'].items()}
+        out = {
+            'total': node['total'],
+            'count': node['count'],
+            'self': node['total'] - sum(child['total'] for child in children.values()),
+        }
+        if children:
+            out['children'] = children
+        return out
+    
+    def to_dict(self, metadata: Dict) -> Dict:
+        self.root['total'] = time.perf_counter() - self.start
+        self.root['count'] = 1
+        tree = self._serialize(self.root)
+        return {'name': 'root', 'gauges': self.gauges, 'metadata': metadata, **tree}
+
+
+class RunningNormalizer(nn.Module):
+    """Running mean/variance observation normalizer (network_settings.normalize)."""
+    
+    def __init__(self, size: int):
+        super().__init__()
+        self.register_buffer('mean', torch.zeros(size))
+        self.register_buffer('variance', torch.ones(size))
+        self.register_buffer('count', torch.tensor(1.0))
+    
+    def update(self, batch: torch.Tensor):
+        batch_count = batch.shape[0]
+        batch_mean = batch.mean(dim=0)
+        batch_var = batch.var(dim=0, unbiased=False)
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        new_mean = self.mean + delta * batch_count / total
+        m2 = self.variance * self.count + batch_var * batch_count + delta ** 2 * self.count * batch_count / total
+        self.mean.copy_(new_mean)
+        self.variance.copy_(m2 / total)
+        self.count.copy_(total)
+    
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        normalized = (obs - self.mean) / torch.sqrt(self.variance + 1e-8)
+        return torch.clamp(normalized, -NORMALIZER_CLIP, NORMALIZER_CLIP)
+
+
+def _mlp(input_size: int, hidden_units: int, num_layers: int) -> nn.Sequential:
+    layers = []
+    for i in range(num_layers):
+        layers += [nn.Linear(input_size if i == 0 else hidden_units, hidden_units), nn.SiLU()]
+    return nn.Sequential(*layers)
+
+
+class ActorCritic(nn.Module):
+    """Separate actor and critic MLPs (shared_critic: false), Swish activations like ML-Agents."""
+    
+    def __init__(self, obs_size: int, num_actions: int, hidden_units: int,
+                 num_layers: int, normalize: bool):
+        super().__init__()
+        self.normalizer = RunningNormalizer(obs_size) if normalize else None
+        self.actor = _mlp(obs_size, hidden_units, num_layers)
+        self.policy_head = nn.Linear(hidden_units, num_actions)
+        self.critic = _mlp(obs_size, hidden_units, num_layers)
+        self.value_head = nn.Linear(hidden_units, 1)
+    
+    def forward(self, obs: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        if self.normalizer is not None:
+            obs = self.normalizer(obs)
+        logits = self.policy_head(self.actor(obs))
+        values = self.value_head(self.critic(obs)).squeeze(-1)
+        return logits, values
+
+
+class ExportablePolicy(nn.Module):
+    """Policy wrapper with the ML-Agents ONNX inputs/outputs (obs_0, action_masks -> discrete_actions)."""
+    
+    def __init__(self, model: ActorCritic):
+        super().__init__()
+        self.model = model
+        self.register_buffer('version_number', torch.tensor([float(MODEL_EXPORT_VERSION)]))
+        self.register_buffer('memory_size', torch.tensor([0.0]))
+        self.register_buffer('discrete_shape', torch.tensor([float(NUM_ACTIONS)]))
+    
+    def forward(self, obs_0: torch.Tensor, action_masks: torch.Tensor):
+        logits, _ = self.model(obs_0)
+        logits = logits.masked_fill(action_masks < 0.5, -1.0e8)
+        probs = torch.softmax(logits, dim=-1)
+        discrete_actions = torch.multinomial(probs, 1)
+        deterministic = torch.argmax(probs, dim=-1, keepdim=True)
+        return (self.version_number, self.memory_size, discrete_actions,
+                self.discrete_shape, deterministic)
+
+
+def compute_gae(rewards: np.ndarray, values: np.ndarray, next_values: np.ndarray,
+                episode_ends: np.ndarray, trajectory_ends: np.ndarray,
+                gamma: float, lambd: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized GAE over (T, num_envs) arrays.
+    
+    `next_values` holds V(s_{t+1}) for every step (0 after a terminal state,
+    V(final obs) after an interrupted one). Accumulation stops at episode ends and at
+    trajectory cuts (time_horizon or end of rollout), where the value is bootstrapped.
+    """
+    advantages = np.zeros_like(rewards)
+    gae = np.zeros(rewards.shape[1], dtype=rewards.dtype)
+    carry = ~(episode_ends | trajectory_ends)
+    for t in range(len(rewards) - 1, -1, -1):
+        delta = rewards[t] + gamma * next_values[t] - values[t]
+        gae = delta + gamma * lambd * np.where(carry[t], gae, 0.0)
+        advantages[t] = gae
+    return advantages, advantages + values
+
+
+class SimPPOTrainer:
+    """PPO with preallocated rollout buffers over a ParkourBatchEnv."""
+    
+    def __init__(self, behavior_name: str, settings: Dict, run_dir: Path, num_envs: int,
+                 seed: int, decision_period: int, env_config: Optional[CharacterConfig] = None,
+                 layout_source=None, threads: Optional[int] = None,
+                 heartbeat: Optional[RunHeartbeat] = None):
+        self.behavior_name = behavior_name
+        self.settings = settings
+        self.hp = settings['hyperparameters']
+        self.run_dir = run_dir
+        self.num_envs = num_envs
+        self.max_steps = int(settings['max_steps'])
+        self.gamma = float(settings['reward_signals']['extrinsic']['gamma'])
+        self.strength = float(settings['reward_signals']['extrinsic']['strength'])
+        self.time_horizon = int(settings['time_horizon'])
+        self.heartbeat = heartbeat
+        
+        if threads:
+            torch.set_num_threads(threads)
+        torch.manual_seed(seed)
+        
+        self.env = ParkourBatchEnv(num_envs, config=env_config, seed=seed, decision_period=decision_period)
+        if layout_source is not None:
+            self.env.set_layout_source(layout_source)
+        
+        network = settings['network_settings']
+        self.model = ActorCritic(OBSERVATION_SIZE, NUM_ACTIONS, int(network['hidden_units']),
+                                 int(network['num_layers']), bool(network['normalize']))
+        self.optimizer = torch.optim.Adam(self.model.parameters(), lr=float(self.hp['learning_rate']))
+        
+        # Rollout length per env so one rollout holds at least buffer_size experiences
+        self.rollout_length = max(1, math.ceil(int(self.hp['buffer_size']) / num_envs))
+        shape = (self.rollout_length, num_envs)
+        self.buf_obs = np.zeros(shape + (OBSERVATION_SIZE,), dtype=np.float32)
+        self.buf_actions = np.zeros(shape, dtype=np.int64)
+        self.buf_log_probs = np.zeros(shape, dtype=np.float32)
+        self.buf_values = np.zeros(shape, dtype=np.float32)
+        self.buf_next_values = np.zeros(shape, dtype=np.float32)
+        self.buf_rewards = np.zeros(shape, dtype=np.float32)
+        self.buf_episode_ends = np.zeros(shape, dtype=bool)
+        self.buf_trajectory_ends = np.zeros(shape, dtype=bool)
+        
+        # Per-env trajectory/episode counters
+        self.horizon_steps = np.zeros(num_envs, dtype=np.int64)
+        self.episode_decisions = np.zeros(num_envs, dtype=np.int64)
+        
+        self.timer = HierarchicalTimer()
+        self.step = 0
+        self.start_time = time.time()
+        self.checkpoints: List[Dict] = []
+        self._reset_summary()
+        self.history = {
+            'action_distribution': [],
+            'losses': [],
+            'entropy': [],
+            'episodes': [],
+            'rewards': [],
+        }
+        self.episode_number = 0
+    
+    # ------------------------------------------------------------------
+    # Rollouts
+    # ------------------------------------------------------------------
+    
+    def _policy_step(self, obs: np.ndarray):
+        with self.timer('TorchPolicy.evaluate'), torch.no_grad():
+            logits, values = self.model(torch.from_numpy(obs))
+            dist = torch.distributions.Categorical(logits=logits)
+            actions = dist.sample()
+            log_probs = dist.log_prob(actions)
+            self.summary['entropy'].append(float(dist.entropy().mean()))
+        return actions.numpy(), log_probs.numpy(), values.numpy()
+    
+    def _values(self, obs: np.ndarray) -> np.ndarray:
+        with torch.no_grad():
+            return self.model(torch.from_numpy(obs))[1].numpy()
+    
+    def collect_rollout(self, obs: np.ndarray) -> np.ndarray:
+        """Fill the rollout buffers; returns the observation to continue from."""
+        for t in range(self.rollout_length):
+            with self.timer('env_step'):
+                actions, log_probs, values = self._policy_step(obs)
+                next_obs, rewards, dones, info = self.env.step(actions)
+            
+            with self.timer('process_trajectory'):
+                self.buf_obs[t] = obs
+                self.buf_actions[t] = actions
+                self.buf_log_probs[t] = log_probs
+                self.buf_values[t] = values
+                self.buf_rewards[t] = rewards * self.strength
+                self.buf_episode_ends[t] = dones
+                
+                self.horizon_steps += 1
+                self.episode_decisions += 1
+                cut = (self.horizon_steps >= self.time_horizon) | dones
+                self.buf_trajectory_ends[t] = cut
+                self.horizon_steps[cut] = 0
+                
+                # Bootstrap value: V(next obs) normally, 0 after terminal states, and
+                # V(final obs) after timeouts (max_step_reached, like ML-Agents)
+                next_values = self._values(next_obs)
+                if 'episodes' in info:
+                    episodes = info['episodes']
+                    done_idx = episodes['env_index']
+                    interrupted = episodes['end_reason'] == END_TIMEOUT
+                    final_values = np.zeros(len(done_idx), dtype=np.float32)
+                    if interrupted.any():
+                        final_values[interrupted] = self._values(info['terminal_obs'][interrupted])
+                    next_values[done_idx] = final_values
+                    self._record_episodes(episodes)
+                self.buf_next_values[t] = next_values
+                self.summary['values'].append(float(values.mean()))
+            
+            obs = next_obs
+            self.step += self.num_envs
+        
+        # Every trajectory is cut at the end of the rollout
+        self.buf_trajectory_ends[-1] = True
+        self.horizon_steps[:] = 0
+        return obs
+    
+    def _record_episodes(self, episodes: Dict):
+        done_idx = episodes['env_index']
+        s = self.summary
+        s['rewards'].extend(episodes['total_reward'].tolist())
+        s['decisions'].extend(self.episode_decisions[done_idx].tolist())
+        s['lengths'].extend(episodes['length'].tolist())
+        s['distances'].extend(episodes['max_distance'].tolist())
+        s['successes'].extend(episodes['success'].tolist())
+        s['action_counts'].append(episodes['action_counts'])
+        s['components'].append(episodes['reward_components'])
+        self.episode_decisions[done_idx] = 0
+        
+        # Keep a few real episodes per summary for episode_data.json / reward_components.json
+        keep = max(0, EPISODES_PER_SUMMARY - s['kept_episodes'])
+        for i in range(min(keep, len(done_idx))):
+            self.episode_number += 1
+            self.history['episodes'].append({
+                'episodeNumber': self.episode_number,
+                'stepCount': self.step,
+                'length': float(episodes['length'][i]),
+                'maxDistance': float(episodes['max_distance'][i]),
+                'success': bool(episodes['success'][i]),
+            })
+            rewards = {'episodeNumber': self.episode_number, 'stepCount': self.step}
+            for j, name in enumerate(REWARD_COMPONENTS):
+                rewards[name] = float(episodes['reward_components'][i, j])
+            rewards['totalReward'] = float(episodes['total_reward'][i])
+            self.history['rewards'].append(rewards)
+        s['kept_episodes'] += min(keep, len(done_idx))
+    
+    # ------------------------------------------------------------------
+    # PPO update
+    # ------------------------------------------------------------------
+    
+    def _schedules(self) -> Dict[str, float]:
+        hp = self.hp
+        return {
+            'learning_rate': decayed_value(hp['learning_rate_schedule'], float(hp['learning_rate']),
+                                           SCHEDULE_MINIMUMS['learning_rate'], self.step, self.max_steps),
+            'epsilon': decayed_value(hp['epsilon_schedule'], float(hp['epsilon']),
+                                     SCHEDULE_MINIMUMS['epsilon'], self.step, self.max_steps),
+            'beta': decayed_value(hp['beta_schedule'], float(hp['beta']),
+                                  SCHEDULE_MINIMUMS['beta'], self.step, self.max_steps),
+        }
+    
+    def update_policy(self):
+        """GAE over the rollout, then num_epoch passes of minibatch PPO."""
+        with self.timer('_update_policy'):
+            advantages, returns = compute_gae(self.buf_rewards, self.buf_values, self.buf_next_values,
+                                              self.buf_episode_ends, self.buf_trajectory_ends,
+                                              self.gamma, float(self.hp['lambd']))
+            
+            obs = torch.from_numpy(self.buf_obs.reshape(-1, OBSERVATION_SIZE))
+            actions = torch.from_numpy(self.buf_actions.reshape(-1))
+            old_log_probs = torch.from_numpy(self.buf_log_probs.reshape(-1))
+            old_values = torch.from_numpy(self.buf_values.reshape(-1))
+            returns = torch.from_numpy(returns.reshape(-1))
+            advantages = torch.from_numpy(advantages.reshape(-1))
+            advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-10)
+            
+            if self.model.normalizer is not None:
+                self.model.normalizer.update(obs)
+            
+            schedules = self._schedules()
+            for group in self.optimizer.param_groups:
+                group['lr'] = schedules['learning_rate']
+            epsilon = schedules['epsilon']
+            beta = schedules['beta']
+            
+            batch_size = min(int(self.hp['batch_size']), len(obs))
+            num_batches = len(obs) // batch_size
+            policy_losses = []
+            value_losses = []
+            for _ in range(int(self.hp['num_epoch'])):
+                permutation = torch.randperm(len(obs))
+                for b in range(num_batches):
+                    idx = permutation[b * batch_size:(b + 1) * batch_size]
+                    logits, values = self.model(obs[idx])
+                    dist = torch.distributions.Categorical(logits=logits)
+                    log_probs = dist.log_prob(actions[idx])
+                    
+                    ratio = torch.exp(log_probs - old_log_probs[idx])
+                    surrogate = ratio * advantages[idx]
+                    clipped = torch.clamp(ratio, 1.0 - epsilon, 1.0 + epsilon) * advantages[idx]
+                    policy_loss = -torch.min(surrogate, clipped).mean()
+                    
+                    clipped_values = old_values[idx] + torch.clamp(values - old_values[idx], -epsilon, epsilon)
+                    value_loss = torch.max((returns[idx] - values) ** 2,
+                                           (returns[idx] - clipped_values) ** 2).mean()
+                    
+                    loss = policy_loss + 0.5 * value_loss - beta * dist.entropy().mean()
+                    self.optimizer.zero_grad()
+                    loss.backward()
+                    self.optimizer.step()
+                    policy_losses.append(float(policy_loss))
+                    value_losses.append(float(value_loss))
+            
+            self.summary['policy_loss'].extend(policy_losses)
+            self.summary['value_loss'].extend(value_losses)
+            self.summary['schedules'] = schedules
+    
+    # ------------------------------------------------------------------
+    # Summaries and checkpoints
+    # ------------------------------------------------------------------
+    
+    def _reset_summary(self):
+        self.summary = {
+            'rewards': [], 'decisions': [], 'lengths': [], 'distances': [], 'successes': [],
+            'action_counts': [], 'components': [], 'entropy': [], 'values': [],
+            'policy_loss': [], 'value_loss': [], 'schedules': None, 'kept_episodes': 0,
+        }
+    
+    def write_summary(self):
+        """Gauges + console line in the mlagents-learn format, then reset the window."""
+        s = self.summary
+        prefix = self.behavior_name
+        
+        def gauge(name: str, values: List[float]):
+            if values:
+                self.timer.set_gauge(f"{prefix}.{name}.mean", float(np.mean(values)))
+                self.timer.set_gauge(f"{prefix}.{name}.sum", float(np.sum(values)))
+        
+        gauge('Environment.CumulativeReward', s['rewards'])
+        gauge('Environment.EpisodeLength', s['decisions'])
+        gauge('Episode.TotalReward', s['rewards'])
+        gauge('Episode.Length', s['lengths'])
+        gauge('Episode.MaxDistance', s['distances'])
+        gauge('Policy.Entropy', s['entropy'])
+        gauge('Policy.ExtrinsicValueEstimate', s['values'])
+        gauge('Policy.ExtrinsicReward', s['rewards'])
+        gauge('Losses.PolicyLoss', s['policy_loss'])
+        gauge('Losses.ValueLoss', s['value_loss'])
+        
+        step = self.step
+        if s['action_counts']:
+            counts = np.concatenate(s['action_counts'])
+            totals = np.maximum(counts.sum(axis=1, keepdims=True), 1)
+            percentages = counts / totals * 100.0
+            point = {'step': step}
+            for i, name in enumerate(ACTION_NAMES):
+                title = name.capitalize()
+                gauge(f'Actions.{title}Count', counts[:, i].tolist())
+                gauge(f'Actions.{title}Percentage', percentages[:, i].tolist())
+                point[name] = float(percentages[:, i].mean())
+            self.history['action_distribution'].append(point)
+        
+        if s['schedules']:
+            gauge('Policy.LearningRate', [s['schedules']['learning_rate']])
+            gauge('Policy.Epsilon', [s['schedules']['epsilon']])
+            gauge('Policy.Beta', [s['schedules']['beta']])
+        gauge('Step', [step])
+        gauge('IsTraining', [1.0])
+        
+        if s['policy_loss']:
+            self.history['losses'].append({'step': step, 'policy_loss': float(np.mean(s['policy_loss'])),
+                                           'value_loss': float(np.mean(s['value_loss']))})
+        if s['entropy']:
+            self.history['entropy'].append({'step': step, 'entropy': float(np.mean(s['entropy']))})
+        
+        elapsed = time.time() - self.start_time
+        percentage = min(step / self.max_steps * 100.0, 100.0)
+        if s['rewards']:
+            print(f"[INFO] {prefix}. Step: {step}. [{percentage:.1f}%] Time Elapsed: {elapsed:.3f} s. "
+                  f"Mean Reward: {np.mean(s['rewards']):.3f}. Std of Reward: {np.std(s['rewards']):.3f}. "
+                  f"Training.", flush=True)
+        else:
+            print(f"[INFO] {prefix}. Step: {step}. [{percentage:.1f}%] Time Elapsed: {elapsed:.3f} s. "
+                  f"No episode was completed since last summary. Training.", flush=True)
+        if self.heartbeat is not None:
+            self.heartbeat.update(step=step, reward=float(np.mean(s['rewards'])) if s['rewards'] else None)
+        
+        self._reset_summary()
+        self.write_run_logs()
+    
+    def save_checkpoint(self, final: bool = False):
+        """Save <behavior>-<step>.pt (+ .onnx when export works) and update training_status.json."""
+        with self.timer('RLTrainer._checkpoint'):
+            behavior_dir = self.run_dir / self.behavior_name
+            behavior_dir.mkdir(parents=True, exist_ok=True)
+            base = behavior_dir / f"{self.behavior_name}-{self.step}"
+            
+            torch.save({'model': self.model.state_dict(), 'optimizer': self.optimizer.state_dict(),
+                        'step': self.step, 'settings': self.settings}, f"{base}.pt")
+            onnx_path = self._export_onnx(Path(f"{base}.onnx"))
+            
+            rewards = self.history['rewards'][-EPISODES_PER_SUMMARY:]
+            gauge = self.timer.gauges.get(f"{self.behavior_name}.Environment.CumulativeReward.mean")
+            reward = gauge['value'] if gauge else (np.mean([r['totalReward'] for r in rewards]) if rewards else None)
+            
+            checkpoint = {
+                'steps': self.step,
+                'file_path': self._relative(onnx_path or Path(f"{base}.pt")),
+                'reward': float(reward) if reward is not None else None,
+                'creation_time': time.time(),
+                'auxillary_file_paths': [self._relative(Path(f"{base}.pt"))] if onnx_path else [],
+            }
+            self.checkpoints.append(checkpoint)
+            
+            # keep_checkpoints: drop the oldest checkpoint files like ML-Agents' ModelCheckpointManager
+            keep = int(self.settings['keep_checkpoints'])
+            while keep > 0 and len(self.checkpoints) > keep:
+                old = self.checkpoints.pop(0)
+                for path in [old['file_path']] + old['auxillary_file_paths']:
+                    old_file = Path(path)
+                    if old_file.exists():
+                        old_file.unlink()
+            
+            final_checkpoint = None
+            if final:
+                final_checkpoint = dict(checkpoint)
+                if onnx_path:
+                    final_path = self.run_dir / f"{self.behavior_name}.onnx"
+                    shutil.copyfile(onnx_path, final_path)
+                    final_checkpoint['file_path'] = self._relative(final_path)
+            self._write_training_status(final_checkpoint)
+    
+    def _export_onnx(self, path: Path) -> Optional[Path]:
+        try:
+            export = ExportablePolicy(self.model).eval()
+            dummy_obs = torch.zeros(1, OBSERVATION_SIZE)
+            dummy_mask = torch.ones(1, NUM_ACTIONS)
+            torch.onnx.export(
+                export, (dummy_obs, dummy_mask), str(path), opset_version=9,
+                input_names=['obs_0', 'action_masks'],
+                output_names=['version_number', 'memory_size', 'discrete_actions',
+                              'discrete_action_output_shape', 'deterministic_discrete_actions'],
+                dynamic_axes={'obs_0': {0: 'batch'}, 'action_masks': {0: 'batch'},
+                              'discrete_actions': {0: 'batch'}, 'deterministic_discrete_actions': {0: 'batch'}},
+            )
+            return path
+        except Exception as e:
+            print(f"Warning: ONNX export failed ({e}); saved .pt only")
+            return None
+    
+    def _relative(self, path: Path) -> str:
+        """Checkpoint paths as results_dir/run_id/..., like mlagents-learn."""
+        return str(path)
+    
+    def _write_training_status(self, final_checkpoint: Optional[Dict]):
+        status = {
+            self.behavior_name: {'checkpoints': self.checkpoints},
+            'metadata': {
+                'stats_format_version': '0.3.0',
+                'trainer': 'train_sim',
+                'torch_version': torch.__version__,
+            },
+        }
+        if final_checkpoint:
+            status[self.behavior_name]['final_checkpoint'] = final_checkpoint
+        with open(self.run_dir / 'run_logs' / 'training_status.json', 'w') as f:
+            json.dump(status, f, indent=4)
+    
+    def write_run_logs(self):
+        """timers.json plus the *_over_time.json files the dashboard analysis views read."""
+        run_logs = self.run_dir / 'run_logs'
+        metadata = {
+            'timer_format_version': '0.1.0',
+            'start_time_seconds': str(int(self.start_time)),
+            'python_version': sys.version,
+            'command_line_arguments': ' '.join(sys.argv),
+            'trainer': 'train_sim',
+            'simulator': 'parkour_sim',
+            'num_envs': str(self.num_envs),
+            'pytorch_version': torch.__version__,
+            'numpy_version': np.__version__,
+            'end_time_seconds': str(int(time.time())),
+        }
+        with open(run_logs / 'timers.json', 'w') as f:
+            json.dump(self.timer.to_dict(metadata), f, indent=4)
+        
+        files = {
+            'action_distribution_over_time.json': {'data': self.history['action_distribution']},
+            'losses_over_time.json': {'data': self.history['losses']},
+            'entropy_over_time.json': {'data': self.history['entropy']},
+            'episode_data.json': {'episodes': self.history['episodes']},
+            'reward_components.json': {'rewards': self.history['rewards']},
+        }
+        for name, content in files.items():
+            with open(run_logs / name, 'w') as f:
+                json.dump(content, f, indent=2)
+    
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+    
+    def train(self):
+        summary_freq = int(self.settings['summary_freq'])
+        checkpoint_interval = int(self.settings['checkpoint_interval'])
+        next_summary = summary_freq
+        next_checkpoint = checkpoint_interval
+        
+        with self.timer('TrainerController.start_learning'):
+            with self.timer('TrainerController._reset_env'):
+                obs = self.env.reset()
+            
+            while self.step < self.max_steps:
+                with self.timer('TrainerController.advance'):
+                    obs = self.collect_rollout(obs)
+                    with self.timer('trainer_advance'):
+                        self.update_policy()
+                
+                if self.step >= next_summary:
+                    self.write_summary()
+                    next_summary += summary_freq * max(1, (self.step - next_summary) // summary_freq + 1)
+                if self.step >= next_checkpoint:
+                    self.save_checkpoint()
+                    next_checkpoint += checkpoint_interval * max(1, (self.step - next_checkpoint) // checkpoint_interval + 1)
+            
+            with self.timer('TrainerController._save_models'):
+                self.save_checkpoint(final=True)
+        
+        self.write_run_logs()
+
+
+def write_configuration(run_dir: Path, behavior_name: str, settings: Dict, run_id: str,
+                        results_dir: Path, args):
+    """configuration.yaml in the mlagents-learn layout, plus a sim_settings section."""
+    config = {
+        'default_settings': None,
+        'behaviors': {behavior_name: settings},
+        'env_settings': {
+            'env_path': None,
+            'num_envs': 1,
+            'num_areas': args.num_envs,
+            'seed': args.seed,
+        },
+        'checkpoint_settings': {
+            'run_id': run_id,
+            'initialize_from': None,
+            'load_model': False,
+            'resume': False,
+            'force': args.force,
+            'train_model': False,
+            'inference': False,
+            'results_dir': str(results_dir),
+        },
+        'torch_settings': {'device': 'cpu'},
+        'sim_settings': {
+            'simulator': 'parkour_sim',
+            'num_envs': args.num_envs,
+            'decision_period': args.decision_period,
+            'level_bank': args.level_bank,
+            'character_config': args.character_config,
+        },
+        'debug': False,
+    }
+    with open(run_dir / 'configuration.yaml', 'w') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train PPO on the vectorized parkour simulator (CPU, no Unity)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python train_sim.py parkour_config.yaml                          # Config as-is
+  python train_sim.py parkour_config.yaml --num-envs 512           # More parallel arenas
+  python train_sim.py parkour_config.yaml --max-steps 200000       # Quick sweep
+  python train_sim.py parkour_config.yaml --level-bank level_banks/default
+        """
+    )
+    parser.add_argument('config_file', type=str, help='Trainer config (same format as mlagents-learn)')
+    parser.add_argument('--run-id', type=str, default=None,
+                        help='Run id (default: sim_training_YYYYMMDD_HHMMSS)')
+    parser.add_argument('--results-dir', type=str, default='results', help='Results directory (default: results)')
+    parser.add_argument('--num-envs', type=int, default=256, help='Parallel simulated arenas (default: 256)')
+    parser.add_argument('--max-steps', type=int, default=None, help='Override max_steps from the config')
+    parser.add_argument('--decision-period', type=int, default=5, help='Physics steps per decision (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--threads', type=int, default=None, help='Torch CPU threads (default: torch default)')
+    parser.add_argument('--level-bank', type=str, default=None,
+                        help='Sample layouts from a level_bank.py bank instead of generating them')
+    parser.add_argument('--character-config', type=str, default=None,
+                        help='JSON file with CharacterConfig overrides')
+    parser.add_argument('--force', action='store_true', help='Overwrite an existing run directory')
+    
+    args = parser.parse_args()
+    
+    behavior_name, settings = load_behavior_settings(args.config_file)
+    if args.max_steps is not None:
+        settings['max_steps'] = args.max_steps
+    
+    run_id = args.run_id or generate_run_id()
+    results_dir = Path(args.results_dir)
+    run_dir = results_dir / run_id
+    if run_dir.exists():
+        if not args.force:
+            print(f"[FAIL] {run_dir} already exists (use --force to overwrite)")
+            sys.exit(1)
+        shutil.rmtree(run_dir)
+    (run_dir / 'run_logs').mkdir(parents=True)
+    
+    env_config = None
+    if args.character_config:
+        with open(args.character_config, 'r') as f:
+            env_config = CharacterConfig.from_dict(json.load(f))
+    
+    layout_source = None
+    if args.level_bank:
+        from level_bank import LevelBank
+        layout_source = LevelBank(Path(args.level_bank)).sampler()
+    
+    write_configuration(run_dir, behavior_name, settings, run_id, results_dir, args)
+    env_config = env_config or CharacterConfig()
+    with open(run_dir / 'metadata.json', 'w') as f:
+        json.dump({
+            'styleEpisodeFrequency': env_config.style_episode_frequency,
+            'trainingStartTime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }, f, indent=4)
+    
+    print(f"Auto-generated run-id: {run_id}" if not args.run_id else f"Run-id: {run_id}")
+    print(f"Training '{behavior_name}' on {args.num_envs} simulated arenas "
+          f"with max_steps: {settings['max_steps']:,}")
+    print("=" * 80)
+    
+    # run_logs/heartbeat.json tells check_failed_runs.py and the dashboard this run is live
+    heartbeat = RunHeartbeat(run_dir, run_id, max_steps=int(settings['max_steps']), trainer='train_sim').start()
+    trainer = SimPPOTrainer(behavior_name, settings, run_dir, args.num_envs, args.seed,
+                            args.decision_period, env_config, layout_source, args.threads, heartbeat)
+    try:
+        trainer.train()
+    except KeyboardInterrupt:
+        print("\n\nTraining interrupted by user. Saving checkpoint...")
+        trainer.save_checkpoint(final=True)
+        trainer.write_run_logs()
+        heartbeat.stop('interrupted')
+        sys.exit(1)
+    except BaseException:
+        heartbeat.stop('failed')
+        raise
+    heartbeat.stop('finished')
+    
+    print("=" * 80)
+    print(f"✓ Training complete: {run_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ import yaml
 from pathlib import Path
 from datetime import datetime
 
+from run_heartbeat import RunHeartbeat
+
 def get_max_steps(config_file):
     """Extract max_steps from the YAML config file."""
     try:
@@ -35,6 +37,15 @@ def generate_run_id():
     run_id = f"training_{now.strftime('%Y%m%d_%H%M%S')}"
     return run_id
 
+def get_results_dir(args):
+    """--results-dir passed through to mlagents-learn (default: results)."""
+    for i, arg in enumerate(args):
+        if arg.startswith('--results-dir='):
+            return Path(arg.split('=', 1)[1])
+        if arg == '--results-dir' and i + 1 < len(args):
+            return Path(args[i + 1])
+    return Path('results')
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python train_with_progress.py <config_file> [additional args...]")
@@ -65,6 +76,11 @@ def main():
     # Build the command
     cmd = ["mlagents-learn", config_file] + additional_args
     
+    # run_logs/heartbeat.json tells check_failed_runs.py and the dashboard this run is live
+    # (first written once mlagents-learn has created the run directory)
+    heartbeat = RunHeartbeat(get_results_dir(additional_args) / run_id, run_id,
+                             max_steps=max_steps, trainer='mlagents-learn').start()
+    
     # Run mlagents-learn and intercept output
     process = subprocess.Popen(
         cmd,
@@ -78,11 +94,15 @@ def main():
     # Pattern to match ML-Agents step output
     # Example: [INFO] ParkourRunner. Step: 680000. Time Elapsed: 735.333 s. Mean Reward: 9.899. Std of Reward: 3.424. Training.
     step_pattern = re.compile(r'\[INFO\]\s+(\w+)\.\s+Step:\s+(\d+)\.')
+    reward_pattern = re.compile(r'Mean Reward:\s+(-?[\d.]+)')
     
     try:
         for line in process.stdout:
             # Check if this is a step info line
             match = step_pattern.search(line)
+            if match:
+                reward = reward_pattern.search(line)
+                heartbeat.update(step=int(match.group(2)), reward=float(reward.group(1)) if reward else None)
             if match and max_steps:
                 current_step = int(match.group(2))
                 percentage = (current_step / max_steps) * 100
@@ -101,6 +121,7 @@ def main():
     except KeyboardInterrupt:
         print("\n\nTraining interrupted by user.")
         process.terminate()
+        heartbeat.stop('interrupted')
         sys.exit(1)
     
     # Wait for process to complete
@@ -111,6 +132,7 @@ def main():
         print("\n" + "=" * 80)
         print("Training completed successfully. Extracting TensorBoard data...")
         print("=" * 80)
+        heartbeat.update(phase='extracting')
         
         try:
             script_dir = Path(__file__).parent
@@ -124,6 +146,7 @@ def main():
             print(f"Warning: Failed to extract TensorBoard data: {e}")
             print("You can manually run: python extract_tensorboard_data.py")
     
+    heartbeat.stop('finished' if return_code == 0 else 'failed')
     sys.exit(return_code)
 
 if __name__ == "__main__":
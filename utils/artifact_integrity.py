@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Fast truncation/corruption checks for run artifacts.
+
+Crashed runs leave half-written files behind: TensorBoard event files cut off
+mid-record and checkpoints that stop before their trailer. Each check reads a
+bounded amount from the end of the file instead of parsing the whole thing:
+
+- events.out.tfevents.*  The last TFRecord frame must end exactly at EOF, with
+                         valid length and data CRC32Cs. The frame is found by
+                         searching back from EOF in the tail (one read); only if
+                         that fails are the 12-byte record headers walked from the
+                         start, which gives a definite answer.
+- *.pt                   torch.save zip archives: end-of-central-directory record
+                         (zip64 aware) and the central directory it points to.
+                         Legacy (non-zip) pickles have no trailer and are skipped.
+- *.onnx                 ModelProto top-level protobuf fields must end exactly at
+                         EOF and include the graph and opset_import (serialized
+                         after the graph). Only tags/lengths are read.
+
+Usage:
+    from artifact_integrity import check_artifact
+    problem = check_artifact(path)      # None if the file looks complete
+    
+    python utils/artifact_integrity.py                        # All runs in src/results
+    python utils/artifact_integrity.py src/results/training_20251214_194855
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from crc32c import crc32c as _crc32c  # pip install crc32c (C implementation)
+except ImportError:
+    _crc32c = None
+
+# Tail bytes read first when looking for the last TFRecord frame (doubled up to the max)
+TAIL_WINDOW = 4 * 1024
+MAX_TAIL_WINDOW = 64 * 1024
+# Protobuf fields tolerated at the top level of an ONNX ModelProto (real files have < 20)
+MAX_ONNX_FIELDS = 10000
+
+ZIP_EOCD = b'PK\x05\x06'
+ZIP64_LOCATOR = b'PK\x06\x07'
+ZIP64_EOCD = b'PK\x06\x06'
+ZIP_CENTRAL_DIR = b'PK\x01\x02'
+ZIP_LOCAL_HEADER = b'PK\x03\x04'
+ZIP_MAX_COMMENT = 65535
+
+
+# ----------------------------------------------------------------------
+# CRC32C (Castagnoli), as used by TFRecord
+# ----------------------------------------------------------------------
+
+def _make_crc32c_table() -> List[int]:
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _make_crc32c_table()
+
+
+def crc32c(data: bytes) -> int:
+    """CRC32C of data; uses the crc32c package when installed (pure Python otherwise)."""
+    if _crc32c is not None:
+        return _crc32c(data)
+    crc = 0xFFFFFFFF
+    table = _CRC32C_TABLE
+    for byte in data:
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+def masked_crc32c(data: bytes) -> int:
+    """TFRecord's masked CRC: rotate right by 15 and add a constant."""
+    crc = crc32c(data)
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+# ----------------------------------------------------------------------
+# Per-format checks (each returns None when OK, otherwise a short reason)
+# ----------------------------------------------------------------------
+
+def check_event_file(path: Path) -> Optional[str]:
+    """Check that the last TFRecord frame of an event file is complete."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return "empty event file"
+    with open(path, 'rb') as f:
+        window = TAIL_WINDOW
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            tail = f.read(size - start)
+            if _find_last_frame(tail):
+                return None
+            if start == 0 or window >= MAX_TAIL_WINDOW:
+                break
+            window *= 2
+        return _walk_records(f, size)
+
+
+def _find_last_frame(tail: bytes) -> bool:
+    """
+    Look for a frame [len u64][len crc u32][data][data crc u32] ending at EOF.
+    Candidates are tried from the shortest record up; a length that matches the
+    distance to EOF and its CRC is a false positive with ~2^-32 probability.
+    """
+    n = len(tail)
+    for offset in range(n - 16, -1, -1):
+        length = struct.unpack_from('<Q', tail, offset)[0]
+        if length != n - 16 - offset:
+            continue
+        header_crc = struct.unpack_from('<I', tail, offset + 8)[0]
+        if header_crc != masked_crc32c(tail[offset:offset + 8]):
+            continue
+        data = tail[offset + 12:n - 4]
+        return struct.unpack_from('<I', tail, n - 4)[0] == masked_crc32c(data)
+    return False
+
+
+def _walk_records(f, size: int) -> Optional[str]:
+    """Walk record headers from the start; reads 12 bytes per record plus the last data."""
+    offset = 0
+    records = 0
+    while offset < size:
+        f.seek(offset)
+        header = f.read(12)
+        if len(header) < 12:
+            return f"truncated record header at byte {offset} (after {records} records)"
+        length, header_crc = struct.unpack('<QI', header)
+        if header_crc != masked_crc32c(header[:8]):
+            return f"bad record length CRC at byte {offset} (after {records} records)"
+        end = offset + 12 + length + 4
+        if end > size:
+            return f"last record truncated: needs {end - size} more bytes"
+        if end == size:
+            data = f.read(length)
+            data_crc = struct.unpack('<I', f.read(4))[0]
+            if data_crc != masked_crc32c(data):
+                return "bad data CRC in last record"
+        offset = end
+        records += 1
+    return None
+
+
+def check_zip_checkpoint(path: Path) -> Optional[str]:
+    """Check the end-of-central-directory record of a torch.save zip archive."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return "empty checkpoint"
+    with open(path, 'rb') as f:
+        if f.read(4) != ZIP_LOCAL_HEADER:
+            return None  # Legacy pickle format, no trailer to check
+        
+        tail_len = min(size, 22 + ZIP_MAX_COMMENT)
+        f.seek(size - tail_len)
+        tail = f.read(tail_len)
+        pos = tail.rfind(ZIP_EOCD)
+        while pos >= 0:
+            # EOCD is 22 bytes plus its comment and must end exactly at EOF
+            if pos + 22 <= tail_len and pos + 22 + struct.unpack_from('<H', tail, pos + 20)[0] == tail_len:
+                break
+            pos = tail.rfind(ZIP_EOCD, 0, pos)
+        if pos < 0:
+            return "zip end-of-central-directory record missing (truncated)"
+        
+        eocd_offset = size - tail_len + pos
+        entries, cd_size, cd_offset = struct.unpack_from('<HII', tail, pos + 10)
+        cd_end_limit = eocd_offset
+        if entries == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+            # Zip64: the locator sits right before the EOCD and points at the zip64 EOCD
+            if eocd_offset < 20:
+                return "zip64 locator missing"
+            f.seek(eocd_offset - 20)
+            locator = f.read(20)
+            if locator[:4] != ZIP64_LOCATOR:
+                return "zip64 locator missing"
+            zip64_offset = struct.unpack_from('<Q', locator, 8)[0]
+            if zip64_offset + 56 > eocd_offset - 20:
+                return "zip64 end-of-central-directory offset out of range"
+            f.seek(zip64_offset)
+            record = f.read(56)
+            if record[:4] != ZIP64_EOCD:
+                return "zip64 end-of-central-directory record missing"
+            entries, cd_size, cd_offset = struct.unpack_from('<QQQ', record, 32)
+            cd_end_limit = zip64_offset
+        
+        if cd_offset + cd_size > cd_end_limit:
+            return "central directory extends past its end record"
+        if entries:
+            f.seek(cd_offset)
+            if f.read(4) != ZIP_CENTRAL_DIR:
+                return f"no central directory at byte {cd_offset}"
+    return None
+
+
+def _read_varint(f) -> Optional[int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return value
+        shift += 7
+        if shift > 63:
+            raise ValueError("varint too long")
+
+
+def check_onnx_model(path: Path) -> Optional[str]:
+    """Walk the top-level ModelProto fields; the last one must end exactly at EOF."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return "empty model"
+    seen = set()
+    with open(path, 'rb') as f:
+        offset = 0
+        for _ in range(MAX_ONNX_FIELDS):
+            if offset == size:
+                if 7 not in seen:
+                    return "no graph in model"
+                if 8 not in seen:
+                    return "no opset_import after graph (truncated)"
+                return None
+            try:
+                tag = _read_varint(f)
+                if tag is None:
+                    return f"truncated field tag at byte {offset}"
+                field, wire_type = tag >> 3, tag & 7
+                if field == 0:
+                    return f"invalid protobuf field at byte {offset}"
+                if wire_type == 0:
+                    if _read_varint(f) is None:
+                        return f"truncated field {field}"
+                    offset = f.tell()
+                    continue
+                if wire_type == 1:
+                    length = 8
+                elif wire_type == 5:
+                    length = 4
+                elif wire_type == 2:
+                    length = _read_varint(f)
+                    if length is None:
+                        return f"truncated field {field}"
+                else:
+                    return f"invalid protobuf wire type {wire_type} at byte {offset}"
+            except ValueError as e:
+                return f"{e} at byte {offset}"
+            end = f.tell() + length
+            if end > size:
+                field_name = "graph" if field == 7 else f"field {field}"
+                return f"{field_name} truncated: needs {end - size} more bytes"
+            seen.add(field)
+            f.seek(end)
+            offset = end
+    return "too many top-level fields (not an ONNX model)"
+
+
+def artifact_kind(name: str) -> Optional[str]:
+    """'events', 'pt' or 'onnx' for files this module can check, else None."""
+    if name.startswith('events.out.tfevents.'):
+        return 'events'
+    if name.endswith('.pt'):
+        return 'pt'
+    if name.endswith('.onnx'):
+        return 'onnx'
+    return None
+
+
+_CHECKS = {
+    'events': check_event_file,
+    'pt': check_zip_checkpoint,
+    'onnx': check_onnx_model,
+}
+
+
+def check_artifact(path: Path) -> Optional[str]:
+    """Return a short description of the problem, or None if the file looks complete."""
+    kind = artifact_kind(Path(path).name)
+    if kind is None:
+        return None
+    try:
+        return _CHECKS[kind](Path(path))
+    except OSError as e:
+        return f"unreadable: {e}"
+
+
+def find_artifacts(root: Path) -> List[Path]:
+    """All checkable artifacts under root (os.scandir walk)."""
+    found = []
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif artifact_kind(entry.name):
+                        found.append(Path(entry.path))
+        except OSError:
+            pass
+    return sorted(found)
+
+
+def check_artifacts(paths: List[Path], workers: Optional[int] = None) -> Dict[Path, Optional[str]]:
+    """Check many files concurrently (the checks are I/O bound)."""
+    if workers == 1:
+        return {path: check_artifact(path) for path in paths}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(paths, executor.map(check_artifact, paths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check event files and checkpoints for truncation/corruption by reading their tails.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/artifact_integrity.py                                    # All runs in src/results
+  python utils/artifact_integrity.py src/results/training_20251214_194855
+  python utils/artifact_integrity.py path/to/ParkourRunner-500000.onnx --workers 1
+        """
+    )
+    parser.add_argument('paths', nargs='*', help='Files or directories (default: src/results)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Files checked in parallel (default: thread pool default, 1 = sequential)')
+    parser.add_argument('--all', action='store_true', help='List OK files too')
+    
+    args = parser.parse_args()
+    
+    roots = [Path(p) for p in args.paths] or [Path(__file__).parent.parent / 'src' / 'results']
+    files: List[Path] = []
+    for root in roots:
+        if root.is_dir():
+            files.extend(find_artifacts(root))
+        elif root.exists():
+            files.append(root)
+        else:
+            print(f"[ERROR] Not found: {root}")
+            sys.exit(1)
+    
+    if _crc32c is None:
+        print("[WARN] crc32c package not installed, using pure Python CRC (pip install crc32c)")
+    
+    start = time.perf_counter()
+    results = check_artifacts(files, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    
+    bad: List[Tuple[Path, str]] = [(path, problem) for path, problem in results.items() if problem]
+    for path, problem in results.items():
+        if problem:
+            print(f"[FAIL] {path}: {problem}")
+        elif args.all:
+            print(f"[OK] {path}")
+    
+    total_bytes = sum(path.stat().st_size for path in files)
+    print()
+    print(f"Checked {len(files)} files ({total_bytes / (1024 * 1024):.1f}MB) in {elapsed:.2f}s: "
+          f"{len(files) - len(bad)} OK, {len(bad)} corrupted")
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
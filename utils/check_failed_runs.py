@@ -8,6 +8,10 @@ Detects various failure modes:
 - No checkpoints saved
 - Runs that crashed immediately (< 10 seconds)
 - Incomplete runs (missing metadata)
+- Truncated TensorBoard event files and half-written .onnx/.pt checkpoints
+
+Runs that are still training (fresh run_logs/heartbeat.json, or files written in
+the last few minutes) are listed as live and never analyzed or deleted.
 
 Usage:
     python utils/check_failed_runs.py              # Scan only
@@ -15,24 +19,73 @@ Usage:
     python utils/check_failed_runs.py --dry-run    # Show what would be deleted
 """
 
+import os
 import json
+import time
 import yaml
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 import argparse
 
+from artifact_integrity import artifact_kind, check_artifact
+from run_liveness import describe as describe_live, live_status
+from timers_stream import read_timer_sections
+
+# libyaml's C loader when PyYAML was built with it (same results, much faster)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Incremental scan cache (stored in the results directory)
+CACHE_FILENAME = '.check_failed_runs_cache.json'
+CACHE_VERSION = 3
+# A cached verdict is reused while these files keep the same mtime and size
+# (and, when integrity is checked, the run's total size and every event file and checkpoint)
+FINGERPRINT_FILES = ('configuration.yaml', 'run_logs/timers.json', 'run_logs/training_status.json')
+
+
+def directory_size(path: Path, artifacts: Optional[List[Path]] = None) -> Tuple[int, int]:
+    """
+    Total size and file count of a directory tree.
+    Walks with os.scandir so file type checks reuse the directory entry data
+    (and on Windows the size too) instead of a separate stat per path.
+    Event files and checkpoints found on the way are appended to artifacts.
+    """
+    total_bytes = 0
+    file_count = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_bytes += entry.stat(follow_symlinks=False).st_size
+                            file_count += 1
+                            if artifacts is not None and artifact_kind(entry.name):
+                                artifacts.append(Path(entry.path))
+                    except OSError:
+                        pass  # File vanished mid-scan (e.g. run still writing)
+        except OSError:
+            pass  # Unreadable directory, count what we can
+    return total_bytes, file_count
+
 
 class RunAnalyzer:
     """Analyzes a single run directory to determine if it failed."""
     
-    def __init__(self, run_path: Path):
+    def __init__(self, run_path: Path, check_integrity: bool = True):
         self.path = run_path
+        self.check_integrity = check_integrity
         self.name = run_path.name
         self.failures = []
         self.warnings = []
         self.size_bytes = 0
+        self.file_count = 0
         
         # File paths
         self.config_path = run_path / "configuration.yaml"
@@ -46,6 +99,9 @@ class RunAnalyzer:
         self.reward = None
         self.duration = None
         self.checkpoints = []
+        self.artifacts: List[Path] = []
+        # Live status (run_liveness.live_status) of a run that is still training
+        self.live: Optional[Dict] = None
     
     def analyze(self) -> bool:
         """
@@ -53,7 +109,8 @@ class RunAnalyzer:
         Populates self.failures with reasons for failure.
         """
         # Calculate directory size
-        self.size_bytes = sum(f.stat().st_size for f in self.path.rglob('*') if f.is_file())
+        self.size_bytes, self.file_count = directory_size(
+            self.path, self.artifacts if self.check_integrity else None)
         
         # Check 1: Critical files existence
         if not self.config_path.exists():
@@ -72,13 +129,13 @@ class RunAnalyzer:
         # Check 2: Parse files and validate content
         try:
             with open(self.config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+                self.config = yaml.load(f, Loader=YAML_LOADER)
         except Exception as e:
             self.failures.append(f"Corrupted configuration.yaml: {e}")
         
         try:
-            with open(self.timers_path, 'r') as f:
-                self.timers = json.load(f)
+            # Only gauges/metadata are used; skip the timer tree
+            self.timers = read_timer_sections(self.timers_path)
         except Exception as e:
             self.failures.append(f"Corrupted timers.json: {e}")
         
@@ -119,6 +176,10 @@ class RunAnalyzer:
         if self.size_bytes < 100 * 1024:
             self.warnings.append(f"Very small size: {self._format_size(self.size_bytes)}")
         
+        # Check 6: Truncated event files / half-written checkpoints (tail reads only)
+        if self.check_integrity:
+            self._check_artifacts()
+        
         return len(self.failures) > 0
     
     def _is_inference_mode(self) -> bool:
@@ -177,6 +238,14 @@ class RunAnalyzer:
                 checkpoints = behavior_data.get('checkpoints', [])
                 self.checkpoints.extend(checkpoints)
     
+    def _check_artifacts(self):
+        """Flag event files and checkpoints that were cut off (e.g. by a crash)."""
+        for artifact in sorted(self.artifacts):
+            problem = check_artifact(artifact)
+            if problem:
+                kind = "event file" if artifact_kind(artifact.name) == 'events' else "checkpoint"
+                self.failures.append(f"Corrupted {kind} {artifact.relative_to(self.path).as_posix()}: {problem}")
+    
     def _format_size(self, bytes_size: int) -> str:
         """Format bytes to human-readable size."""
         for unit in ['B', 'KB', 'MB', 'GB']:
@@ -185,6 +254,33 @@ class RunAnalyzer:
             bytes_size /= 1024.0
         return f"{bytes_size:.1f}TB"
     
+    def to_cache(self, is_failed: bool) -> Dict:
+        """Serializable verdict and extracted metrics for the scan cache."""
+        return {
+            'is_failed': is_failed,
+            'integrity_checked': self.check_integrity,
+            'failures': self.failures,
+            'warnings': self.warnings,
+            'size_bytes': self.size_bytes,
+            'file_count': self.file_count,
+            'reward': self.reward,
+            'duration': self.duration,
+            'checkpoints': self.checkpoints,
+        }
+    
+    @classmethod
+    def from_cache(cls, run_path: Path, entry: Dict) -> Tuple['RunAnalyzer', bool]:
+        """Rebuild an analyzed run from a scan cache entry."""
+        analyzer = cls(run_path)
+        analyzer.failures = entry['failures']
+        analyzer.warnings = entry['warnings']
+        analyzer.size_bytes = entry['size_bytes']
+        analyzer.file_count = entry['file_count']
+        analyzer.reward = entry['reward']
+        analyzer.duration = entry['duration']
+        analyzer.checkpoints = entry['checkpoints']
+        return analyzer, entry['is_failed']
+    
     def get_summary(self) -> str:
         """Get a one-line summary of the run."""
         if not self.failures:
@@ -194,33 +290,173 @@ class RunAnalyzer:
             return f"[FAIL] {', '.join(self.failures[:2])}"  # Show first 2 failures
 
 
-def scan_results(results_dir: Path) -> Tuple[List[RunAnalyzer], List[RunAnalyzer]]:
+def tree_fingerprint(run_path: Path) -> List:
+    """
+    [total bytes, file count, [[relative path, mtime_ns, size] of each event file
+    and checkpoint (artifact_kind)]]: changes when files are added, pruned or grow.
+    """
+    artifacts: List[Path] = []
+    total_bytes, file_count = directory_size(run_path, artifacts)
+    stats = []
+    for path in sorted(artifacts):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue  # Removed since the walk
+        stats.append([path.relative_to(run_path).as_posix(), st.st_mtime_ns, st.st_size])
+    return [total_bytes, file_count, stats]
+
+
+def run_fingerprint(run_path: Path, tree: bool = False) -> List:
+    """
+    [mtime_ns, size] of each FINGERPRINT_FILES entry (None if missing), followed
+    by tree_fingerprint() if tree is set (results that include sizes or integrity checks).
+    """
+    fingerprint: List = []
+    for name in FINGERPRINT_FILES:
+        try:
+            st = os.stat(run_path / name)
+            fingerprint.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            fingerprint.append(None)
+    if tree:
+        fingerprint.append(tree_fingerprint(run_path))
+    return fingerprint
+
+
+class ScanCache:
     """
-    Scan all runs in results directory.
-    Returns: (successful_runs, failed_runs)
+    Verdicts of previously analyzed runs, keyed by run name and the fingerprint
+    of its configuration.yaml, timers.json and training_status.json (plus its
+    size and artifacts for verdicts that include integrity checks).
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('runs', {})
+            except (OSError, ValueError):
+                pass  # Unreadable cache, start fresh
+    
+    def get(self, run_path: Path, fingerprint: List,
+            check_integrity: bool = True) -> Optional[Tuple[RunAnalyzer, bool]]:
+        entry = self.entries.get(run_path.name)
+        # Without integrity checks only the FINGERPRINT_FILES part has to match
+        hit = (entry is not None and entry.get('fingerprint', [])[:len(fingerprint)] == fingerprint
+               and (entry['result'].get('integrity_checked') or not check_integrity))
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return RunAnalyzer.from_cache(run_path, entry['result']) if hit else None
+    
+    def put(self, analyzer: RunAnalyzer, is_failed: bool, fingerprint: List):
+        with self._lock:
+            self.entries[analyzer.name] = {
+                'fingerprint': fingerprint,
+                'result': analyzer.to_cache(is_failed),
+            }
+    
+    def prune(self, run_names: List[str]):
+        """Drop entries for runs that no longer exist."""
+        keep = set(run_names)
+        self.entries = {name: entry for name, entry in self.entries.items() if name in keep}
+    
+    def save(self):
+        """Write atomically so an interrupted scan never leaves a corrupt cache."""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'runs': self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[WARN] Could not write scan cache {self.path}: {e}")
+
+
+def _analyze_run(run_path: Path, cache: Optional[ScanCache] = None,
+                 check_integrity: bool = True) -> Tuple[RunAnalyzer, Optional[bool]]:
+    """(analyzer, is_failed); is_failed is None for a live run, which is not parsed."""
+    live = live_status(run_path)
+    if live is not None:
+        analyzer = RunAnalyzer(run_path, check_integrity)
+        analyzer.live = live
+        return analyzer, None
+    
+    if cache is None:
+        analyzer = RunAnalyzer(run_path, check_integrity)
+        return analyzer, analyzer.analyze()
+    
+    fingerprint = run_fingerprint(run_path, tree=check_integrity)
+    cached = cache.get(run_path, fingerprint, check_integrity)
+    if cached is not None:
+        return cached
+    
+    analyzer = RunAnalyzer(run_path, check_integrity)
+    is_failed = analyzer.analyze()
+    cache.put(analyzer, is_failed, fingerprint)
+    return analyzer, is_failed
+
+
+def scan_results(results_dir: Path, workers: Optional[int] = None, cache: Optional[ScanCache] = None,
+                 check_integrity: bool = True) -> Tuple[List[RunAnalyzer], List[RunAnalyzer], List[RunAnalyzer]]:
+    """
+    Scan all runs in results directory, analyzing runs concurrently.
+    workers=None uses the ThreadPoolExecutor default; workers=1 scans sequentially.
+    With a cache, runs whose key files are unchanged reuse their cached verdict.
+    check_integrity also tail-checks event files and checkpoints (artifact_integrity.py).
+    Runs still training (run_liveness.py) are only reported, not analyzed.
+    Returns: (successful_runs, failed_runs, live_runs)
     """
     if not results_dir.exists():
         print(f"[ERROR] Results directory not found: {results_dir}")
-        return [], []
+        return [], [], []
+    
+    # Hidden directories (e.g. the .checkpoint_store of dedup_checkpoints.py) are not runs
+    with os.scandir(results_dir) as entries:
+        run_dirs = sorted(Path(entry.path) for entry in entries
+                          if entry.is_dir() and not entry.name.startswith('.'))
+    
+    if workers == 1:
+        results = [_analyze_run(run_dir, cache, check_integrity) for run_dir in run_dirs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() keeps the sorted order
+            results = list(executor.map(lambda run_dir: _analyze_run(run_dir, cache, check_integrity), run_dirs))
+    
+    if cache is not None:
+        # Live runs keep their old entry (if any) until they are analyzed again
+        cache.prune([run_dir.name for run_dir in run_dirs])
+        cache.save()
     
     successful_runs = []
     failed_runs = []
+    live_runs = []
     
-    for run_dir in sorted(results_dir.iterdir()):
-        if run_dir.is_dir():
-            analyzer = RunAnalyzer(run_dir)
-            is_failed = analyzer.analyze()
-            
-            if is_failed:
-                failed_runs.append(analyzer)
-            else:
-                successful_runs.append(analyzer)
+    for analyzer, is_failed in results:
+        if is_failed is None:
+            live_runs.append(analyzer)
+        elif is_failed:
+            failed_runs.append(analyzer)
+        else:
+            successful_runs.append(analyzer)
     
-    return successful_runs, failed_runs
+    return successful_runs, failed_runs, live_runs
 
 
-def print_report(successful_runs: List[RunAnalyzer], failed_runs: List[RunAnalyzer]):
+def print_report(successful_runs: List[RunAnalyzer], failed_runs: List[RunAnalyzer],
+                 live_runs: Optional[List[RunAnalyzer]] = None):
     """Print a detailed report of all runs."""
+    live_runs = live_runs or []
     total_wasted_bytes = sum(run.size_bytes for run in failed_runs)
     # Create a temporary analyzer just for formatting
     temp_analyzer = RunAnalyzer(Path('.'))
@@ -229,12 +465,22 @@ def print_report(successful_runs: List[RunAnalyzer], failed_runs: List[RunAnalyz
     print("=" * 100)
     print("ML-AGENTS RUN ANALYSIS REPORT")
     print("=" * 100)
-    print(f"Total runs: {len(successful_runs) + len(failed_runs)}")
+    print(f"Total runs: {len(successful_runs) + len(failed_runs) + len(live_runs)}")
     print(f"[OK] Successful: {len(successful_runs)}")
     print(f"[FAIL] Failed: {len(failed_runs)}")
+    if live_runs:
+        print(f"[LIVE] Still training (not analyzed): {len(live_runs)}")
     print(f"Disk space wasted: {wasted_size}")
     print()
     
+    if live_runs:
+        print("=" * 100)
+        print("LIVE RUNS")
+        print("=" * 100)
+        for run in live_runs:
+            print(f"[LIVE] {run.name:50s} {describe_live(run.live)}")
+        print()
+    
     # Print successful runs (brief)
     if successful_runs:
         print("=" * 100)
@@ -353,6 +599,9 @@ Examples:
   python utils/check_failed_runs.py              # Scan and report only
   python utils/check_failed_runs.py --clean      # Scan and delete failed runs
   python utils/check_failed_runs.py --dry-run    # Show what would be deleted
+  python utils/check_failed_runs.py --workers 16 # Analyze 16 runs at a time
+  python utils/check_failed_runs.py --no-cache   # Re-analyze every run from scratch
+  python utils/check_failed_runs.py --no-integrity  # Skip event file/checkpoint checks
         """
     )
     parser.add_argument('--clean', action='store_true',
@@ -363,6 +612,12 @@ Examples:
                         help='Skip confirmation prompt (auto-confirm deletion)')
     parser.add_argument('--results-dir', type=str, default=None,
                         help='Path to results directory (default: src/results relative to project root)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Runs analyzed in parallel (default: thread pool default, 1 = sequential)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Re-analyze every run and skip the scan cache ({CACHE_FILENAME} in the results directory)')
+    parser.add_argument('--no-integrity', action='store_true',
+                        help='Skip the truncation checks of event files and .onnx/.pt checkpoints')
     
     args = parser.parse_args()
     
@@ -382,9 +637,22 @@ Examples:
     print("Scanning results directory...")
     print()
     
-    successful_runs, failed_runs = scan_results(results_dir)
+    cache = None if args.no_cache or not results_dir.exists() else ScanCache(results_dir / CACHE_FILENAME)
+    
+    scan_start = time.perf_counter()
+    successful_runs, failed_runs, live_runs = scan_results(results_dir, workers=args.workers, cache=cache,
+                                                           check_integrity=not args.no_integrity)
+    scan_elapsed = max(time.perf_counter() - scan_start, 1e-9)
+    
+    total_runs = len(successful_runs) + len(failed_runs) + len(live_runs)
+    total_files = sum(run.file_count for run in successful_runs + failed_runs)
+    print(f"Scanned {total_runs} runs ({total_files:,} files) in {scan_elapsed:.2f}s: "
+          f"{total_runs / scan_elapsed:,.1f} runs/sec, {total_files / scan_elapsed:,.0f} files/sec")
+    if cache is not None:
+        print(f"Cache: {cache.hits} unchanged runs reused, {cache.misses} analyzed")
+    print()
     
-    print_report(successful_runs, failed_runs)
+    print_report(successful_runs, failed_runs, live_runs)
     
     if failed_runs:
         generate_cleanup_commands(failed_runs, results_dir)
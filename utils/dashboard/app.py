@@ -3,21 +3,75 @@ ML-Agents Training Dashboard
 A web UI for visualizing and comparing training runs
 """
 import os
+import sys
 import json
+import time
+import atexit
+import argparse
+import threading
 import yaml
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, jsonify
-from typing import Dict, List, Any, Optional
+from flask import Flask, Response, render_template, jsonify, request
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))  # extract_tensorboard_data
+from run_archive import open_run
+from run_liveness import live_status
+from timers_stream import read_timer_sections
+from run_cache import RunCache
+from events import RunEventHub
+from series import SeriesFileCache, parse_series_args, select_indices, sampling_info, file_version
+from distributions import EpisodeDataCache, parse_distribution_args
+from stamina import (StaminaStore, parse_stamina_args, query, episode_list, to_json, to_binary,
+                     BINARY_MIME)
+import http_cache
+from tensorboard_series import TensorBoardSeries, event_versions
 
 app = Flask(__name__)
 
 # Path to results directory (dashboard is now in utils/dashboard, so need to go up 2 levels)
 RESULTS_DIR = Path(__file__).parent.parent.parent / "src" / "results"
 
+# Parsed *_over_time.json files behind the downsampled analysis series
+series_files = SeriesFileCache()
+SERIES_ARGS_ERROR = "max_points, min_step and max_step must be numbers"
+# episode_data.json columns and histogram/percentile results
+episode_data = EpisodeDataCache()
+# Stamina trajectory indexes (memory-mapped, in RESULTS_DIR/.stamina_index)
+stamina_indexes = StaminaStore()
+# Series extracted on demand from TensorBoard event files (in RESULTS_DIR/.tensorboard_cache)
+tensorboard_series = TensorBoardSeries()
+
+# Parsed run index persisted across restarts (see warm_start)
+SNAPSHOT_FILENAME = ".dashboard_snapshot.json.gz"
+SNAPSHOT_INTERVAL = float(os.environ.get('DASHBOARD_SNAPSHOT_SECONDS', 300))
+
+# Fields returned when a request doesn't pass ?fields= (full_config, full_timers
+# and the per-gauge metrics have their own endpoints under /api/run/<run_id>/)
+RUN_LIST_FIELDS = ('run_id', 'mode', 'behavior_name', 'live', 'config', 'engine', 'timestamps',
+                   'key_metrics', 'latest_checkpoint', 'num_checkpoints')
+RUN_DETAIL_FIELDS = RUN_LIST_FIELDS + ('path', 'metadata', 'checkpoints')
+# Files get_run_data reads for everything but liveness (config, checkpoints, gauges)
+RUN_DATA_FILES = ('configuration.yaml', 'run_logs/training_status.json', 'run_logs/timers.json')
+
+# Threads loading runs concurrently when the run list is (re)built (None: one after another)
+io_pool: Optional[ThreadPoolExecutor] = None
+IO_CHUNK_RUNS = 32
+# Open /api/events streams allowed (None: unlimited). Each one holds a server thread
+# for as long as the page is open, so a fixed pool (--production) caps them.
+MAX_EVENT_STREAMS: Optional[int] = None
+
 
-def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
-    """Parse all data for a single run."""
+def parse_run_data(run_path: Path, live: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parse all data for a single run.
+    With live (run_liveness.live_status of a run still training), only configuration.yaml
+    is parsed; progress comes from the heartbeat instead of files being written.
+    """
     try:
         run_data = {
             "run_id": run_path.name,
@@ -28,9 +82,9 @@ def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
         # Parse configuration.yaml
         config_path = run_path / "configuration.yaml"
         if config_path.exists():
-            with open(config_path, 'r') as f:
+            with config_path.open('r') as f:
                 config = yaml.safe_load(f)
-                
+            
             # Extract key config details
             behavior_name = list(config.get('behaviors', {}).keys())[0] if config.get('behaviors') else None
             if behavior_name:
@@ -62,12 +116,15 @@ def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
                 
                 run_data['full_config'] = config
         
+        if live is not None:
+            return add_live_status(run_data, live)
+        
         # Parse training_status.json
         status_path = run_path / "run_logs" / "training_status.json"
         if status_path.exists():
-            with open(status_path, 'r') as f:
+            with status_path.open('r') as f:
                 status = json.load(f)
-                
+            
             behavior_name = run_data.get('behavior_name', list(status.keys())[0])
             if behavior_name in status:
                 behavior_status = status[behavior_name]
@@ -88,9 +145,9 @@ def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
         # Parse timers.json for metrics
         timers_path = run_path / "run_logs" / "timers.json"
         if timers_path.exists():
-            with open(timers_path, 'r') as f:
-                timers = json.load(f)
-                
+            # Only gauges and metadata are needed, not the timer tree
+            timers = read_timer_sections(timers_path)
+            
             metadata = timers.get('metadata', {})
             gauges = timers.get('gauges', {})
             
@@ -147,30 +204,233 @@ def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
             run_data['full_timers'] = timers
         
         return run_data
-        
+    
     except Exception as e:
         print(f"Error parsing run {run_path.name}: {e}")
         return None
 
 
+def add_live_status(run_data: Dict[str, Any], live: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill the fields the run list shows from a live run's heartbeat."""
+    started = live.get('started')
+    run_data['live'] = live
+    run_data['timestamps'] = {
+        'start': datetime.fromtimestamp(started).strftime('%Y-%m-%d %H:%M:%S') if started else None,
+        'end': None,
+        'duration_seconds': live['updated'] - started if started else None,
+        'duration_minutes': (live['updated'] - started) / 60 if started else None,
+    }
+    run_data['key_metrics'] = {
+        'cumulative_reward_mean': live.get('reward'),
+        'total_steps': live.get('step'),
+        'is_training': True,
+    }
+    return run_data
+
+
+def load_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
+    """parse_run_data, with only the heartbeat status for runs still training."""
+    return parse_run_data(run_path, live=live_status(run_path))
+
+
+# Parsed runs shared by all requests, re-parsed when their files change
+run_cache = RunCache(load_run_data)
+
+
+def get_run_data(run_path: Path, full: bool = False, revalidate: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Parsed data of one run from run_cache (shared: do not modify it).
+    full=True also parses the logs of a live run (uncached, they are still being written).
+    revalidate=True checks the files now: views under run_files() must, since their
+    ETag comes from the files' versions stat'ed just before (the body may be newer
+    than the tag, never older).
+    """
+    run_data = run_cache.get(run_path, revalidate)
+    if full and run_data is not None and run_data.get('live'):
+        return parse_run_data(run_path)
+    return run_data
+
+
+def load_runs(run_dirs: List, revalidate: bool = False) -> List[Optional[Dict[str, Any]]]:
+    """
+    run_cache.get of each run, in order. With io_pool, chunks of runs are loaded
+    concurrently: stat calls and file reads of uncached runs overlap instead of
+    queueing (most of the time of a cold start on network or spinning disks).
+    """
+    if io_pool is None or len(run_dirs) <= IO_CHUNK_RUNS:
+        return [run_cache.get(run_dir, revalidate) for run_dir in run_dirs]
+    chunks = [run_dirs[i:i + IO_CHUNK_RUNS] for i in range(0, len(run_dirs), IO_CHUNK_RUNS)]
+    loaded = io_pool.map(lambda chunk: [run_cache.get(run_dir, revalidate) for run_dir in chunk], chunks)
+    return [run_data for chunk in loaded for run_data in chunk]
+
+
 def get_all_runs() -> List[Dict[str, Any]]:
-    """Get data for all runs in the results directory."""
+    """
+    Get data for all runs in the results directory.
+    Runs still training get a cheap status from their heartbeat instead of a full parse.
+    Served from run_cache; only new or changed runs are parsed.
+    """
     if not RESULTS_DIR.exists():
         return []
     
-    runs = []
-    for run_dir in sorted(RESULTS_DIR.iterdir()):
-        if run_dir.is_dir():
-            run_data = parse_run_data(run_dir)
-            if run_data:
-                runs.append(run_data)
+    # Run directories and archived run bundles
+    runs = [run_data for run_data in load_runs(run_cache.list_runs(RESULTS_DIR)) if run_data]
     
     # Sort by timestamp (newest first)
-    runs.sort(key=lambda x: x.get('timestamps', {}).get('start', ''), reverse=True)
+    runs.sort(key=lambda x: x.get('timestamps', {}).get('start') or '', reverse=True)
     
     return runs
 
 
+# Pushes run list diffs to the dashboard pages (/api/events)
+run_events = RunEventHub(lambda: {run['run_id']: run for run in get_all_runs()},
+                         lambda run: project_run(run, RUN_LIST_FIELDS))
+
+
+snapshot_state: Dict[str, Any] = {'loaded': 0, 'revalidated': False, 'saved': None, 'error': None}
+
+
+def save_snapshot():
+    """Write run_cache to RESULTS_DIR/SNAPSHOT_FILENAME if it changed since the last save."""
+    if not RESULTS_DIR.exists() or not run_cache.changed_since_save:
+        return
+    try:
+        run_cache.save_snapshot(RESULTS_DIR / SNAPSHOT_FILENAME)
+        snapshot_state['saved'] = datetime.now().isoformat(timespec='seconds')
+        snapshot_state['error'] = None
+    except OSError as e:
+        snapshot_state['error'] = str(e)
+        print(f"[WARN] Could not write dashboard snapshot {RESULTS_DIR / SNAPSHOT_FILENAME}: {e}")
+
+
+def _snapshot_worker():
+    # Check every cached run against its files (new/changed ones are parsed), then save periodically
+    load_runs(run_cache.list_runs(RESULTS_DIR) if RESULTS_DIR.exists() else [], revalidate=True)
+    snapshot_state['revalidated'] = True
+    save_snapshot()
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        save_snapshot()
+
+
+def warm_start():
+    """
+    Load the snapshot written by the previous dashboard process, so the first
+    requests are answered without parsing the results directory. A background
+    thread then revalidates every run, and the snapshot is rewritten every
+    SNAPSHOT_INTERVAL seconds and on exit.
+    """
+    started = time.perf_counter()
+    snapshot_state['loaded'] = run_cache.load_snapshot(RESULTS_DIR / SNAPSHOT_FILENAME)
+    if snapshot_state['loaded']:
+        print(f"[OK] Loaded {snapshot_state['loaded']} runs from {SNAPSHOT_FILENAME} "
+              f"in {time.perf_counter() - started:.2f}s")
+    atexit.register(save_snapshot)
+    threading.Thread(target=_snapshot_worker, name='dashboard-snapshot', daemon=True).start()
+
+
+def _field_value(run: Dict[str, Any], path: str) -> Any:
+    """Value at a dotted path (e.g. 'key_metrics.total_steps'), None if missing."""
+    value: Any = run
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def project_run(run: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Copy of run with only the given fields. Dotted paths keep just that
+    sub-field ('key_metrics.total_steps' -> {'key_metrics': {'total_steps': ...}}).
+    fields=None returns the full run.
+    """
+    if fields is None:
+        return run
+    projected: Dict[str, Any] = {}
+    for path in fields:
+        keys = path.split('.')
+        source: Any = run
+        for key in keys:
+            if not isinstance(source, dict) or key not in source:
+                break
+            source = source[key]
+        else:
+            target = projected
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = source
+    return projected
+
+
+def requested_fields(default: Tuple[str, ...]) -> Optional[List[str]]:
+    """?fields=a,b.c -> list; ?fields=* -> None (everything); missing -> default."""
+    fields = request.args.get('fields')
+    if fields is None:
+        return list(default)
+    if fields.strip() == '*':
+        return None
+    return [f.strip() for f in fields.split(',') if f.strip()]
+
+
+def sort_runs(runs: List[Dict[str, Any]], sort: str) -> List[Dict[str, Any]]:
+    """Sort by a (dotted) field, '-field' for descending; runs without the field go last."""
+    path = sort.lstrip('-+')
+    present = [r for r in runs if _field_value(r, path) is not None]
+    missing = [r for r in runs if _field_value(r, path) is None]
+    # Numbers and strings in separate groups so mixed fields still sort
+    present.sort(key=lambda r: (isinstance(_field_value(r, path), str), _field_value(r, path)),
+                 reverse=sort.startswith('-'))
+    return present + missing
+
+
+def run_files(*names, extracted: bool = False):
+    """
+    http_cache.conditional() on the versions of the given files of the run (paths from the run root).
+    extracted=True also covers the series extracted on demand from its TensorBoard event files.
+    """
+    def versions(run_id):
+        run_path = open_run(RESULTS_DIR, run_id)
+        if run_path is None:
+            return None
+        current = [file_version(run_path / name) for name in names]
+        if extracted:
+            # Event files: a new extraction is due; cache: a new extraction finished
+            current += [event_versions(run_path), tensorboard_series.version(RESULTS_DIR, run_id)]
+        return current
+    return http_cache.conditional(versions)
+
+
+def extracted_series(run_id: str, run_path, name: str, max_points: Optional[int],
+                     min_step: Optional[float], max_step: Optional[float]) -> Tuple[Optional[Response], Optional[str]]:
+    """
+    (response, None) for a series file missing from run_logs/ but extracted from the run's
+    TensorBoard event files (see tensorboard_series.py), 202 while the extraction runs;
+    (None, reason) if it can't be extracted.
+    """
+    status, value = tensorboard_series.get(RESULTS_DIR, run_id, run_path, name)
+    if status == 'pending':
+        response = jsonify({"status": "extracting", "message": "Extracting the series from TensorBoard event files..."})
+        response.status_code = 202
+        response.headers['Retry-After'] = '2'
+        return response, None
+    if status == 'unavailable':
+        return None, value
+    try:
+        result = series_files.downsample(value, 'step', None, max_points, min_step, max_step)
+    except Exception as e:
+        return None, f"Failed to read extracted file: {e}"
+    return jsonify({**result, 'source': 'tensorboard'}), None
+
+
+@app.after_request
+def cache_validators(response):
+    """ETag, 304 Not Modified and gzip/brotli for the API (see http_cache.py)."""
+    if request.path.startswith('/api/'):
+        return http_cache.finalize(response)
+    return response
+
+
 @app.route('/')
 def index():
     """Main dashboard page."""
@@ -185,22 +445,118 @@ def analysis():
 
 @app.route('/api/runs')
 def api_runs():
-    """API endpoint to get all runs data."""
+    """
+    API endpoint to get all runs data.
+    Query parameters:
+      fields  comma-separated fields, dotted for nested ones (default: RUN_LIST_FIELDS, * = all)
+      mode    training | inference
+      sort    field to sort by, '-field' for descending (default: newest first)
+      limit, offset  pagination; the unpaginated count is in the X-Total-Count header
+    X-Event-Id: subscribe to /api/events?since=<it> to get the changes made after this response
+    """
+    event_id = run_events.current_id()  # Before the list: later events may repeat, none are missed
     runs = get_all_runs()
-    return jsonify(runs)
+    
+    mode = request.args.get('mode')
+    if mode:
+        runs = [r for r in runs if r.get('mode') == mode]
+    
+    sort = request.args.get('sort')
+    if sort:
+        runs = sort_runs(runs, sort)
+    
+    total = len(runs)
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = request.args.get('limit')
+        limit = max(int(limit), 0) if limit is not None else None
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    runs = runs[offset:offset + limit] if limit is not None else runs[offset:]
+    
+    fields = requested_fields(RUN_LIST_FIELDS)
+    response = jsonify([project_run(run, fields) for run in runs])
+    response.headers['X-Total-Count'] = str(total)
+    response.headers['X-Event-Id'] = event_id
+    return response
+
+
+@app.route('/api/events')
+def api_events():
+    """
+    Server-sent events with changes to the run list (run_added, run_updated,
+    run_removed, reset; see events.py). Resumes after the Last-Event-ID header,
+    or ?since= (the X-Event-Id of an /api/runs response) on first connect.
+    503 once MAX_EVENT_STREAMS streams are open.
+    """
+    if MAX_EVENT_STREAMS is not None and run_events.stats()['subscribers'] >= MAX_EVENT_STREAMS:
+        # The page falls back to polling /api/runs
+        return jsonify({"error": "Too many open event streams"}), 503
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+    return Response(run_events.subscribe(last_event_id), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/cache')
+def api_cache():
+    """Run cache statistics (entries, bytes, hits/misses, evictions), snapshot, event stream, compression and extraction status."""
+    return jsonify({**run_cache.stats(), 'snapshot': snapshot_state, 'events': run_events.stats(),
+                    'http': http_cache.compressed_bodies.stats(), 'tensorboard': tensorboard_series.stats()})
 
 
 @app.route('/api/run/<run_id>')
 def api_run_detail(run_id):
-    """API endpoint to get detailed data for a specific run."""
-    run_path = RESULTS_DIR / run_id
-    if run_path.exists():
-        run_data = parse_run_data(run_path)
+    """
+    API endpoint to get detailed data for a specific run.
+    ?fields= as for /api/runs (default: RUN_DETAIL_FIELDS, * = all).
+    """
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is not None:
+        run_data = get_run_data(run_path, full=True)
         if run_data:
-            return jsonify(run_data)
+            return jsonify(project_run(run_data, requested_fields(RUN_DETAIL_FIELDS)))
     return jsonify({"error": "Run not found"}), 404
 
 
+@app.route('/api/run/<run_id>/config')
+@run_files('configuration.yaml')
+def api_run_config(run_id):
+    """Full configuration.yaml of a run."""
+    run_path = open_run(RESULTS_DIR, run_id)
+    run_data = get_run_data(run_path, revalidate=True) if run_path is not None else None
+    if not run_data:
+        return jsonify({"error": "Run not found"}), 404
+    return jsonify(run_data.get('full_config') or {})
+
+
+@app.route('/api/run/<run_id>/metrics')
+@run_files(*RUN_DATA_FILES)
+def api_run_metrics(run_id):
+    """All final gauges of a run (current/min/max/count), without the behavior prefix."""
+    run_path = open_run(RESULTS_DIR, run_id)
+    run_data = get_run_data(run_path, full=True, revalidate=True) if run_path is not None else None
+    if not run_data:
+        return jsonify({"error": "Run not found"}), 404
+    return jsonify(run_data.get('metrics') or {})
+
+
+@app.route('/api/run/<run_id>/timers')
+@run_files('run_logs/timers.json')
+def api_run_timers(run_id):
+    """Complete timers.json of a run, timer tree included (read on demand, not cached)."""
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
+        return jsonify({"error": "Run not found"}), 404
+    timers_path = run_path / "run_logs" / "timers.json"
+    if not timers_path.exists():
+        return jsonify({"error": "timers.json not available"}), 404
+    try:
+        with timers_path.open('r') as f:
+            return jsonify(json.load(f))
+    except Exception as e:
+        return jsonify({"error": f"Failed to read timers.json: {e}"}), 500
+
+
 @app.route('/api/compare')
 def api_compare():
     """API endpoint to get comparison data for all runs."""
@@ -271,13 +627,23 @@ def api_compare():
 
 
 @app.route('/api/analysis/training-curve/<run_id>')
+@run_files(*RUN_DATA_FILES)
 def api_training_curve(run_id):
-    """API endpoint for training curve data (Graph 1)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+    """
+    API endpoint for training curve data (Graph 1).
+    Series endpoints take ?max_points= (default 1000, 0 = all; LTTB downsampling)
+    and ?min_step= / ?max_step=, see series.py.
+    """
+    try:
+        max_points, min_step, max_step = parse_series_args(request.args)
+    except ValueError:
+        return jsonify({"error": SERIES_ARGS_ERROR}), 400
+    
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
-    run_data = parse_run_data(run_path)
+    run_data = get_run_data(run_path, full=True, revalidate=True)
     if not run_data:
         return jsonify({"error": "Failed to parse run data"}), 500
     
@@ -287,35 +653,50 @@ def api_training_curve(run_id):
     
     # Sort by steps
     checkpoints = sorted(checkpoints, key=lambda x: x['steps'])
+    steps = [cp['steps'] for cp in checkpoints]
+    rewards = [cp.get('reward', 0) for cp in checkpoints]
+    indices, total = select_indices(np.array(steps, dtype=np.float64),
+                                    [np.array(rewards, dtype=np.float64)], max_points, min_step, max_step)
     
     data = {
-        'steps': [cp['steps'] for cp in checkpoints],
-        'rewards': [cp.get('reward', 0) for cp in checkpoints],
-        'run_id': run_id
+        'steps': [steps[i] for i in indices],
+        'rewards': [rewards[i] for i in indices],
+        'run_id': run_id,
+        'sampling': sampling_info(total, len(indices), max_points)
     }
     
     return jsonify(data)
 
 
 @app.route('/api/analysis/action-distribution/<run_id>')
+@run_files('run_logs/action_distribution_over_time.json', *RUN_DATA_FILES, extracted=True)
 def api_action_distribution(run_id):
     """API endpoint for action distribution over time (Graph 2)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+    try:
+        max_points, min_step, max_step = parse_series_args(request.args)
+    except ValueError:
+        return jsonify({"error": SERIES_ARGS_ERROR}), 400
+    
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
     # Try to read from extracted JSON file
     action_file = run_path / "run_logs" / "action_distribution_over_time.json"
     if action_file.exists():
         try:
-            with open(action_file, 'r') as f:
-                data = json.load(f)
-                return jsonify(data)
+            return jsonify(series_files.downsample(action_file, 'step', None, max_points, min_step, max_step))
         except Exception as e:
             return jsonify({"error": f"Failed to read action distribution file: {e}"}), 500
     
+    # Not extracted yet: extract it from the event files
+    response, extraction_error = extracted_series(run_id, run_path, "action_distribution_over_time.json",
+                                                  max_points, min_step, max_step)
+    if response is not None:
+        return response
+    
     # Fallback to final values from timers.json
-    run_data = parse_run_data(run_path)
+    run_data = get_run_data(run_path, full=True, revalidate=True)
     if not run_data:
         return jsonify({"error": "Failed to parse run data"}), 500
     
@@ -331,13 +712,19 @@ def api_action_distribution(run_id):
     return jsonify({
         "error": "Time series data not available",
         "message": "Only final action distribution percentages are available. Run extract_tensorboard_data.py to generate time series data.",
+        "extraction_error": extraction_error,
         "final_values": action_data
     })
 
 
 @app.route('/api/analysis/comparative/<run_id>')
 def api_comparative(run_id):
-    """API endpoint for comparative analysis (Graph 3)."""
+    """API endpoint for comparative analysis (Graph 3). Curves are downsampled like training-curve."""
+    try:
+        max_points, min_step, max_step = parse_series_args(request.args)
+    except ValueError:
+        return jsonify({"error": SERIES_ARGS_ERROR}), 400
+    
     # Get all training runs
     all_runs = get_all_runs()
     training_runs = [r for r in all_runs if r.get('mode') == 'training']
@@ -351,7 +738,8 @@ def api_comparative(run_id):
     for run in training_runs:
         # Check if we can determine style frequency from config or run name
         # For now, we'll use the selected run and try to find similar ones
-        run_data = parse_run_data(RESULTS_DIR / run['run_id'])
+        run_path = open_run(RESULTS_DIR, run['run_id'])
+        run_data = get_run_data(run_path) if run_path is not None else None
         if run_data:
             # We'll need to check CharacterConfig.cs or config files for style frequency
             # For now, return all training runs for comparison
@@ -366,34 +754,48 @@ def api_comparative(run_id):
         checkpoints = run.get('checkpoints', [])
         if checkpoints:
             sorted_cps = sorted(checkpoints, key=lambda x: x['steps'])
+            steps = [cp['steps'] for cp in sorted_cps]
+            rewards = [cp.get('reward', 0) for cp in sorted_cps]
+            indices, _ = select_indices(np.array(steps, dtype=np.float64),
+                                        [np.array(rewards, dtype=np.float64)], max_points, min_step, max_step)
             comparison_data['runs'].append({
                 'run_id': run['run_id'],
-                'steps': [cp['steps'] for cp in sorted_cps],
-                'rewards': [cp.get('reward', 0) for cp in sorted_cps]
+                'steps': [steps[i] for i in indices],
+                'rewards': [rewards[i] for i in indices]
             })
     
     return jsonify(comparison_data)
 
 
 @app.route('/api/analysis/policy-value-loss/<run_id>')
+@run_files('run_logs/losses_over_time.json', *RUN_DATA_FILES, extracted=True)
 def api_policy_value_loss(run_id):
     """API endpoint for policy and value loss over training (Graph 7)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+    try:
+        max_points, min_step, max_step = parse_series_args(request.args)
+    except ValueError:
+        return jsonify({"error": SERIES_ARGS_ERROR}), 400
+    
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
     # Try to read from extracted JSON file
     loss_file = run_path / "run_logs" / "losses_over_time.json"
     if loss_file.exists():
         try:
-            with open(loss_file, 'r') as f:
-                data = json.load(f)
-                return jsonify(data)
+            return jsonify(series_files.downsample(loss_file, 'step', None, max_points, min_step, max_step))
         except Exception as e:
             return jsonify({"error": f"Failed to read losses file: {e}"}), 500
     
+    # Not extracted yet: extract it from the event files
+    response, extraction_error = extracted_series(run_id, run_path, "losses_over_time.json",
+                                                  max_points, min_step, max_step)
+    if response is not None:
+        return response
+    
     # Fallback to final values from timers.json
-    run_data = parse_run_data(run_path)
+    run_data = get_run_data(run_path, full=True, revalidate=True)
     if not run_data:
         return jsonify({"error": "Failed to parse run data"}), 500
     
@@ -402,6 +804,7 @@ def api_policy_value_loss(run_id):
     return jsonify({
         "error": "Time series data not available",
         "message": "Only final policy and value loss values are available. Run extract_tensorboard_data.py to generate time series data.",
+        "extraction_error": extraction_error,
         "final_values": {
             "policy_loss": metrics.get('Losses.PolicyLoss.mean', {}).get('current'),
             "value_loss": metrics.get('Losses.ValueLoss.mean', {}).get('current')
@@ -410,24 +813,34 @@ def api_policy_value_loss(run_id):
 
 
 @app.route('/api/analysis/entropy/<run_id>')
+@run_files('run_logs/entropy_over_time.json', *RUN_DATA_FILES, extracted=True)
 def api_entropy(run_id):
     """API endpoint for entropy over training (Graph 8)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+    try:
+        max_points, min_step, max_step = parse_series_args(request.args)
+    except ValueError:
+        return jsonify({"error": SERIES_ARGS_ERROR}), 400
+    
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
     # Try to read from extracted JSON file
     entropy_file = run_path / "run_logs" / "entropy_over_time.json"
     if entropy_file.exists():
         try:
-            with open(entropy_file, 'r') as f:
-                data = json.load(f)
-                return jsonify(data)
+            return jsonify(series_files.downsample(entropy_file, 'step', None, max_points, min_step, max_step))
         except Exception as e:
             return jsonify({"error": f"Failed to read entropy file: {e}"}), 500
     
+    # Not extracted yet: extract it from the event files
+    response, extraction_error = extracted_series(run_id, run_path, "entropy_over_time.json",
+                                                  max_points, min_step, max_step)
+    if response is not None:
+        return response
+    
     # Fallback to final value from timers.json
-    run_data = parse_run_data(run_path)
+    run_data = get_run_data(run_path, full=True, revalidate=True)
     if not run_data:
         return jsonify({"error": "Failed to parse run data"}), 500
     
@@ -436,92 +849,106 @@ def api_entropy(run_id):
     return jsonify({
         "error": "Time series data not available",
         "message": "Only final entropy value is available. Run extract_tensorboard_data.py to generate time series data.",
+        "extraction_error": extraction_error,
         "final_value": metrics.get('Policy.Entropy.mean', {}).get('current')
     })
 
 
-@app.route('/api/analysis/episode-length-dist/<run_id>')
-def api_episode_length_dist(run_id):
-    """API endpoint for episode length distribution (Graph 5)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+def episode_distribution(run_id: str, metric: str, unavailable_error: str):
+    """
+    Histogram, percentiles and success rates of one episode_data.json metric (see distributions.py).
+    Query parameters: bins or bin_width, percentiles, min_step / max_step, max_points.
+    """
+    try:
+        options = parse_distribution_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter: {e}"}), 400
+    
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
     episode_file = run_path / "run_logs" / "episode_data.json"
     if episode_file.exists():
         try:
-            with open(episode_file, 'r') as f:
-                data = json.load(f)
-                return jsonify(data)
+            result = episode_data.summary(episode_file, metric, options)
+            return jsonify({**result, 'run_id': run_id})
         except Exception as e:
             return jsonify({"error": f"Failed to read episode data file: {e}"}), 500
     
-    return jsonify({"error": "Episode data not available", "message": "Run training with TrainingLogger.cs enabled to generate episode data."})
+    return jsonify({"error": unavailable_error, "message": "Run training with TrainingLogger.cs enabled to generate episode data."})
+
+
+@app.route('/api/analysis/episode-length-dist/<run_id>')
+@run_files('run_logs/episode_data.json')
+def api_episode_length_dist(run_id):
+    """API endpoint for episode length distribution (Graph 5)."""
+    return episode_distribution(run_id, 'length', "Episode data not available")
 
 
 @app.route('/api/analysis/stamina/<run_id>')
+@run_files('run_logs/stamina_trajectories.json')
 def api_stamina(run_id):
-    """API endpoint for stamina management (Graph 6)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+    """
+    API endpoint for stamina management (Graph 6), by episode range (see stamina.py).
+    Query parameters: start_episode / end_episode, episodes, offset / limit, max_points,
+    index=1 (episode numbers only), format=binary (or Accept: application/octet-stream).
+    """
+    try:
+        options = parse_stamina_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter: {e}"}), 400
+    
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
     stamina_file = run_path / "run_logs" / "stamina_trajectories.json"
     if stamina_file.exists():
         try:
-            with open(stamina_file, 'r') as f:
-                data = json.load(f)
-                
-                # Ensure data structure is correct
-                if 'trajectories' not in data:
-                    return jsonify({
-                        "error": "Invalid data format",
-                        "message": "stamina_trajectories.json missing 'trajectories' key"
-                    }), 500
-                
-                trajectories = data.get('trajectories', [])
-                if not trajectories:
-                    return jsonify({
-                        "error": "No trajectory data",
-                        "message": "stamina_trajectories.json contains no trajectories"
-                    }), 500
-                
-                # Validate and clean data
-                valid_trajectories = []
-                for traj in trajectories:
-                    if 'episodeNumber' in traj and 'dataPoints' in traj:
-                        data_points = traj.get('dataPoints', [])
-                        if data_points:  # Only include trajectories with data
-                            valid_trajectories.append(traj)
-                
-                if not valid_trajectories:
-                    return jsonify({
-                        "error": "No valid trajectory data",
-                        "message": "All trajectories have empty dataPoints arrays"
-                    }), 500
-                
-                return jsonify({
-                    "trajectories": valid_trajectories
-                })
+            index = stamina_indexes.get(RESULTS_DIR, run_id, stamina_file)
         except json.JSONDecodeError as e:
             return jsonify({"error": f"Invalid JSON in stamina file: {e}"}), 500
+        except ValueError as e:
+            return jsonify({"error": "Invalid data format", "message": str(e)}), 500
         except Exception as e:
             return jsonify({"error": f"Failed to read stamina file: {e}"}), 500
+        
+        if len(index) == 0:
+            return jsonify({
+                "error": "No valid trajectory data",
+                "message": "stamina_trajectories.json contains no trajectories with data points"
+            }), 500
+        
+        if options['index_only']:
+            return jsonify({**episode_list(index), 'run_id': run_id})
+        
+        meta, trajectories = query(index, options)
+        meta['run_id'] = run_id
+        binary = request.args.get('format') == 'binary' or \
+            request.accept_mimetypes.best_match(['application/json', BINARY_MIME]) == BINARY_MIME
+        if binary:
+            response = Response(to_binary(meta, trajectories), mimetype=BINARY_MIME)
+        else:
+            response = jsonify(to_json(meta, trajectories))
+        response.vary.add('Accept')
+        return response
     
     return jsonify({"error": "Stamina data not available", "message": "Run training with TrainingLogger.cs enabled to generate stamina trajectories."})
 
 
 @app.route('/api/analysis/reward-breakdown/<run_id>')
+@run_files('run_logs/reward_components.json')
 def api_reward_breakdown(run_id):
     """API endpoint for reward component breakdown (Graph 10)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
     reward_file = run_path / "run_logs" / "reward_components.json"
     if reward_file.exists():
         try:
-            with open(reward_file, 'r') as f:
+            with reward_file.open('r') as f:
                 data = json.load(f)
                 return jsonify(data)
         except Exception as e:
@@ -531,10 +958,11 @@ def api_reward_breakdown(run_id):
 
 
 @app.route('/api/analysis/roll-usage/<run_id>')
+@run_files('metadata.json', *RUN_DATA_FILES)
 def api_roll_usage(run_id):
     """API endpoint for roll usage vs style frequency (Graph 4)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
+    run_path = open_run(RESULTS_DIR, run_id)
+    if run_path is None:
         return jsonify({"error": "Run not found"}), 404
     
     # Try to get style frequency from metadata.json
@@ -542,7 +970,7 @@ def api_roll_usage(run_id):
     style_frequency = None
     if metadata_file.exists():
         try:
-            with open(metadata_file, 'r') as f:
+            with metadata_file.open('r') as f:
                 metadata = json.load(f)
                 # Try both camelCase and snake_case
                 style_frequency = metadata.get('styleEpisodeFrequency') or metadata.get('style_episode_frequency')
@@ -555,7 +983,7 @@ def api_roll_usage(run_id):
         if config_file.exists():
             try:
                 import yaml
-                with open(config_file, 'r') as f:
+                with config_file.open('r') as f:
                     config = yaml.safe_load(f)
                     # Try to find style frequency in config (might be in different places)
                     # For now, use a reasonable default if not found
@@ -564,7 +992,7 @@ def api_roll_usage(run_id):
                 pass
     
     # Get roll usage from timers.json
-    run_data = parse_run_data(run_path)
+    run_data = get_run_data(run_path, full=True, revalidate=True)
     roll_usage = None
     if run_data:
         metrics = run_data.get('metrics', {})
@@ -592,27 +1020,60 @@ def api_roll_usage(run_id):
 
 
 @app.route('/api/analysis/distance-dist/<run_id>')
+@run_files('run_logs/episode_data.json')
 def api_distance_dist(run_id):
     """API endpoint for distance traveled distribution (Graph 9)."""
-    run_path = RESULTS_DIR / run_id
-    if not run_path.exists():
-        return jsonify({"error": "Run not found"}), 404
-    
     # Same file as episode length distribution
-    episode_file = run_path / "run_logs" / "episode_data.json"
-    if episode_file.exists():
-        try:
-            with open(episode_file, 'r') as f:
-                data = json.load(f)
-                return jsonify(data)
-        except Exception as e:
-            return jsonify({"error": f"Failed to read episode data file: {e}"}), 500
-    
-    return jsonify({"error": "Distance data not available", "message": "Run training with TrainingLogger.cs enabled to generate episode data."})
+    return episode_distribution(run_id, 'maxDistance', "Distance data not available")
 
 
-if __name__ == '__main__':
+def serve_production(host: str, port: int, threads: int):
+    """Serve with waitress (a pool of `threads` worker threads), or Werkzeug's threaded server without it."""
+    try:
+        from waitress import serve
+    except ImportError:
+        print("[WARN] waitress is not installed (pip install waitress), using Werkzeug's threaded server")
+        app.run(host=host, port=port, threaded=True, debug=False, use_reloader=False)
+        return
+    print(f"[OK] Serving with waitress on http://{host}:{port} ({threads} threads)")
+    serve(app, host=host, port=port, threads=threads, ident='dashboard')
+
+
+def main():
+    global RESULTS_DIR, io_pool, MAX_EVENT_STREAMS
+    
+    parser = argparse.ArgumentParser(description="ML-Agents Training Dashboard")
+    parser.add_argument('--production', action='store_true',
+                        help="Serve with a pool of worker threads (waitress), without debugger and reloader")
+    parser.add_argument('--host', default='0.0.0.0', help="Interface to listen on (default: 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=5000, help="Port (default: 5000)")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('DASHBOARD_THREADS', 16)),
+                        help="Worker threads with --production (default: 16 or $DASHBOARD_THREADS)")
+    parser.add_argument('--io-threads', type=int, default=None,
+                        help="Threads loading runs concurrently (default: 8 with --production, else 0 = sequential)")
+    parser.add_argument('--results-dir', type=Path, default=RESULTS_DIR,
+                        help="Results directory (default: src/results)")
+    args = parser.parse_args()
+    
+    RESULTS_DIR = args.results_dir.resolve()
+    io_threads = args.io_threads if args.io_threads is not None else (8 if args.production else 0)
+    if io_threads > 0:
+        io_pool = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix='dashboard-io')
+    
     print("Starting ML-Agents Training Dashboard...")
     print(f"Results directory: {RESULTS_DIR}")
-    app.run(debug=True, port=5000, host='0.0.0.0')
+    if args.production:
+        # Leave half of the workers to requests other than event streams
+        MAX_EVENT_STREAMS = max(args.threads // 2, 1)
+        warm_start()
+        serve_production(args.host, args.port, args.threads)
+        return
+    
+    # The debug reloader serves from a child process (WERKZEUG_RUN_MAIN set); warm that one only
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warm_start()
+    app.run(debug=True, port=args.port, host=args.host)
 
+
+if __name__ == '__main__':
+    main()
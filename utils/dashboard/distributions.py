@@ -0,0 +1,199 @@
+"""
+Server-side summaries of episode_data.json for the distribution graphs.
+
+episode_data.json ({"episodes": [{episodeNumber, stepCount, length, maxDistance,
+success}, ...]}) holds every episode TrainingLogger logged and grows with run
+length. Instead of sending it to the browser, the episode-length and distance
+endpoints answer with a histogram (split by success/failure), percentiles and
+success rates, optionally for a step window, computed with NumPy.
+
+Files extracted from TensorBoard hold one mean per summary period instead of
+individual episodes (fewer than 200 rows, stepCount on summary boundaries);
+those are returned as a downsampled series, which is what the graphs show.
+
+Columns are parsed once per file version and results are kept per
+(file version, query), so repeated requests don't touch the file.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from series import file_version, lttb_indices
+
+DEFAULT_BINS = 20
+MAX_BINS = 200
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+# Same rule the analysis page used: TensorBoard summaries, not individual episodes
+CHECKPOINT_ROWS_MAX = 200
+SUMMARY_PERIOD = 20000
+FILES_CACHED = 16
+RESULTS_CACHED = 256
+
+
+def parse_distribution_args(args: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Query parameters: bins (count, default 20) or bin_width (ignored if it
+    would make more than MAX_BINS bins), percentiles
+    (comma-separated), min_step / max_step (window on stepCount), max_points
+    (series of TensorBoard-extracted files). Raises ValueError for invalid values.
+    """
+    bins = int(args.get('bins') or DEFAULT_BINS)
+    if not 1 <= bins <= MAX_BINS:
+        raise ValueError(f"bins must be between 1 and {MAX_BINS}")
+    bin_width = float(args['bin_width']) if args.get('bin_width') else None
+    if bin_width is not None and bin_width <= 0:
+        raise ValueError("bin_width must be positive")
+    percentiles = tuple(float(p) for p in args['percentiles'].split(',')) if args.get('percentiles') \
+        else DEFAULT_PERCENTILES
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise ValueError("percentiles must be between 0 and 100")
+    return {
+        'bins': bins,
+        'bin_width': bin_width,
+        'percentiles': percentiles,
+        'min_step': float(args['min_step']) if args.get('min_step') else None,
+        'max_step': float(args['max_step']) if args.get('max_step') else None,
+        'max_points': int(args['max_points']) if args.get('max_points') else 1000,
+    }
+
+
+def _stats(values: np.ndarray, percentiles: Tuple[float, ...]) -> Dict[str, Any]:
+    if len(values) == 0:
+        return {'count': 0}
+    quantiles = np.percentile(values, percentiles)
+    return {
+        'count': int(len(values)),
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'percentiles': {f"p{p:g}": float(q) for p, q in zip(percentiles, quantiles)},
+    }
+
+
+def summarize(columns: Dict[str, np.ndarray], metric: str, bins: int = DEFAULT_BINS,
+              bin_width: Optional[float] = None, percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES,
+              min_step: Optional[float] = None, max_step: Optional[float] = None,
+              max_points: int = 1000) -> Dict[str, Any]:
+    """Histogram/percentiles/success rates of one metric (or the series, for TensorBoard-extracted files)."""
+    steps = columns['stepCount']
+    values = columns[metric]
+    success = columns['success']
+    total = len(values)
+    
+    window = np.isfinite(values)
+    if min_step is not None:
+        window &= steps >= min_step
+    if max_step is not None:
+        window &= steps <= max_step
+    values, steps, success = values[window], steps[window], success[window]
+    
+    result: Dict[str, Any] = {
+        'metric': metric,
+        'total_episodes': total,
+        'episodes_in_window': int(len(values)),
+        'step_range': [float(steps.min()), float(steps.max())] if len(steps) else None,
+    }
+    
+    if total < CHECKPOINT_ROWS_MAX and np.any(columns['stepCount'] % SUMMARY_PERIOD == 0):
+        ordered = np.isfinite(steps)
+        steps, values = steps[ordered], values[ordered]
+        order = np.argsort(steps, kind='stable')
+        steps, values = steps[order], values[order]
+        keep = lttb_indices(steps, values, max_points) if max_points else np.arange(len(steps))
+        result['kind'] = 'series'
+        result['series'] = {'steps': steps[keep].tolist(), 'values': values[keep].tolist()}
+        result['summary'] = _stats(values, percentiles)
+        return result
+    
+    result['kind'] = 'histogram'
+    result['summary'] = _stats(values, percentiles)
+    result['success_rate'] = float(success.mean()) if len(success) else None
+    result['by_outcome'] = {
+        'success': _stats(values[success], percentiles),
+        'failure': _stats(values[~success], percentiles),
+    }
+    if len(values) == 0:
+        result['histogram'] = None
+        return result
+    
+    low = min(float(values.min()), 0.0)
+    high = float(values.max())
+    if bin_width is not None and (high - low) / bin_width < MAX_BINS:
+        edges = low + bin_width * np.arange(int(np.floor((high - low) / bin_width)) + 2)
+    else:
+        edges = np.linspace(low, high if high > low else low + 1.0, bins + 1)
+    success_counts, _ = np.histogram(values[success], bins=edges)
+    failure_counts, _ = np.histogram(values[~success], bins=edges)
+    counts = success_counts + failure_counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bin_success = np.where(counts > 0, success_counts / np.maximum(counts, 1), np.nan)
+    result['histogram'] = {
+        'edges': edges.tolist(),
+        'success': success_counts.tolist(),
+        'failure': failure_counts.tolist(),
+        'success_rate': [None if np.isnan(r) else float(r) for r in bin_success],
+    }
+    return result
+
+
+class EpisodeDataCache:
+    """episode_data.json columns per file version, and summaries per (file version, query)."""
+    
+    def __init__(self, max_files: int = FILES_CACHED, max_results: int = RESULTS_CACHED):
+        self.max_files = max_files
+        self.max_results = max_results
+        self._files: 'OrderedDict[str, Tuple[Tuple, Dict[str, np.ndarray]]]' = OrderedDict()
+        self._results: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def columns(self, path) -> Tuple[Optional[Tuple], Dict[str, np.ndarray]]:
+        """(file version, columns) of an episode_data.json. Raises OSError/ValueError."""
+        key = str(path)
+        version = file_version(path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry[0] == version:
+                self._files.move_to_end(key)
+                return entry
+        with path.open('r') as f:
+            data = json.load(f)
+        episodes: List[Dict] = data.get('episodes', []) if isinstance(data, dict) else []
+        
+        def numbers(name: str) -> np.ndarray:
+            return np.array([e.get(name) if isinstance(e.get(name), (int, float)) else np.nan
+                             for e in episodes], dtype=np.float64)
+        
+        columns = {
+            'episodeNumber': numbers('episodeNumber'),
+            'stepCount': numbers('stepCount'),
+            'length': numbers('length'),
+            'maxDistance': numbers('maxDistance'),
+            'success': np.array([bool(e.get('success')) for e in episodes], dtype=bool),
+        }
+        with self._lock:
+            self._files[key] = (version, columns)
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return version, columns
+    
+    def summary(self, path, metric: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """summarize() of episode_data.json at path (options: parse_distribution_args)."""
+        version, columns = self.columns(path)
+        key = (str(path), version, metric, tuple(sorted(options.items())))
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+        result = summarize(columns, metric, **options)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return result
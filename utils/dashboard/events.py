@@ -0,0 +1,192 @@
+"""
+Server-sent events for the dashboard: push run list changes instead of polling.
+
+One watcher thread per process (not per client) rebuilds the run list every
+`poll_seconds` from the run cache, which only stats the watched files of each
+run, and diffs it against the previous one:
+
+    run_added    {"run": {...}}                          new run (list fields)
+    run_removed  {"run_id": "..."}                       run deleted or archived away
+    run_updated  {"run_id": "...", "changes": {...}}     only the fields that changed
+                                                         (new checkpoint, gauges, live progress)
+    reset        {}                                      client missed events: refetch /api/runs
+
+Event ids are "<epoch>-<n>" (epoch: when this process started) and the last
+`history` events are kept, so a reconnecting client (EventSource sends
+Last-Event-ID) gets what it missed, and one that was connected to an earlier
+dashboard process gets a reset.
+
+Changes are found by polling, not inotify: the standard library has no file
+watcher (inotify would be a Linux-only extra dependency, and the utils also
+run on Windows, see the PowerShell commands of check_failed_runs.py), and
+polling the run cache also covers archived bundles and results directories on
+network mounts, where inotify doesn't report remote writes.
+
+Clients wait on a shared condition and wake up only for new events or a
+keepalive comment every `keepalive_seconds`. The watcher sleeps while nobody
+is subscribed, so idle tabs cost one blocked thread each and no disk access.
+
+Events are idempotent (added = upsert, updated = set fields), so a client can
+load /api/runs, then subscribe from the event id it was served with (current_id()
+taken before the run list was built).
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_KEEPALIVE_SECONDS = 15.0
+DEFAULT_HISTORY = 256
+# Derived from the clock, not the run's files: changes alone don't make an event
+IGNORED_KEYS = ('age_seconds',)
+
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in IGNORED_KEYS}
+    return value
+
+
+def format_event(event_id: str, event: str, data: Dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class RunEventHub:
+    """Watches the run list and broadcasts diffs to every subscriber."""
+    
+    def __init__(self, snapshot: Callable[[], Dict[str, Dict]], project: Callable[[Dict], Dict],
+                 poll_seconds: float = DEFAULT_POLL_SECONDS,
+                 keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS,
+                 history: int = DEFAULT_HISTORY):
+        """
+        snapshot() -> {run_id: run_data} (cached values: unchanged runs keep their identity)
+        project(run_data) -> the fields clients display
+        """
+        self.snapshot = snapshot
+        self.project = project
+        self.poll_seconds = poll_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.epoch = format(int(time.time() * 1000), 'x')
+        self._events: Deque[Tuple[int, str, Dict]] = deque(maxlen=history)
+        self._last_id = 0
+        self._cond = threading.Condition()
+        self._start_lock = threading.Lock()
+        self._subscribers = 0
+        self._thread: Optional[threading.Thread] = None
+        # run_id -> (run_data as returned by snapshot, projected + stable fields)
+        self._state: Optional[Dict[str, Tuple[Dict, Dict]]] = None
+    
+    def current_id(self) -> str:
+        """Id of the latest event; starts watching (baseline run list) on first use."""
+        self.start()
+        return f"{self.epoch}-{self._last_id}"
+    
+    def _parse_id(self, event_id: Optional[str]) -> Optional[int]:
+        """Event number of an id from this process, -1 for any other id, None if absent."""
+        if not event_id:
+            return None
+        epoch, _, number = event_id.partition('-')
+        if epoch != self.epoch or not number.isdigit():
+            return -1
+        return int(number)
+    
+    def poll(self) -> int:
+        """Diff the run list against the previous poll and publish the changes. Returns the number of events."""
+        runs = self.snapshot()
+        previous = self._state
+        state: Dict[str, Tuple[Dict, Dict]] = {}
+        events = []
+        for run_id, run in runs.items():
+            old = previous.get(run_id) if previous is not None else None
+            if old is not None and old[0] is run:
+                state[run_id] = old
+                continue
+            fields = self.project(run)
+            stable = _stable(fields)
+            state[run_id] = (run, stable)
+            if previous is None:
+                continue
+            if old is None:
+                events.append(('run_added', {'run': fields}))
+            else:
+                changes = {k: fields.get(k) for k in set(stable) | set(old[1])
+                           if stable.get(k) != old[1].get(k)}
+                if changes:
+                    events.append(('run_updated', {'run_id': run_id, 'changes': changes}))
+        if previous is not None:
+            events.extend(('run_removed', {'run_id': run_id}) for run_id in previous if run_id not in runs)
+        self._state = state
+        if events:
+            self._publish(events)
+        return len(events)
+    
+    def _publish(self, events):
+        with self._cond:
+            for event, data in events:
+                self._last_id += 1
+                self._events.append((self._last_id, event, data))
+            self._cond.notify_all()
+    
+    def _watch(self):
+        while True:
+            with self._cond:
+                while self._subscribers == 0:
+                    self._cond.wait()
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[WARN] Run event watcher: {e}")
+            time.sleep(self.poll_seconds)
+    
+    def start(self):
+        """Take the baseline run list (no events for what already exists) and start the watcher thread."""
+        with self._start_lock:
+            if self._thread is None:
+                self.poll()
+                self._thread = threading.Thread(target=self._watch, name='run-events', daemon=True)
+                self._thread.start()
+    
+    def subscribe(self, last_event_id: Optional[str] = None) -> Iterator[str]:
+        """
+        SSE stream of events after last_event_id (None = from now on).
+        Emits 'reset' when events after last_event_id are no longer kept
+        or the id comes from another dashboard process.
+        """
+        self.start()
+        cursor = self._parse_id(last_event_id)
+        with self._cond:
+            self._subscribers += 1
+            self._cond.notify_all()
+            if cursor is None:
+                cursor = self._last_id
+        try:
+            yield f"retry: {int(self.poll_seconds * 1000) * 2}\n\n"
+            while True:
+                with self._cond:
+                    if cursor == self._last_id:
+                        self._cond.wait(self.keepalive_seconds)
+                    oldest = self._events[0][0] if self._events else self._last_id + 1
+                    if cursor < 0 or cursor > self._last_id or (cursor < self._last_id and cursor + 1 < oldest):
+                        pending = [(self._last_id, 'reset', {})]
+                    else:
+                        pending = [e for e in self._events if e[0] > cursor]
+                    cursor = self._last_id
+                if pending:
+                    yield ''.join(format_event(f"{self.epoch}-{n}", event, data) for n, event, data in pending)
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'subscribers': self._subscribers,
+                'last_event_id': f"{self.epoch}-{self._last_id}",
+                'buffered_events': len(self._events),
+                'poll_seconds': self.poll_seconds,
+            }
@@ -0,0 +1,215 @@
+"""
+Conditional GET and compression for the dashboard's /api/* responses.
+
+Every successful JSON or binary response gets a strong ETag and
+"Cache-Control: no-cache", so browsers keep the body and revalidate on each
+poll. An unchanged resource costs a "304 Not Modified" with no body.
+
+- Endpoints backed by run files are wrapped in conditional(): their ETag is a
+  hash of the versions (mtime, size) of those files, the request (path, query,
+  Accept) and the dashboard code, so a matching If-None-Match is answered
+  before the view reads anything.
+- Other endpoints (run list, comparison) depend on many runs and on the clock
+  (liveness); their ETag is a hash of the body, which still saves the transfer.
+
+Bodies of at least MIN_COMPRESS_BYTES are compressed with the best encoding the
+client accepts: brotli when the optional `brotli` package is installed, else
+gzip. Each encoding is a different representation, so its ETag gets a suffix
+("<tag>-gzip"). If-None-Match matches the plain tag or the tag of the encoding
+negotiated for this request, and the 304 carries the tag that matched, the
+same one the 200 had. Compressed bodies are kept per (ETag, encoding, digest
+of the uncompressed body), so a popular response is compressed once and a
+wrong validator can never serve another response's bytes.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Response, request
+from werkzeug.http import parse_etags
+
+try:
+    import brotli  # pip install brotli (optional)
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSED_CACHE_BYTES = 32 * 1024 * 1024
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _code_tag() -> List:
+    """(name, mtime, size) of the dashboard modules: responses change shape when they do."""
+    tag = []
+    for path in sorted(Path(__file__).parent.glob('*.py')):
+        st = os.stat(path)
+        tag.append([path.name, st.st_mtime_ns, st.st_size])
+    return tag
+
+
+CODE_TAG = _code_tag()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0: same bytes for the same body, as a strong ETag requires
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class _CompressedBodies:
+    """Compressed bodies per (ETag, encoding, body digest), least recently used evicted past a byte budget."""
+    
+    def __init__(self, budget_bytes: int = COMPRESSED_CACHE_BYTES):
+        self.budget_bytes = budget_bytes
+        self._bodies: 'OrderedDict[Tuple[str, str, str], bytes]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+    
+    def get(self, etag: str, encoding: str, data: bytes) -> bytes:
+        key = (etag, encoding, _digest(data))
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+                self.hits += 1
+        if body is None:
+            body = _compress(data, encoding)
+            with self._lock:
+                self.misses += 1
+                if key not in self._bodies and len(body) <= self.budget_bytes:
+                    self._bodies[key] = body
+                    self._bytes += len(body)
+                    while self._bytes > self.budget_bytes:
+                        _, evicted = self._bodies.popitem(last=False)
+                        self._bytes -= len(evicted)
+        with self._lock:
+            self.bytes_in += len(data)
+            self.bytes_out += len(body)
+        return body
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'encodings': list(ENCODINGS),
+                'compressed_entries': len(self._bodies),
+                'compressed_bytes': self._bytes,
+                'compress_hits': self.hits,
+                'compress_misses': self.misses,
+                'not_modified': self.not_modified,
+                'bytes_before_compression': self.bytes_in,
+                'bytes_after_compression': self.bytes_out,
+            }
+
+
+compressed_bodies = _CompressedBodies()
+
+
+def _matches(etag: str) -> Optional[str]:
+    """
+    The representation tag If-None-Match names (weak comparison, as for GET):
+    etag itself (uncompressed, or a body too small to compress) or etag with the
+    suffix of the encoding negotiated for this request. None if it names neither.
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return None
+    etags = parse_etags(header)
+    if etags.star_tag:
+        return etag
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    tags = etags.as_set(include_weak=True)
+    for candidate in ([f"{etag}-{encoding}"] if encoding else []) + [etag]:
+        if candidate in tags:
+            return candidate
+    return None
+
+
+def _not_modified(response: Response) -> Response:
+    """Turn response into a 304, keeping its validators and the other headers (e.g. X-Event-Id)."""
+    response.status_code = 304
+    response.set_data(b'')
+    for header in ('Content-Length', 'Content-Type', 'Content-Encoding'):
+        response.headers.pop(header, None)
+    compressed_bodies.not_modified += 1
+    return response
+
+
+def request_etag(versions: Any) -> str:
+    """ETag of the current request's response given the versions of what it's built from."""
+    key = json.dumps([CODE_TAG, request.path, sorted(request.args.items(multi=True)),
+                      request.headers.get('Accept', ''), versions], default=str)
+    return _digest(key.encode('utf-8'))
+
+
+def conditional(versions: Callable[..., Optional[Any]]):
+    """
+    Decorator for views whose response only depends on files: versions(**view_args)
+    returns their versions (None: unknown, run the view). A matching If-None-Match
+    is answered with 304 without running the view.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            current = versions(**kwargs)
+            if current is None:
+                return view(**kwargs)
+            etag = request_etag(current)
+            matched = _matches(etag)
+            if matched:
+                response = _not_modified(Response())
+                response.set_etag(matched)
+                response.headers['Cache-Control'] = 'no-cache'
+                response.vary.add('Accept-Encoding')
+                return response
+            response = view(**kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
+
+
+def finalize(response: Response) -> Response:
+    """after_request for /api/*: ETag (hash of the body if the view set none), 304, compression."""
+    if response.status_code != 200 or response.is_streamed or response.direct_passthrough \
+            or 'Content-Encoding' in response.headers:
+        return response
+    
+    data = response.get_data()
+    etag, _ = response.get_etag()
+    if etag is None:
+        etag = _digest(data)
+    response.headers.setdefault('Cache-Control', 'no-cache')
+    response.vary.add('Accept-Encoding')
+    matched = _matches(etag)
+    if matched:
+        response.set_etag(matched)
+        return _not_modified(response)
+    
+    encoding = request.accept_encodings.best_match(ENCODINGS) if len(data) >= MIN_COMPRESS_BYTES else None
+    if encoding is None:
+        response.set_etag(etag)
+        return response
+    response.set_data(compressed_bodies.get(etag, encoding, data))
+    response.headers['Content-Encoding'] = encoding
+    response.set_etag(f"{etag}-{encoding}")
+    return response
@@ -0,0 +1,336 @@
+"""
+Load test for the dashboard API: requests/sec and latency percentiles per endpoint.
+
+Build a synthetic results directory (runs cloned from a real training run,
+small files copied with shifted timestamps, large analysis files hard-linked):
+
+    python load_test.py --make-results /tmp/dashboard_load --runs 1000
+
+Then load a running dashboard, or let the script start one:
+
+    python app.py --production --results-dir /tmp/dashboard_load &
+    python load_test.py --url http://localhost:5000 --concurrency 16 --duration 20
+
+    python load_test.py --serve production --results /tmp/dashboard_load
+    python load_test.py --serve dev --results /tmp/dashboard_load
+
+Each worker thread keeps one HTTP connection and cycles through the endpoints
+(run list, comparison, analysis graphs of random training runs). --revalidate
+sends If-None-Match with the last ETag and Accept-Encoding: gzip, like a
+browser polling an open page.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).parent.parent.parent / "src" / "results"
+# Rewritten per run (timestamps shifted); everything else in the template run is hard-linked
+SMALL_FILES = ('configuration.yaml', 'run_logs/training_status.json', 'run_logs/timers.json')
+
+ENDPOINTS = (
+    ('runs', '/api/runs'),
+    ('runs (page fields)', '/api/runs?fields=run_id,mode,live,config,timestamps,key_metrics'),
+    ('compare', '/api/compare'),
+    ('training-curve', '/api/analysis/training-curve/{run}'),
+    ('comparative', '/api/analysis/comparative/{run}'),
+    ('entropy', '/api/analysis/entropy/{run}'),
+    ('policy-value-loss', '/api/analysis/policy-value-loss/{run}'),
+    ('episode-length-dist', '/api/analysis/episode-length-dist/{run}'),
+    ('reward-breakdown', '/api/analysis/reward-breakdown/{run}'),
+)
+
+
+def find_template(results_dir: Path) -> Optional[Path]:
+    """Training run with the most analysis files (episode_data.json etc.) in results_dir."""
+    candidates = [p for p in results_dir.iterdir()
+                  if p.is_dir() and p.name.startswith('training') and (p / 'run_logs' / 'timers.json').exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: (len(list((p / 'run_logs').iterdir())), p.name))
+
+
+def make_results(target: Path, runs: int, template: Path):
+    """Write `runs` copies of the template run into target (training_synthetic_00000, ...)."""
+    target.mkdir(parents=True, exist_ok=True)
+    with open(template / 'run_logs' / 'timers.json', 'r') as f:
+        timers = json.load(f)
+    with open(template / 'run_logs' / 'training_status.json', 'r') as f:
+        status = json.load(f)
+    start = int(timers.get('metadata', {}).get('start_time_seconds', time.time()))
+    
+    for i in range(runs):
+        run_dir = target / f"training_synthetic_{i:05d}"
+        (run_dir / 'run_logs').mkdir(parents=True, exist_ok=True)
+        # One run per hour, rewards scaled a little so runs differ
+        shift = i * 3600
+        scale = 1.0 + 0.1 * random.random()
+        metadata = dict(timers.get('metadata', {}))
+        for key in ('start_time_seconds', 'end_time_seconds'):
+            if key in metadata:
+                metadata[key] = str(int(metadata[key]) - shift)
+        with open(run_dir / 'run_logs' / 'timers.json', 'w') as f:
+            json.dump({**timers, 'metadata': metadata}, f)
+        run_status = json.loads(json.dumps(status))
+        for behavior in run_status.values():
+            for checkpoint in behavior.get('checkpoints', []) if isinstance(behavior, dict) else []:
+                checkpoint['reward'] = (checkpoint.get('reward') or 0) * scale
+                checkpoint['creation_time'] = checkpoint.get('creation_time', start) - shift
+        with open(run_dir / 'run_logs' / 'training_status.json', 'w') as f:
+            json.dump(run_status, f)
+        shutil.copy2(template / 'configuration.yaml', run_dir / 'configuration.yaml')
+        
+        for source in template.rglob('*'):
+            rel = source.relative_to(template).as_posix()
+            if not source.is_file() or rel in SMALL_FILES:
+                continue
+            link = run_dir / rel
+            link.parent.mkdir(parents=True, exist_ok=True)
+            if not link.exists():
+                try:
+                    os.link(source, link)
+                except OSError:
+                    shutil.copy2(source, link)
+        # Finished runs: files as old as the run's end (recent writes would make it look live)
+        finished = int(metadata.get('end_time_seconds', start - shift))
+        for path in [run_dir / name for name in SMALL_FILES] + [run_dir / 'run_logs', run_dir]:
+            os.utime(path, (finished, finished))
+        if (i + 1) % 100 == 0:
+            print(f"  {i + 1}/{runs} runs")
+    print(f"[OK] {runs} runs from {template.name} in {target}")
+
+
+def percentile_ms(latencies: List[float], q: float) -> float:
+    return float(np.percentile(latencies, q)) * 1000 if latencies else float('nan')
+
+
+class Worker(threading.Thread):
+    """Sends requests over one keep-alive connection until the deadline."""
+    
+    def __init__(self, base_url: str, urls: List[Tuple[str, str]], deadline: float, revalidate: bool):
+        super().__init__(daemon=True)
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.urls = urls
+        self.deadline = deadline
+        self.revalidate = revalidate
+        self.etags: Dict[str, str] = {}
+        # name -> (latencies in seconds, errors, bytes received, 304 responses)
+        self.results: Dict[str, List] = {}
+    
+    def run(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        position = random.randrange(len(self.urls))
+        while time.perf_counter() < self.deadline:
+            name, url = self.urls[position % len(self.urls)]
+            position += 1
+            headers = {}
+            if self.revalidate:
+                headers['Accept-Encoding'] = 'gzip'
+                if url in self.etags:
+                    headers['If-None-Match'] = self.etags[url]
+            result = self.results.setdefault(name, [[], 0, 0, 0])
+            started = time.perf_counter()
+            try:
+                conn.request('GET', url, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                result[1] += 1
+                continue
+            result[0].append(time.perf_counter() - started)
+            result[2] += len(body)
+            if response.status == 304:
+                result[3] += 1
+            elif response.status != 200:
+                result[1] += 1
+            if response.getheader('ETag'):
+                self.etags[url] = response.getheader('ETag')
+        conn.close()
+
+
+def run_load(base_url: str, concurrency: int, duration: float, revalidate: bool, seed: int,
+             sample_runs: int = 8) -> Dict:
+    """Run the workers and return per-endpoint and total statistics."""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=300)
+    started = time.perf_counter()
+    conn.request('GET', '/api/runs?mode=training&fields=run_id')
+    runs = [r['run_id'] for r in json.loads(conn.getresponse().read())]
+    conn.close()
+    print(f"[OK] {len(runs)} training runs, first /api/runs in {time.perf_counter() - started:.2f}s")
+    if not runs:
+        raise SystemExit("[ERROR] No training runs to query")
+    
+    rng = random.Random(seed)
+    urls = []
+    for name, url in ENDPOINTS:
+        if '{run}' in url:
+            urls.extend((name, url.format(run=rng.choice(runs))) for _ in range(sample_runs))
+        else:
+            urls.append((name, url))
+    
+    deadline = time.perf_counter() + duration
+    workers = [Worker(base_url, urls, deadline, revalidate) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    
+    report = {'concurrency': concurrency, 'duration_seconds': elapsed, 'revalidate': revalidate, 'endpoints': {}}
+    everything: List[float] = []
+    total_errors = 0
+    for name, _ in ENDPOINTS:
+        latencies = [lat for w in workers for lat in w.results.get(name, [[]])[0]]
+        errors = sum(w.results.get(name, [[], 0])[1] for w in workers)
+        received = sum(w.results.get(name, [[], 0, 0])[2] for w in workers)
+        not_modified = sum(w.results.get(name, [[], 0, 0, 0])[3] for w in workers)
+        everything.extend(latencies)
+        total_errors += errors
+        report['endpoints'][name] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'not_modified': not_modified,
+            'requests_per_second': len(latencies) / elapsed,
+            'mean_bytes': received / len(latencies) if latencies else 0,
+            'p50_ms': percentile_ms(latencies, 50),
+            'p95_ms': percentile_ms(latencies, 95),
+            'p99_ms': percentile_ms(latencies, 99),
+            'max_ms': max(latencies) * 1000 if latencies else float('nan'),
+        }
+    report['total'] = {
+        'requests': len(everything),
+        'errors': total_errors,
+        'requests_per_second': len(everything) / elapsed,
+        'p50_ms': percentile_ms(everything, 50),
+        'p95_ms': percentile_ms(everything, 95),
+        'p99_ms': percentile_ms(everything, 99),
+        'max_ms': max(everything) * 1000 if everything else float('nan'),
+    }
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\nConcurrency {report['concurrency']}, {report['duration_seconds']:.1f}s"
+          f"{', revalidating' if report['revalidate'] else ''}")
+    print(f"{'endpoint':<22} {'req':>7} {'err':>5} {'304':>6} {'req/s':>8} {'KB':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    rows = list(report['endpoints'].items()) + [('TOTAL', report['total'])]
+    for name, s in rows:
+        print(f"{name:<22} {s['requests']:>7} {s['errors']:>5} {s.get('not_modified', ''):>6} "
+              f"{s['requests_per_second']:>8.1f} {s.get('mean_bytes', 0) / 1024:>8.1f} "
+              f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}")
+
+
+def start_server(mode: str, results: Path, port: int) -> subprocess.Popen:
+    """Start app.py on port (its own process group, so the dev reloader child is stopped too)."""
+    command = [sys.executable, str(Path(__file__).parent / 'app.py'), '--port', str(port),
+               '--host', '127.0.0.1', '--results-dir', str(results)]
+    if mode == 'production':
+        command.append('--production')
+    if os.name == 'nt':
+        group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group = {'start_new_session': True}
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **group)
+    for _ in range(300):
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/cache')
+            conn.getresponse().read()
+            conn.close()
+            print(f"[OK] Started dashboard ({mode}) on port {port}")
+            return process
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise SystemExit(f"[ERROR] Dashboard ({mode}) did not start on port {port}")
+
+
+def stop_server(process: subprocess.Popen):
+    """Stop the server and its children (POSIX: its process group; Windows: its process tree)."""
+    try:
+        if os.name == 'nt':
+            # terminate() only ends the parent; taskkill /T also ends the dev reloader child
+            subprocess.run(['taskkill', '/T', '/F', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            process.terminate()
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        process.kill()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test for the dashboard API (requests/sec and latency percentiles)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument('--make-results', type=Path, metavar='DIR',
+                        help="Write a synthetic results directory to DIR and exit")
+    parser.add_argument('--runs', type=int, default=1000, help="Runs in the synthetic directory (default: 1000)")
+    parser.add_argument('--template', type=Path, default=None,
+                        help="Run to clone (default: the training run with the most logs in src/results)")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="Dashboard to load (default: %(default)s)")
+    parser.add_argument('--serve', choices=('dev', 'production'),
+                        help="Start app.py in this mode on --port with --results, load it, then stop it")
+    parser.add_argument('--results', type=Path, help="Results directory for --serve")
+    parser.add_argument('--port', type=int, default=5077, help="Port for --serve (default: %(default)s)")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent clients (default: 16)")
+    parser.add_argument('--duration', type=float, default=20, help="Seconds of load (default: 20)")
+    parser.add_argument('--revalidate', action='store_true',
+                        help="Send If-None-Match and Accept-Encoding: gzip like a browser")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the runs queried")
+    parser.add_argument('--sample-runs', type=int, default=8,
+                        help="Runs queried per analysis endpoint (default: 8; fewer repeat URLs sooner with --revalidate)")
+    parser.add_argument('--json', type=Path, help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+    
+    if args.make_results:
+        template = args.template or find_template(DEFAULT_TEMPLATE_DIR)
+        if template is None:
+            raise SystemExit(f"[ERROR] No training run to clone in {DEFAULT_TEMPLATE_DIR}; pass --template")
+        make_results(args.make_results, args.runs, template)
+        return
+    
+    process = None
+    url = args.url
+    if args.serve:
+        if args.results is None:
+            raise SystemExit("[ERROR] --serve needs --results")
+        process = start_server(args.serve, args.results, args.port)
+        url = f"http://127.0.0.1:{args.port}"
+    try:
+        report = run_load(url, args.concurrency, args.duration, args.revalidate, args.seed, args.sample_runs)
+    finally:
+        if process is not None:
+            stop_server(process)
+    report['server'] = args.serve or url
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
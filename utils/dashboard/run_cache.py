@@ -0,0 +1,283 @@
+"""
+Process-wide cache of parsed run data for the dashboard.
+
+parse_run_data reads configuration.yaml, training_status.json and timers.json
+for a run; the dashboard asks for the same runs on every poll. RunCache keeps
+the parsed result per run, keyed by the (mtime, size) of those files (or of the
+run's bundle when archived), and re-parses only when one of them changes.
+
+- Validation stats the files at most once per `revalidate_seconds` per run, so
+  back-to-back requests are served from memory without touching disk.
+- Runs that were live (still training) when parsed are always re-parsed after
+  that window: their status depends on the clock, not only on file changes.
+- Concurrent misses for the same run (first requests racing the background
+  revalidation on a cold start) share one load instead of each parsing it.
+- Entries are evicted least-recently-used first once their estimated size
+  (length of their JSON encoding) exceeds `budget_bytes`.
+
+Cached values are shared between requests: callers must not mutate them.
+
+save_snapshot/load_snapshot persist the non-live entries (gzipped JSON) so a
+restarted dashboard can answer from the previous index at once and revalidate
+it in the background. The snapshot is dropped when the loader's module changed
+since it was written, since cached values would have the old shape.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from run_archive import is_archived, list_runs
+
+# Files parse_run_data reads (heartbeat.json: liveness)
+WATCHED_FILES = ('configuration.yaml', 'run_logs/training_status.json', 'run_logs/timers.json',
+                 'run_logs/heartbeat.json')
+
+DEFAULT_BUDGET_MB = float(os.environ.get('DASHBOARD_CACHE_MB', 256))
+DEFAULT_REVALIDATE_SECONDS = 2.0
+SNAPSHOT_VERSION = 1
+
+
+def run_fingerprint(run_root) -> Tuple:
+    """(mtime_ns, size) of each watched file (None if missing), or of the bundle for archived runs."""
+    if is_archived(run_root):
+        st = os.stat(run_root.root.filename)
+        return ('bundle', st.st_mtime_ns, st.st_size)
+    fingerprint = []
+    for name in WATCHED_FILES:
+        try:
+            st = os.stat(run_root / name)
+            fingerprint.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            fingerprint.append(None)
+    return tuple(fingerprint)
+
+
+def _as_tuple(value):
+    """Fingerprint read back from JSON (nested lists) as the nested tuples run_fingerprint returns."""
+    return tuple(_as_tuple(v) for v in value) if isinstance(value, list) else value
+
+
+class _Entry:
+    __slots__ = ('fingerprint', 'value', 'size', 'checked', 'volatile')
+    
+    def __init__(self, fingerprint: Tuple, value: Any, size: int, checked: float, volatile: bool):
+        self.fingerprint = fingerprint
+        self.value = value
+        self.size = size
+        self.checked = checked
+        self.volatile = volatile
+
+
+class RunCache:
+    """LRU cache of loader(run_root) results, invalidated by file mtimes."""
+    
+    def __init__(self, loader: Callable[[Any], Optional[Dict]], budget_bytes: Optional[int] = None,
+                 revalidate_seconds: float = DEFAULT_REVALIDATE_SECONDS,
+                 is_volatile: Callable[[Dict], bool] = lambda value: bool(value.get('live'))):
+        self.loader = loader
+        self.budget_bytes = int(DEFAULT_BUDGET_MB * 1024 * 1024) if budget_bytes is None else budget_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.is_volatile = is_volatile
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._listing: Optional[Tuple[str, Tuple, float, List]] = None
+        # key -> (fingerprint being loaded, future of the loader's result)
+        self._loading: Dict[str, Tuple[Optional[Tuple], Future]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.generation = 0  # Bumped whenever an entry is added or replaced
+        self._saved_generation: Optional[int] = None
+    
+    @staticmethod
+    def _key(run_root) -> str:
+        return f"{run_root.root.filename}::{run_root.name}" if is_archived(run_root) else str(run_root)
+    
+    def get(self, run_root, revalidate: bool = False) -> Optional[Dict]:
+        """
+        Cached loader(run_root), re-loaded when the run's files changed.
+        revalidate=True checks the fingerprint even if it was checked recently.
+        """
+        key = self._key(run_root)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not revalidate and now - entry.checked < self.revalidate_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+        
+        try:
+            fingerprint = run_fingerprint(run_root)
+        except OSError:
+            fingerprint = None
+        if entry is not None and not entry.volatile and fingerprint == entry.fingerprint:
+            with self._lock:
+                entry.checked = now
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+            return entry.value
+        
+        return self._load(key, run_root, fingerprint, now)
+    
+    def _load(self, key: str, run_root, fingerprint: Optional[Tuple], now: float) -> Optional[Dict]:
+        """loader(run_root), or the result of the load of the same files already in progress."""
+        with self._lock:
+            loading = self._loading.get(key)
+            if loading is not None and loading[0] == fingerprint:
+                self.coalesced += 1
+                future = loading[1]
+            else:
+                future = Future()
+                self._loading[key] = (fingerprint, future)
+                loading = None
+        if loading is not None:
+            return future.result()
+        
+        try:
+            value = self.loader(run_root)
+        except BaseException as e:
+            with self._lock:
+                self._done_loading(key, future)
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            # Entry stored and load unregistered at once: no window for another load
+            self._done_loading(key, future)
+            self.misses += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            if value is not None and fingerprint is not None:
+                size = len(json.dumps(value, default=str))
+                self._entries[key] = _Entry(fingerprint, value, size, now, self.is_volatile(value))
+                self._bytes += size
+                self._evict()
+            self.generation += 1
+        future.set_result(value)
+        return value
+    
+    def _done_loading(self, key: str, future: Future):
+        if self._loading.get(key, (None, None))[1] is future:
+            del self._loading[key]
+    
+    def _evict(self):
+        while self._bytes > self.budget_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+    
+    def list_runs(self, results_dir: Path) -> List:
+        """run_archive.list_runs, re-listed only when the results directory changes."""
+        now = time.monotonic()
+        listing = self._listing
+        if listing is not None and listing[0] == str(results_dir) and now - listing[2] < self.revalidate_seconds:
+            return listing[3]
+        st = os.stat(results_dir)
+        stamp = (st.st_mtime_ns, st.st_ino)
+        if listing is not None and listing[0] == str(results_dir) and listing[1] == stamp:
+            runs = listing[3]
+        else:
+            runs = list_runs(results_dir)
+        self._listing = (str(results_dir), stamp, now, runs)
+        return runs
+    
+    def _loader_tag(self) -> Optional[List]:
+        """Identity of the loader's source file; a snapshot from other code is not reused."""
+        code = getattr(self.loader, '__code__', None)
+        try:
+            st = os.stat(code.co_filename)
+            return [os.path.basename(code.co_filename), st.st_mtime_ns, st.st_size]
+        except (AttributeError, OSError):
+            return None
+    
+    def save_snapshot(self, path: Path) -> int:
+        """
+        Write the non-live entries to path (atomically, gzipped JSON).
+        Returns the number of entries written.
+        """
+        with self._lock:
+            entries = [[key, entry.fingerprint, entry.size, entry.value]
+                       for key, entry in self._entries.items() if not entry.volatile]
+            generation = self.generation
+        payload = json.dumps({
+            'version': SNAPSHOT_VERSION,
+            'loader': self._loader_tag(),
+            'entries': entries,
+        }, default=str).encode('utf-8')
+        
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(payload, compresslevel=1))
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        self._saved_generation = generation
+        return len(entries)
+    
+    def load_snapshot(self, path: Path) -> int:
+        """
+        Fill the cache from a snapshot written by save_snapshot.
+        Loaded entries are served as they are for `revalidate_seconds`, then
+        checked against the files like any other entry.
+        Returns the number of entries loaded (0 for a missing, unreadable or outdated snapshot).
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = json.loads(gzip.decompress(f.read()))
+        except (OSError, EOFError, ValueError):
+            return 0
+        if data.get('version') != SNAPSHOT_VERSION or data.get('loader') != self._loader_tag():
+            return 0
+        
+        now = time.monotonic()
+        loaded = 0
+        with self._lock:
+            for key, fingerprint, size, value in data.get('entries', []):
+                if key in self._entries or value is None:
+                    continue
+                self._entries[key] = _Entry(_as_tuple(fingerprint), value, size, now, False)
+                self._bytes += size
+                loaded += 1
+            self._evict()
+            self._saved_generation = self.generation
+        return loaded
+    
+    @property
+    def changed_since_save(self) -> bool:
+        return self.generation != self._saved_generation
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._listing = None
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'revalidate_seconds': self.revalidate_seconds,
+            }
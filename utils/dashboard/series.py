@@ -0,0 +1,187 @@
+"""
+Downsampling of the time series served by the analysis endpoints.
+
+The extracted *_over_time.json files ({"data": [{"step": ..., "<series>": ...}, ...]})
+and checkpoint reward curves grow with run length. Endpoints cut them to an
+optional step range and at most `max_points` rows with largest-triangle-three-
+buckets (LTTB), which keeps peaks, dips and the overall shape of a line chart.
+
+Files with several series per row (losses, action percentages) are reduced by
+running LTTB on each series with an equal share of the budget and returning the
+union of the selected rows, so every series keeps its shape and rows stay whole.
+
+Parsed files are kept per file version (mtime and size, or the bundle of an
+archived run), so zooming into a range doesn't re-read the file.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from run_archive import is_archived
+
+DEFAULT_MAX_POINTS = 1000
+PARSED_FILES_CACHED = 32
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the n_out points LTTB keeps from (x, y), x sorted ascending.
+    The first and last points are always kept. NaNs are only picked from buckets without finite values.
+    """
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+    
+    # n_out - 2 buckets over the points between the first and the last, with the
+    # reference implementation's edges: floor(i * every) + 1. The extra edge ends
+    # the range averaged for the last bucket (the last point, give or take rounding).
+    every = (n - 2) / (n_out - 2)
+    edges = np.minimum(np.floor(np.arange(n_out) * every).astype(np.int64) + 1, n)
+    finite = np.isfinite(y)
+    y_filled = np.where(finite, y, 0.0)
+    
+    def bucket_mean(lo: int, hi: int) -> Tuple[float, float]:
+        # Summed in order (cumsum, not pairwise) to round exactly like the reference
+        count = int(finite[lo:hi].sum())
+        mean_y = np.cumsum(y_filled[lo:hi])[-1] / count if count else np.nan
+        return np.cumsum(x[lo:hi])[-1] / (hi - lo), mean_y
+    
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Each bucket looks ahead at the mean of the next one
+        next_x, next_y = bucket_mean(hi, edges[i + 2])
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        area[~np.isfinite(area)] = -1.0
+        a = lo + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def select_indices(x: np.ndarray, ys: Sequence[np.ndarray], max_points: Optional[int],
+                   min_step: Optional[float] = None, max_step: Optional[float] = None) -> Tuple[np.ndarray, int]:
+    """
+    (indices, points in range): indices of the points to return, those within
+    [min_step, max_step] reduced to at most max_points (None or 0: no limit)
+    with LTTB on each series in ys.
+    """
+    in_range = np.ones(len(x), dtype=bool)
+    if min_step is not None:
+        in_range &= x >= min_step
+    if max_step is not None:
+        in_range &= x <= max_step
+    candidates = np.flatnonzero(in_range)
+    if not max_points or len(candidates) <= max_points:
+        return candidates, len(candidates)
+    
+    order = np.argsort(x[candidates], kind='stable')
+    candidates = candidates[order]
+    share = max(max_points // max(len(ys), 1), 3)
+    x_range = x[candidates].astype(np.float64)
+    selected = [lttb_indices(x_range, y[candidates].astype(np.float64), share) for y in ys] or [
+        lttb_indices(x_range, np.zeros(len(candidates)), share)]
+    return candidates[np.unique(np.concatenate(selected))], len(candidates)
+
+
+def column(rows: Sequence[Mapping[str, Any]], key: str) -> np.ndarray:
+    """rows[*][key] as floats (missing or null -> NaN)."""
+    return np.array([row.get(key) if isinstance(row.get(key), (int, float)) else np.nan for row in rows],
+                    dtype=np.float64)
+
+
+def sampling_info(total: int, returned: int, max_points: Optional[int]) -> Dict[str, Any]:
+    return {
+        'method': 'lttb' if max_points and returned < total else 'none',
+        'total_points': total,
+        'returned_points': returned,
+        'max_points': max_points or None,
+    }
+
+
+def parse_series_args(args: Mapping[str, str]) -> Tuple[Optional[int], Optional[float], Optional[float]]:
+    """
+    (max_points, min_step, max_step) from query parameters.
+    max_points defaults to DEFAULT_MAX_POINTS; max_points=0 returns every point.
+    Raises ValueError for values that aren't numbers.
+    """
+    max_points = args.get('max_points')
+    max_points = DEFAULT_MAX_POINTS if max_points in (None, '') else max(int(max_points), 0)
+    min_step = args.get('min_step')
+    max_step = args.get('max_step')
+    min_step = float(min_step) if min_step not in (None, '') else None
+    max_step = float(max_step) if max_step not in (None, '') else None
+    return max_points, min_step, max_step
+
+
+def file_version(path) -> Optional[Tuple]:
+    """(mtime_ns, size) of a file, or of the bundle for a file inside an archived run; None if missing."""
+    try:
+        if is_archived(path):
+            st = os.stat(path.root.filename)
+            return ('bundle', path.root.filename, st.st_mtime_ns, st.st_size)
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class SeriesFileCache:
+    """Parsed *_over_time.json files (with their columns as arrays), per file version."""
+    
+    def __init__(self, max_files: int = PARSED_FILES_CACHED):
+        self.max_files = max_files
+        self._files: 'OrderedDict[str, Tuple[Tuple, Dict, Dict[str, np.ndarray]]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def load(self, path) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """(parsed file, column cache) for path. Raises OSError/ValueError like json.load."""
+        key = str(path)
+        version = file_version(path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry[0] == version:
+                self._files.move_to_end(key)
+                return entry[1], entry[2]
+        with path.open('r') as f:
+            data = json.load(f)
+        columns: Dict[str, np.ndarray] = {}
+        with self._lock:
+            self._files[key] = (version, data, columns)
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return data, columns
+    
+    def downsample(self, path, x_key: str, y_keys: Optional[List[str]], max_points: Optional[int],
+                   min_step: Optional[float] = None, max_step: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Contents of a {"data": [rows]} file with data cut to the step range and max_points.
+        y_keys: series to preserve (None: every numeric key of the first row but x_key).
+        Other top-level keys are returned unchanged, plus "sampling".
+        """
+        data, columns = self.load(path)
+        rows = data.get('data') if isinstance(data, dict) else None
+        if not isinstance(rows, list):
+            return data
+        if y_keys is None:
+            first = rows[0] if rows and isinstance(rows[0], dict) else {}
+            y_keys = [k for k, v in first.items() if k != x_key and isinstance(v, (int, float))]
+        for key in [x_key] + y_keys:
+            if key not in columns:
+                columns[key] = column(rows, key)
+        
+        indices, in_range = select_indices(columns[x_key], [columns[k] for k in y_keys],
+                                           max_points, min_step, max_step)
+        result = dict(data)
+        result['data'] = [rows[i] for i in indices]
+        result['sampling'] = sampling_info(in_range, len(indices), max_points)
+        return result
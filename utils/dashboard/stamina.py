@@ -0,0 +1,271 @@
+"""
+Stamina trajectories by episode range, for /api/analysis/stamina/<run_id>.
+
+TrainingLogger rewrites run_logs/stamina_trajectories.json
+({"trajectories": [{episodeNumber, dataPoints: [{timestep, stamina, stepCount}]}]})
+with every episode, so it grows without bound. It is parsed once per file
+version into a columnar index stored in <results>/.stamina_index/<run_id>/:
+
+    episode.npy   int64[n]      episode numbers, ascending (repeated once per agent)
+    offsets.npy   int64[n + 1]  trajectory i = points offsets[i]:offsets[i + 1]
+    timestep.npy  int32[p]      points of all trajectories, each sorted by timestep
+    stamina.npy   float32[p]
+    step.npy      float64[p]    stepCount
+    source.json   version of the JSON file the index was built from
+
+The arrays are memory-mapped, so opening a run and reading a few trajectories
+costs the same however many episodes were logged. Requests select trajectories
+by episode range or list, paginate them, and can decimate each one with LTTB.
+
+Responses are JSON ({"trajectories": [...]}, as before) or, with
+Accept: application/octet-stream (or ?format=binary), a compact binary layout:
+
+    b"STM1", uint32 header length, header JSON (space-padded to 8 bytes),
+    then the arrays listed in header["arrays"] ({name, dtype, offset, count},
+    offsets from the end of the header, little-endian, 8-byte aligned):
+    episode int32[k], counts int32[k], timestep int32[sum(counts)],
+    stamina float32[sum(counts)], step float64[sum(counts)]
+"""
+
+import json
+import os
+import shutil
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from series import file_version, lttb_indices
+
+INDEX_DIRNAME = '.stamina_index'
+INDEX_VERSION = 1
+ARRAY_NAMES = ('episode', 'offsets', 'timestep', 'stamina', 'step')
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+BINARY_MIME = 'application/octet-stream'
+BINARY_MAGIC = b'STM1'
+INDEXES_CACHED = 16
+
+
+class StaminaIndex:
+    """Columnar stamina trajectories of one run."""
+    
+    def __init__(self, episode: np.ndarray, offsets: np.ndarray, timestep: np.ndarray,
+                 stamina: np.ndarray, step: np.ndarray):
+        self.episode = episode
+        self.offsets = offsets
+        self.timestep = timestep
+        self.stamina = stamina
+        self.step = step
+    
+    def __len__(self) -> int:
+        return len(self.episode)
+    
+    @classmethod
+    def build(cls, trajectories: List[Dict]) -> 'StaminaIndex':
+        """Index of the trajectories that have an episode number and data points."""
+        valid = [t for t in trajectories
+                 if isinstance(t, dict) and isinstance(t.get('episodeNumber'), (int, float)) and t.get('dataPoints')]
+        valid.sort(key=lambda t: t['episodeNumber'])
+        counts = np.array([len(t['dataPoints']) for t in valid], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        points = [p for t in valid for p in t['dataPoints']]
+        
+        def numbers(name: str, dtype) -> np.ndarray:
+            return np.array([p.get(name) or 0 for p in points], dtype=dtype)
+        
+        timestep = numbers('timestep', np.int32)
+        stamina = numbers('stamina', np.float32)
+        step = numbers('stepCount', np.float64)
+        # Points of each trajectory in timestep order (the graph normalizes time per episode)
+        if len(points):
+            order = np.lexsort((timestep, np.repeat(np.arange(len(valid)), counts)))
+            timestep, stamina, step = timestep[order], stamina[order], step[order]
+        episode = np.array([int(t['episodeNumber']) for t in valid], dtype=np.int64)
+        return cls(episode, offsets, timestep, stamina, step)
+    
+    def save(self, directory: Path, source: Any):
+        """Write the arrays and source.json (last, so a partial index is never used)."""
+        tmp_dir = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for name in ARRAY_NAMES:
+            np.save(tmp_dir / f"{name}.npy", getattr(self, name))
+        with open(tmp_dir / 'source.json', 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'source': source}, f)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+    
+    @classmethod
+    def load(cls, directory: Path, source: Any) -> Optional['StaminaIndex']:
+        """Memory-mapped index, or None if missing or built from another version of the file."""
+        try:
+            with open(directory / 'source.json', 'r') as f:
+                meta = json.load(f)
+            if meta.get('version') != INDEX_VERSION or meta.get('source') != source:
+                return None
+            return cls(*(np.load(directory / f"{name}.npy", mmap_mode='r') for name in ARRAY_NAMES))
+        except (OSError, ValueError):
+            return None
+    
+    def select(self, start_episode: Optional[int] = None, end_episode: Optional[int] = None,
+               episodes: Optional[List[int]] = None) -> np.ndarray:
+        """Positions of the trajectories in [start_episode, end_episode] and/or in episodes."""
+        lo = 0 if start_episode is None else int(np.searchsorted(self.episode, start_episode, 'left'))
+        hi = len(self.episode) if end_episode is None else int(np.searchsorted(self.episode, end_episode, 'right'))
+        positions = np.arange(lo, hi)
+        if episodes is not None:
+            # Episode numbers count per agent: every trajectory of each wanted number
+            wanted = np.asarray(sorted(set(episodes)), dtype=np.int64)
+            positions = positions[np.isin(self.episode[lo:hi], wanted)]
+        return positions
+    
+    def points(self, position: int, max_points: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(timestep, stamina, step) of one trajectory, LTTB-decimated to max_points if set."""
+        lo, hi = int(self.offsets[position]), int(self.offsets[position + 1])
+        timestep = np.asarray(self.timestep[lo:hi])
+        stamina = np.asarray(self.stamina[lo:hi])
+        step = np.asarray(self.step[lo:hi])
+        if max_points and hi - lo > max_points:
+            keep = lttb_indices(timestep.astype(np.float64), stamina.astype(np.float64), max_points)
+            timestep, stamina, step = timestep[keep], stamina[keep], step[keep]
+        return timestep, stamina, step
+
+
+def parse_stamina_args(args: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    start_episode / end_episode (inclusive), episodes (comma-separated),
+    offset / limit (pagination, default limit 50, at most 1000), max_points
+    (per trajectory, 0 or absent = all), index=1 (episode list only).
+    Raises ValueError for invalid values.
+    """
+    def optional_int(name: str) -> Optional[int]:
+        return int(args[name]) if args.get(name) else None
+    
+    limit = optional_int('limit')
+    limit = DEFAULT_LIMIT if limit is None else limit
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    episodes = [int(e) for e in args['episodes'].split(',') if e.strip()] if args.get('episodes') else None
+    return {
+        'start_episode': optional_int('start_episode'),
+        'end_episode': optional_int('end_episode'),
+        'episodes': episodes,
+        'offset': max(optional_int('offset') or 0, 0),
+        'limit': limit,
+        'max_points': max(optional_int('max_points') or 0, 0),
+        'index_only': args.get('index') in ('1', 'true'),
+    }
+
+
+def query(index: StaminaIndex, options: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple]]:
+    """(page description, [(episode, timestep, stamina, step) per trajectory on the page])."""
+    positions = index.select(options['start_episode'], options['end_episode'], options['episodes'])
+    page = positions[options['offset']:options['offset'] + options['limit']]
+    next_offset = options['offset'] + len(page)
+    meta = {
+        'total_trajectories': len(index),
+        'matched': int(len(positions)),
+        'offset': options['offset'],
+        'limit': options['limit'],
+        'next_offset': next_offset if next_offset < len(positions) else None,
+        'max_points': options['max_points'] or None,
+    }
+    trajectories = [(int(index.episode[i]),) + index.points(int(i), options['max_points']) for i in page]
+    return meta, trajectories
+
+
+def episode_list(index: StaminaIndex) -> Dict[str, Any]:
+    """Every episode number with its point count (for choosing episodes to fetch)."""
+    return {
+        'total_trajectories': len(index),
+        'episodes': np.asarray(index.episode).tolist(),
+        'point_counts': np.diff(np.asarray(index.offsets)).tolist(),
+    }
+
+
+def to_json(meta: Dict[str, Any], trajectories: List[Tuple]) -> Dict[str, Any]:
+    return {
+        **meta,
+        'trajectories': [{
+            'episodeNumber': episode,
+            'dataPoints': [{'timestep': int(t), 'stamina': float(s), 'stepCount': int(c)}
+                           for t, s, c in zip(timestep.tolist(), stamina.tolist(), step.tolist())],
+        } for episode, timestep, stamina, step in trajectories],
+    }
+
+
+def to_binary(meta: Dict[str, Any], trajectories: List[Tuple]) -> bytes:
+    """Binary layout described in the module docstring."""
+    def concat(column: int, dtype: str) -> np.ndarray:
+        parts = [t[column] for t in trajectories]
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+    
+    arrays = [
+        ('episode', np.array([t[0] for t in trajectories], dtype='<i4')),
+        ('counts', np.array([len(t[1]) for t in trajectories], dtype='<i4')),
+        ('timestep', concat(1, '<i4')),
+        ('stamina', concat(2, '<f4')),
+        ('step', concat(3, '<f8')),
+    ]
+    described = []
+    offset = 0
+    for name, array in arrays:
+        described.append({'name': name, 'dtype': array.dtype.name, 'offset': offset, 'count': int(len(array))})
+        offset += (array.nbytes + 7) // 8 * 8
+    
+    header = json.dumps({**meta, 'arrays': described}).encode('utf-8')
+    # Arrays start at the first multiple of 8 after the header
+    header += b' ' * (-(8 + len(header)) % 8)
+    
+    chunks = [BINARY_MAGIC, struct.pack('<I', len(header)), header]
+    for _, array in arrays:
+        raw = array.tobytes()
+        chunks.append(raw + b'\0' * ((len(raw) + 7) // 8 * 8 - len(raw)))
+    return b''.join(chunks)
+
+
+class StaminaStore:
+    """StaminaIndex per run: from memory, from <results>/.stamina_index, or built from the JSON file."""
+    
+    def __init__(self, max_cached: int = INDEXES_CACHED):
+        self.max_cached = max_cached
+        self._indexes: 'OrderedDict[str, Tuple[Any, StaminaIndex]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+    
+    def get(self, results_dir: Path, run_id: str, source_path) -> StaminaIndex:
+        """Index of source_path (the run's stamina_trajectories.json). Raises OSError/ValueError."""
+        source = file_version(source_path)
+        source = list(source) if source is not None else None
+        with self._lock:
+            cached = self._indexes.get(run_id)
+            if cached is not None and cached[0] == source:
+                self._indexes.move_to_end(run_id)
+                return cached[1]
+            build_lock = self._build_locks.setdefault(run_id, threading.Lock())
+        
+        # One build per run at a time; concurrent requests wait for it
+        with build_lock:
+            directory = results_dir / INDEX_DIRNAME / run_id
+            index = StaminaIndex.load(directory, source)
+            if index is None:
+                with source_path.open('r') as f:
+                    data = json.load(f)
+                if not isinstance(data, dict) or 'trajectories' not in data:
+                    raise ValueError("stamina_trajectories.json missing 'trajectories' key")
+                index = StaminaIndex.build(data.get('trajectories') or [])
+                try:
+                    index.save(directory, source)
+                    index = StaminaIndex.load(directory, source) or index
+                except OSError as e:
+                    print(f"[WARN] Could not write stamina index {directory}: {e}")
+        with self._lock:
+            self._indexes[run_id] = (source, index)
+            self._indexes.move_to_end(run_id)
+            while len(self._indexes) > self.max_cached:
+                self._indexes.popitem(last=False)
+        return index
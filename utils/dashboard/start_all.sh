@@ -37,8 +37,8 @@ if ! command -v python3 &> /dev/null; then
 fi
 
 # Check if Flask is installed
-if ! $PYTHON_CMD -c "import flask" &> /dev/null; then
-    echo "[WARNING] Flask is not installed"
+if ! $PYTHON_CMD -c "import flask, numpy" &> /dev/null; then
+    echo "[WARNING] Flask or NumPy is not installed"
     echo "Installing dashboard dependencies..."
     pip3 install -r requirements.txt || pip install -r requirements.txt
     if [ $? -ne 0 ]; then
@@ -65,7 +65,7 @@ echo ""
 # Start Dashboard in background
 echo "[1/2] Starting Dashboard on port 5000..."
 cd "$SCRIPT_DIR"
-$PYTHON_CMD app.py > dashboard.log 2>&1 &
+$PYTHON_CMD app.py --production > dashboard.log 2>&1 &
 DASHBOARD_PID=$!
 
 # Wait a moment for dashboard to start
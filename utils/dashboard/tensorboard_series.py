@@ -0,0 +1,175 @@
+"""
+Time series graphs extracted on demand from a run's TensorBoard event files.
+
+action_distribution_over_time.json, losses_over_time.json and
+entropy_over_time.json are written to run_logs/ by extract_tensorboard_data.py
+after training. When a run doesn't have them (extraction skipped or failed, run
+still training), the analysis endpoints get them from TensorBoardSeries:
+
+- An extraction reads every scalar of the event files (EventAccumulator loads
+  them whole either way) and writes the three files at once, with the filters
+  of extract_tensorboard_data.py.
+- Extractions run on a background worker. Concurrent requests for a run share
+  its extraction (one future per run, even if the event files grew since it
+  started: the versions are checked again on the next request after it ends)
+  and wait up to `wait_seconds` for it; after that the endpoint answers 202
+  and the page asks again.
+- Results are kept in <results>/.tensorboard_cache/<run_id>/ with the versions
+  of the event files they came from. When those change (run still training),
+  the previous result is served while a new extraction runs.
+- Failures (no event files, tensorboard not installed) are remembered per event
+  file version, so they aren't retried on every request.
+
+Archived runs are not extracted (EventAccumulator needs files on disk).
+"""
+
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import extract_tensorboard_data as extractor
+from run_archive import is_archived
+from series import file_version
+
+CACHE_DIRNAME = '.tensorboard_cache'
+CACHE_VERSION = 1
+DEFAULT_WAIT_SECONDS = 10.0
+
+
+def event_versions(run_path) -> Optional[List]:
+    """[name, mtime_ns, size] of the run's event files (None: archived run or no event files)."""
+    if is_archived(run_path) or not run_path.is_dir():
+        return None
+    log_dir = extractor.find_tensorboard_logs(run_path)
+    if log_dir is None:
+        return None
+    versions = []
+    for path in sorted(log_dir.glob("events.out.tfevents.*")):
+        st = os.stat(path)
+        versions.append([path.relative_to(run_path).as_posix(), st.st_mtime_ns, st.st_size])
+    return versions
+
+
+class TensorBoardSeries:
+    """Extracted series files per run, on disk, refreshed when the event files change."""
+    
+    def __init__(self, workers: int = 1, wait_seconds: float = DEFAULT_WAIT_SECONDS):
+        self.wait_seconds = wait_seconds
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tensorboard-extract')
+        self._lock = threading.Lock()
+        # run_id -> (event versions being extracted, future)
+        self._pending: Dict[str, Tuple[List, Future]] = {}
+        # run_id -> (event versions that failed, error)
+        self._failures: Dict[str, Tuple[List, str]] = {}
+        self.extractions = 0
+        self.coalesced = 0
+    
+    @staticmethod
+    def cache_dir(results_dir: Path, run_id: str) -> Path:
+        return results_dir / CACHE_DIRNAME / run_id
+    
+    def version(self, results_dir: Path, run_id: str) -> Optional[Tuple]:
+        """Version of the run's extracted files (changes with each extraction), for ETags."""
+        return file_version(self.cache_dir(results_dir, run_id) / 'source.json')
+    
+    def _cached_events(self, cache_dir: Path) -> Optional[List]:
+        """Event versions the cached files were extracted from, None if there are none."""
+        try:
+            with open(cache_dir / 'source.json', 'r') as f:
+                source = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return source.get('events') if source.get('version') == CACHE_VERSION else None
+    
+    def _extract(self, run_id: str, run_path: Path, cache_dir: Path, versions: List):
+        tmp_dir = cache_dir.with_name(f"{cache_dir.name}.{os.getpid()}.tmp")
+        try:
+            log_dir = extractor.find_tensorboard_logs(run_path)
+            if log_dir is None:
+                raise FileNotFoundError("No TensorBoard event files")
+            scalars = extractor.extract_scalars(log_dir, verbose=False)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            written = []
+            for name, build_rows in extractor.SERIES_FILES.items():
+                rows = build_rows(scalars)
+                if rows:
+                    with open(tmp_dir / name, 'w') as f:
+                        json.dump({"data": rows}, f)
+                    written.append(name)
+            # source.json last: a cache directory without it is never used
+            with open(tmp_dir / 'source.json', 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'events': versions, 'files': written}, f)
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            os.replace(tmp_dir, cache_dir)
+            print(f"[OK] Extracted {', '.join(written) or 'no series'} for {run_id} from TensorBoard")
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            with self._lock:
+                self._failures[run_id] = (versions, str(e))
+            print(f"[WARN] TensorBoard extraction failed for {run_id}: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(run_id, None)
+    
+    def _submit(self, run_id: str, run_path: Path, cache_dir: Path, versions: List) -> Future:
+        """
+        The extraction of run_id in progress, or a new one from these event versions.
+        A live run's files grow during an extraction: queueing another whole-file
+        pass per request would only pile up, so it waits until this one ends.
+        """
+        with self._lock:
+            pending = self._pending.get(run_id)
+            if pending is not None:
+                self.coalesced += 1
+                return pending[1]
+            future = self._pool.submit(self._extract, run_id, run_path, cache_dir, versions)
+            self._pending[run_id] = (versions, future)
+            self.extractions += 1
+            return future
+    
+    def get(self, results_dir: Path, run_id: str, run_path, name: str) -> Tuple[str, Any]:
+        """
+        ('ready', path of the extracted file), ('pending', None) while the first
+        extraction is still running, or ('unavailable', reason).
+        """
+        versions = event_versions(run_path)
+        if versions is None:
+            reason = "Archived runs are not extracted" if is_archived(run_path) else "No TensorBoard event files"
+            return 'unavailable', reason
+        
+        cache_dir = self.cache_dir(results_dir, run_id)
+        cached = self._cached_events(cache_dir)
+        with self._lock:
+            failure = self._failures.get(run_id)
+        if cached != versions and (failure is None or failure[0] != versions):
+            future = self._submit(run_id, run_path, cache_dir, versions)
+            if cached is None:
+                # Nothing to serve yet: wait for the extraction a little
+                try:
+                    future.result(timeout=self.wait_seconds)
+                except TimeoutError:
+                    return 'pending', None
+                cached = self._cached_events(cache_dir)
+                with self._lock:
+                    failure = self._failures.get(run_id)
+        
+        if cached is None:
+            return 'unavailable', failure[1] if failure is not None else "Extraction failed"
+        path = cache_dir / name
+        if not path.exists():
+            return 'unavailable', f"No data for {name} in the TensorBoard event files"
+        return 'ready', path
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'extractions': self.extractions,
+                'coalesced': self.coalesced,
+                'pending': sorted(self._pending),
+                'failures': {run_id: error for run_id, (_, error) in self._failures.items()},
+            }
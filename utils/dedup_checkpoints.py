@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Content-addressed deduplication of checkpoint files across runs.
+
+Runs started with --initialize-from and inference runs often hold byte-identical
+.onnx/.pt files. This pass hashes checkpoints (SHA-256, in parallel), keeps one
+copy of each content in a store inside the results directory, and turns every
+duplicate into a hardlink to it:
+
+    src/results/.checkpoint_store/ab/ab12...ef.onnx     (one inode per content)
+    src/results/<run>/ParkourRunner/ParkourRunner-500000.onnx -> same inode
+
+- Only files whose size matches another checkpoint (or a stored object) are
+  hashed; a unique size can't have a duplicate.
+- Hashes are cached by path, size and mtime (.dedup_hash_cache.json), so
+  repeat passes only hash new or changed files.
+- Files already sharing an inode are hashed once.
+- Only step checkpoints (<behavior>-<step>.onnx/.pt) are linked. They are
+  written once; checkpoint.pt and the final <behavior>.onnx are rewritten in
+  place by ML-Agents (every save, --resume), and an in-place write to a
+  hardlink changes every run sharing it. Permissions are left alone: the
+  store is only ever replaced by re-linking.
+
+Usage:
+    python utils/dedup_checkpoints.py               # Report duplicates and possible savings
+    python utils/dedup_checkpoints.py --apply       # Link duplicates to the store
+    python utils/dedup_checkpoints.py --stats       # Store size and current savings
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+STORE_DIRNAME = '.checkpoint_store'
+CACHE_FILENAME = '.dedup_hash_cache.json'
+CACHE_VERSION = 1
+# <behavior>-<step>.onnx/.pt: written once. Other names (checkpoint.pt, <behavior>.onnx)
+# are rewritten in place by ML-Agents and never share their inode
+STEP_CHECKPOINT = re.compile(r'-\d+\.(onnx|pt)$')
+HASH_CHUNK = 1024 * 1024
+# Runs with files changed more recently are assumed to be still training
+DEFAULT_MIN_AGE_MINUTES = 60
+
+
+class CheckpointFile:
+    """A checkpoint file found in a run directory."""
+    
+    def __init__(self, path: Path, rel: str, st: os.stat_result):
+        self.path = path
+        self.rel = rel
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.inode = (st.st_dev, st.st_ino)
+        self.digest: Optional[str] = None
+
+
+class HashCache:
+    """SHA-256 of previously hashed files, valid while size and mtime are unchanged."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, List] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('files', {})
+            except (OSError, ValueError):
+                pass  # Unreadable cache, start fresh
+    
+    def get(self, file: CheckpointFile) -> Optional[str]:
+        entry = self.entries.get(file.rel)
+        hit = entry is not None and entry[0] == file.size and entry[1] == file.mtime_ns
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry[2] if hit else None
+    
+    def put(self, file: CheckpointFile):
+        with self._lock:
+            self.entries[file.rel] = [file.size, file.mtime_ns, file.digest]
+    
+    def prune(self, rels: List[str]):
+        keep = set(rels)
+        self.entries = {rel: entry for rel, entry in self.entries.items() if rel in keep}
+    
+    def save(self):
+        """Write atomically so an interrupted pass never leaves a corrupt cache."""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[WARN] Could not write hash cache {self.path}: {e}")
+
+
+def sha256_file(path: Path) -> str:
+    """hashlib releases the GIL on large updates, so threads hash files concurrently."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_checkpoints(results_dir: Path, min_age_seconds: float = 0) -> Tuple[List[CheckpointFile], List[str]]:
+    """
+    Step checkpoints (STEP_CHECKPOINT) in run directories, skipping the store and hidden dirs.
+    Returns (files, names of runs skipped as recently active).
+    """
+    cutoff = time.time() - min_age_seconds
+    files: List[CheckpointFile] = []
+    active_runs: List[str] = []
+    with os.scandir(results_dir) as entries:
+        run_dirs = sorted(entry.path for entry in entries if entry.is_dir() and not entry.name.startswith('.'))
+    
+    for run_dir in run_dirs:
+        run_files = []
+        newest = 0.0
+        stack = [run_dir]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            newest = max(newest, st.st_mtime)
+                            if STEP_CHECKPOINT.search(entry.name):
+                                rel = Path(entry.path).relative_to(results_dir).as_posix()
+                                run_files.append(CheckpointFile(Path(entry.path), rel, st))
+            except OSError:
+                pass
+        if min_age_seconds and newest > cutoff:
+            active_runs.append(Path(run_dir).name)
+            continue
+        files.extend(run_files)
+    return files, active_runs
+
+
+def store_object_path(store_dir: Path, digest: str, suffix: str) -> Path:
+    return store_dir / digest[:2] / f"{digest}{suffix}"
+
+
+def list_store(store_dir: Path) -> List[Tuple[Path, os.stat_result]]:
+    objects = []
+    if not store_dir.exists():
+        return objects
+    for shard in os.scandir(store_dir):
+        if shard.is_dir():
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    objects.append((Path(entry.path), entry.stat()))
+    return objects
+
+
+def hash_candidates(files: List[CheckpointFile], store_sizes: set, cache: Optional[HashCache],
+                    workers: Optional[int]) -> int:
+    """
+    Set .digest on every file that could have a duplicate (size shared with
+    another file or a stored object). Returns the number of files actually read.
+    """
+    size_counts: Dict[int, int] = {}
+    inode_sizes: Dict[Tuple[int, int], int] = {}
+    for file in files:
+        if file.inode not in inode_sizes:
+            inode_sizes[file.inode] = file.size
+            size_counts[file.size] = size_counts.get(file.size, 0) + 1
+    candidates = [file for file in files
+                  if size_counts[file.size] > 1 or file.size in store_sizes]
+    
+    # One hash per inode; cached digests first
+    by_inode: Dict[Tuple[int, int], List[CheckpointFile]] = {}
+    for file in candidates:
+        by_inode.setdefault(file.inode, []).append(file)
+    to_hash: List[List[CheckpointFile]] = []
+    for group in by_inode.values():
+        digest = None
+        if cache is not None:
+            for file in group:
+                digest = cache.get(file)
+                if digest:
+                    break
+        if digest:
+            for file in group:
+                file.digest = digest
+        else:
+            to_hash.append(group)
+    
+    def work(group: List[CheckpointFile]):
+        digest = sha256_file(group[0].path)
+        for file in group:
+            file.digest = digest
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(work, to_hash))
+    
+    if cache is not None:
+        for file in candidates:
+            if file.digest:
+                cache.put(file)
+    return len(to_hash)
+
+
+def plan_dedup(files: List[CheckpointFile], store_dir: Path) -> Dict[str, List[CheckpointFile]]:
+    """digest -> files whose inode differs from the store object (i.e. files to link)."""
+    groups: Dict[str, List[CheckpointFile]] = {}
+    for file in files:
+        if file.digest:
+            groups.setdefault(file.digest, []).append(file)
+    
+    plan = {}
+    for digest, group in groups.items():
+        suffix = Path(group[0].rel).suffix
+        obj = store_object_path(store_dir, digest, suffix)
+        try:
+            st = os.stat(obj)
+            store_inode = (st.st_dev, st.st_ino)
+        except OSError:
+            store_inode = None
+        inodes = {file.inode for file in group}
+        # Nothing to gain if everything already shares one inode with the store
+        if store_inode is None and len(inodes) == 1:
+            continue
+        pending = [file for file in group if file.inode != store_inode]
+        if pending:
+            plan[digest] = pending
+    return plan
+
+
+def plan_savings(plan: Dict[str, List[CheckpointFile]], store_dir: Path) -> int:
+    """Bytes freed by applying the plan (one copy per content survives)."""
+    saved = 0
+    for digest, pending in plan.items():
+        obj = store_object_path(store_dir, digest, Path(pending[0].rel).suffix)
+        inodes = {file.inode for file in pending}
+        # Without a store object, one of the pending inodes becomes it
+        saved += pending[0].size * (len(inodes) - (0 if obj.exists() else 1))
+    return saved
+
+
+def link_group(digest: str, pending: List[CheckpointFile], store_dir: Path) -> Tuple[int, List[str]]:
+    """
+    Make every pending file a hardlink of the store object (creating the object
+    from the first file if needed). Returns (files linked, errors).
+    """
+    obj = store_object_path(store_dir, digest, Path(pending[0].rel).suffix)
+    errors = []
+    linked = 0
+    if not obj.exists():
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # The first copy becomes the store object without copying any bytes
+            os.link(pending[0].path, obj)
+        except OSError as e:
+            return 0, [f"{pending[0].rel}: could not create store object ({e})"]
+    
+    obj_stat = os.stat(obj)
+    obj_inode = (obj_stat.st_dev, obj_stat.st_ino)
+    for file in pending:
+        if file.inode == obj_inode:
+            continue
+        try:
+            current = os.stat(file.path)
+            if current.st_size != file.size or current.st_mtime_ns != file.mtime_ns:
+                errors.append(f"{file.rel}: changed since it was hashed, skipped")
+                continue
+            tmp_path = file.path.with_name(file.path.name + '.dedup.tmp')
+            os.link(obj, tmp_path)
+            os.replace(tmp_path, file.path)
+            linked += 1
+        except OSError as e:
+            errors.append(f"{file.rel}: {e}")
+    return linked, errors
+
+
+def format_size(bytes_size: float) -> str:
+    """Format bytes to human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes_size < 1024.0:
+            return f"{bytes_size:.1f}{unit}"
+        bytes_size /= 1024.0
+    return f"{bytes_size:.1f}TB"
+
+
+def print_store_stats(store_dir: Path):
+    objects = list_store(store_dir)
+    stored = sum(st.st_size for _, st in objects)
+    # nlink counts the store entry itself; every further link is a deduplicated copy
+    saved = sum(st.st_size * max(st.st_nlink - 2, 0) for _, st in objects)
+    orphans = sum(1 for _, st in objects if st.st_nlink == 1)
+    print(f"Store: {len(objects)} objects, {format_size(stored)} in {store_dir}")
+    print(f"Currently saved by hardlinks: {format_size(saved)}")
+    if orphans:
+        print(f"Unreferenced objects: {orphans} (run --gc to delete)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Deduplicate identical .onnx/.pt checkpoints across runs with a content-addressed store.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/dedup_checkpoints.py                 # Report duplicate groups and savings
+  python utils/dedup_checkpoints.py --apply         # Hardlink duplicates to the store
+  python utils/dedup_checkpoints.py --stats         # Store size and bytes currently saved
+  python utils/dedup_checkpoints.py --gc            # Delete store objects no run uses anymore
+        """
+    )
+    parser.add_argument('--apply', action='store_true', help='Replace duplicates with hardlinks')
+    parser.add_argument('--stats', action='store_true', help='Only print store statistics')
+    parser.add_argument('--gc', action='store_true',
+                        help='Delete store objects that no run links to anymore')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Files hashed in parallel (default: thread pool default)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Re-hash every candidate and skip the hash cache ({CACHE_FILENAME})')
+    parser.add_argument('--min-age', type=float, default=DEFAULT_MIN_AGE_MINUTES,
+                        help=f'Skip runs with files changed in the last N minutes (default: {DEFAULT_MIN_AGE_MINUTES})')
+    parser.add_argument('--verbose', '-v', action='store_true', help='List every duplicate file')
+    parser.add_argument('--results-dir', type=str, default=None,
+                        help='Path to results directory (default: src/results relative to project root)')
+    
+    args = parser.parse_args()
+    
+    project_root = Path(__file__).parent.parent
+    if args.results_dir is None:
+        results_dir = project_root / 'src' / 'results'
+    else:
+        results_dir = Path(args.results_dir)
+        if not results_dir.is_absolute():
+            results_dir = project_root / results_dir
+    if not results_dir.exists():
+        print(f"[ERROR] Results directory not found: {results_dir}")
+        return
+    store_dir = results_dir / STORE_DIRNAME
+    
+    if args.stats:
+        print_store_stats(store_dir)
+        return
+    
+    if args.gc:
+        removed = 0
+        freed = 0
+        for path, st in list_store(store_dir):
+            if st.st_nlink == 1:
+                path.unlink()
+                removed += 1
+                freed += st.st_size
+        print(f"[OK] Removed {removed} unreferenced objects, freed {format_size(freed)}")
+        return
+    
+    print("Scanning checkpoints...")
+    start = time.perf_counter()
+    files, active_runs = find_checkpoints(results_dir, args.min_age * 60)
+    store_sizes = {st.st_size for _, st in list_store(store_dir)}
+    cache = None if args.no_cache else HashCache(results_dir / CACHE_FILENAME)
+    hashed = hash_candidates(files, store_sizes, cache, args.workers)
+    if cache is not None:
+        cache.prune([file.rel for file in files])
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    
+    hashed_bytes = sum(file.size for file in files if file.digest)
+    print(f"Found {len(files)} checkpoint files ({format_size(sum(f.size for f in files))}); "
+          f"{sum(1 for f in files if f.digest)} share a size and were checked, "
+          f"{hashed} read in {elapsed:.2f}s")
+    if cache is not None:
+        print(f"Hash cache: {cache.hits} reused, {cache.misses} hashed ({format_size(hashed_bytes)} candidates)")
+    if active_runs:
+        print(f"[SKIP] {len(active_runs)} runs changed in the last {args.min_age:g} min: {', '.join(active_runs)}")
+    print()
+    
+    plan = plan_dedup(files, store_dir)
+    savings = plan_savings(plan, store_dir)
+    
+    print("=" * 100)
+    print("DUPLICATE CHECKPOINTS")
+    print("=" * 100)
+    for digest, pending in sorted(plan.items(), key=lambda item: -item[1][0].size * len(item[1])):
+        runs = sorted({file.rel.split('/')[0] for file in pending})
+        print(f"{digest[:12]}  {format_size(pending[0].size):>10s}  x{len(pending):<3} "
+              f"in {len(runs)} runs: {', '.join(runs[:3])}{' ...' if len(runs) > 3 else ''}")
+        if args.verbose:
+            for file in pending:
+                print(f"      {file.rel}")
+    if not plan:
+        print("[OK] No duplicates to link")
+    print()
+    print(f"Reclaimable: {format_size(savings)} across {len(plan)} contents")
+    
+    if plan and args.apply:
+        print()
+        print("=" * 100)
+        print("LINKING DUPLICATES")
+        print("=" * 100)
+        linked = 0
+        for digest, pending in plan.items():
+            count, errors = link_group(digest, pending, store_dir)
+            linked += count
+            for error in errors:
+                print(f"   [FAIL] {error}")
+        # Linked files now carry the store object's mtime; refresh their cache entries
+        if cache is not None:
+            for pending in plan.values():
+                for file in pending:
+                    try:
+                        st = os.stat(file.path)
+                        file.size, file.mtime_ns = st.st_size, st.st_mtime_ns
+                        cache.put(file)
+                    except OSError:
+                        pass
+        print(f"[OK] Linked {linked} files, freed {format_size(savings)}")
+        print()
+        print_store_stats(store_dir)
+    elif plan:
+        print("Tip: Run with --apply to replace duplicates with hardlinks")
+    
+    if cache is not None:
+        cache.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,9 @@ matplotlib.use('PDF')  # Use PDF backend
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 
+from run_archive import list_runs, open_run, run_mtime
+from timers_stream import read_timer_sections
+
 # Path setup
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -40,7 +43,7 @@ def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
         # Parse configuration.yaml
         config_path = run_path / "configuration.yaml"
         if config_path.exists():
-            with open(config_path, 'r') as f:
+            with config_path.open('r') as f:
                 config = yaml.safe_load(f)
                 
             behavior_name = list(config.get('behaviors', {}).keys())[0] if config.get('behaviors') else None
@@ -56,7 +59,7 @@ def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
         # Parse training_status.json
         status_path = run_path / "run_logs" / "training_status.json"
         if status_path.exists():
-            with open(status_path, 'r') as f:
+            with status_path.open('r') as f:
                 status = json.load(f)
                 
             behavior_name = run_data.get('behavior_name', list(status.keys())[0])
@@ -69,8 +72,7 @@ def parse_run_data(run_path: Path) -> Optional[Dict[str, Any]]:
         # Parse timers.json
         timers_path = run_path / "run_logs" / "timers.json"
         if timers_path.exists():
-            with open(timers_path, 'r') as f:
-                timers = json.load(f)
+            timers = read_timer_sections(timers_path)
                 
             metadata = timers.get('metadata', {})
             gauges = timers.get('gauges', {})
@@ -122,11 +124,11 @@ def get_all_runs() -> List[Dict[str, Any]]:
         return []
     
     runs = []
-    for run_dir in sorted(RESULTS_DIR.iterdir()):
-        if run_dir.is_dir():
-            run_data = parse_run_data(run_dir)
-            if run_data:
-                runs.append(run_data)
+    # Run directories and archived run bundles
+    for run_dir in list_runs(RESULTS_DIR):
+        run_data = parse_run_data(run_dir)
+        if run_data:
+            runs.append(run_data)
     
     # Sort by timestamp (newest first) - would need timestamps for this, but for now just return
     return runs
@@ -187,7 +189,7 @@ def plot_action_distribution(run_path: Path, run_id: str, output_path: Path):
         return
     
     try:
-        with open(action_file, 'r') as f:
+        with action_file.open('r') as f:
             data = json.load(f)
     except json.JSONDecodeError as e:
         print(f"  ⚠ Skipping action distribution: Invalid JSON - {e}")
@@ -295,14 +297,16 @@ def plot_roll_usage(run_path: Path, run_id: str, output_path: Path):
     
     data_points = []
     for run in training_runs:
-        run_dir = RESULTS_DIR / run['run_id']
+        run_dir = open_run(RESULTS_DIR, run['run_id'])
+        if run_dir is None:
+            continue
         
         # Try to get style frequency from metadata.json (matching dashboard fallback logic)
         metadata_file = run_dir / "metadata.json"
         style_frequency = None
         if metadata_file.exists():
             try:
-                with open(metadata_file, 'r') as f:
+                with metadata_file.open('r') as f:
                     metadata = json.load(f)
                     style_frequency = metadata.get('styleEpisodeFrequency') or metadata.get('style_episode_frequency')
             except Exception:
@@ -313,7 +317,7 @@ def plot_roll_usage(run_path: Path, run_id: str, output_path: Path):
             config_file = run_dir / "configuration.yaml"
             if config_file.exists():
                 try:
-                    with open(config_file, 'r') as f:
+                    with config_file.open('r') as f:
                         config = yaml.safe_load(f)
                         # Default fallback to 0.4 if not found
                         style_frequency = 0.4
@@ -358,7 +362,7 @@ def plot_episode_length_dist(run_path: Path, run_id: str, output_path: Path):
         print(f"  ⚠ Skipping episode length dist: File not found")
         return
     
-    with open(episode_file, 'r') as f:
+    with episode_file.open('r') as f:
         data = json.load(f)
     
     episodes = data.get('episodes', [])
@@ -423,7 +427,7 @@ def plot_stamina(run_path: Path, run_id: str, output_path: Path):
         return
     
     try:
-        with open(stamina_file, 'r') as f:
+        with stamina_file.open('r') as f:
             data = json.load(f)
     except json.JSONDecodeError as e:
         print(f"  ⚠ Skipping stamina: Invalid JSON - {e}")
@@ -492,7 +496,7 @@ def plot_loss(run_path: Path, run_id: str, output_path: Path):
         return
     
     try:
-        with open(loss_file, 'r') as f:
+        with loss_file.open('r') as f:
             data = json.load(f)
     except json.JSONDecodeError as e:
         print(f"  ⚠ Skipping loss: Invalid JSON - {e}")
@@ -560,7 +564,7 @@ def plot_entropy(run_path: Path, run_id: str, output_path: Path):
         return
     
     try:
-        with open(entropy_file, 'r') as f:
+        with entropy_file.open('r') as f:
             data = json.load(f)
     except json.JSONDecodeError as e:
         print(f"  ⚠ Skipping entropy: Invalid JSON - {e}")
@@ -604,7 +608,7 @@ def plot_distance(run_path: Path, run_id: str, output_path: Path):
         print(f"  ⚠ Skipping distance: File not found")
         return
     
-    with open(episode_file, 'r') as f:
+    with episode_file.open('r') as f:
         data = json.load(f)
     
     episodes = data.get('episodes', [])
@@ -651,7 +655,7 @@ def plot_reward_breakdown(run_path: Path, run_id: str, output_path: Path):
         print(f"  ⚠ Skipping reward breakdown: File not found")
         return
     
-    with open(reward_file, 'r') as f:
+    with reward_file.open('r') as f:
         data = json.load(f)
     
     rewards = data.get('rewards', [])
@@ -731,9 +735,9 @@ def get_training_runs_sorted() -> List[Dict[str, Any]]:
                 pass
         
         # Fallback to directory modification time
-        run_path = RESULTS_DIR / run['run_id']
-        if run_path.exists():
-            return datetime.fromtimestamp(run_path.stat().st_mtime)
+        run_path = open_run(RESULTS_DIR, run['run_id'])
+        if run_path is not None:
+            return datetime.fromtimestamp(run_mtime(run_path))
         return datetime.min
     
     training_runs.sort(key=sort_key)
@@ -801,8 +805,8 @@ def main():
         print(f"\nSelected: {args.run_id}\n")
     
     # Find run directory
-    run_path = RESULTS_DIR / args.run_id
-    if not run_path.exists():
+    run_path = open_run(RESULTS_DIR, args.run_id)
+    if run_path is None:
         print(f"ERROR: Training run not found: {args.run_id}")
         print(f"Available runs in {RESULTS_DIR}:")
         training_runs = get_training_runs_sorted()
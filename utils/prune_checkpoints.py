@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Checkpoint retention: prune intermediate ParkourRunner-<steps>.onnx/.pt files.
+
+ML-Agents keeps every checkpoint listed in training_status.json. This script
+applies declarative retention rules per run, deletes the checkpoints no rule
+keeps, and rewrites training_status.json to list only what is left.
+
+Rules (a checkpoint is kept if ANY rule keeps it):
+- best K       K highest-reward checkpoints
+- latest N     N most recent checkpoints
+- every STEPS  one checkpoint per STEPS milestone (the one closest to it)
+
+Always kept, whatever the rules say:
+- The latest checkpoint of runs that other runs use via --initialize-from
+- Files not listed as checkpoints (checkpoint.pt, the final <behavior>.onnx)
+  and files the final checkpoint points to
+
+Usage:
+    python utils/prune_checkpoints.py                      # Report what would be kept/pruned
+    python utils/prune_checkpoints.py --dry-run            # List every file that would be deleted
+    python utils/prune_checkpoints.py --prune              # Delete (with confirmation)
+    python utils/prune_checkpoints.py --best 3 --every 1000000 --prune -y
+    python utils/prune_checkpoints.py --policy retention.yaml --prune
+"""
+
+import os
+import json
+import time
+import fnmatch
+import yaml
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+# libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+DEFAULT_POLICY = {'best': 3, 'latest': 1, 'every': 0}
+# Runs whose training_status.json changed more recently are assumed to be still training
+DEFAULT_MIN_AGE_MINUTES = 15
+
+
+class RetentionPolicy:
+    """Union of best-k / latest-n / every-N-steps rules."""
+    
+    def __init__(self, best: int = 0, latest: int = 0, every: int = 0):
+        self.best = best
+        self.latest = latest
+        self.every = every
+    
+    @classmethod
+    def from_dict(cls, data: Dict, base: Optional['RetentionPolicy'] = None) -> 'RetentionPolicy':
+        """Build from {'best': K, 'latest': N, 'every': STEPS}; missing keys come from base."""
+        unknown = set(data) - {'best', 'latest', 'every'}
+        if unknown:
+            raise ValueError(f"Unknown retention rule(s): {', '.join(sorted(unknown))}")
+        base = base or cls()
+        return cls(
+            best=int(data.get('best', base.best) or 0),
+            latest=int(data.get('latest', base.latest) or 0),
+            every=int(data.get('every', base.every) or 0),
+        )
+    
+    def describe(self) -> str:
+        rules = []
+        if self.best:
+            rules.append(f"best {self.best}")
+        if self.latest:
+            rules.append(f"latest {self.latest}")
+        if self.every:
+            rules.append(f"every {self.every:,} steps")
+        return ', '.join(rules) or 'keep nothing'
+    
+    def select(self, checkpoints: List[Dict]) -> Dict[int, List[str]]:
+        """
+        Map index in checkpoints -> reasons it is kept.
+        Checkpoints are ML-Agents entries with 'steps' and 'reward'.
+        """
+        reasons: Dict[int, List[str]] = {}
+        
+        def keep(index: int, reason: str):
+            reasons.setdefault(index, []).append(reason)
+        
+        by_steps = sorted(range(len(checkpoints)), key=lambda i: checkpoints[i].get('steps', 0))
+        
+        if self.latest:
+            for index in by_steps[-self.latest:]:
+                keep(index, 'latest')
+        
+        if self.best:
+            # Checkpoints without a reward rank last; later ones win ties
+            ranked = sorted(
+                by_steps,
+                key=lambda i: (checkpoints[i].get('reward') is not None,
+                               checkpoints[i].get('reward') or 0.0, checkpoints[i].get('steps', 0)),
+                reverse=True,
+            )
+            for index in ranked[:self.best]:
+                if checkpoints[index].get('reward') is not None:
+                    keep(index, 'best')
+        
+        if self.every:
+            # Milestone m * every (m >= 1) keeps the checkpoint closest to it
+            closest: Dict[int, int] = {}
+            for index in by_steps:
+                steps = checkpoints[index].get('steps', 0)
+                milestone = (steps + self.every // 2) // self.every
+                if milestone < 1:
+                    continue
+                current = closest.get(milestone)
+                if current is None or (abs(steps - milestone * self.every)
+                                       < abs(checkpoints[current].get('steps', 0) - milestone * self.every)):
+                    closest[milestone] = index
+            for index in closest.values():
+                keep(index, 'every')
+        
+        return reasons
+
+
+def load_policy_file(path: Path, default: RetentionPolicy) -> Tuple[RetentionPolicy, List[Tuple[str, RetentionPolicy]]]:
+    """
+    Read a YAML policy file:
+        
+        default: {best: 3, latest: 1, every: 1000000}
+        runs:
+          "inference_*": {latest: 1, best: 0}
+          "training_20251214_*": {best: 5}
+    
+    Run patterns are fnmatch globs, the first match wins; unspecified rules fall
+    back to the default policy.
+    """
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=YAML_LOADER) or {}
+    default = RetentionPolicy.from_dict(data.get('default', {}), default)
+    overrides = [(pattern, RetentionPolicy.from_dict(rules or {}, default))
+                 for pattern, rules in (data.get('runs') or {}).items()]
+    return default, overrides
+
+
+def policy_for_run(run_name: str, default: RetentionPolicy,
+                   overrides: List[Tuple[str, RetentionPolicy]]) -> RetentionPolicy:
+    for pattern, policy in overrides:
+        if fnmatch.fnmatch(run_name, pattern):
+            return policy
+    return default
+
+
+def resolve_checkpoint_path(file_path: str, run_path: Path) -> Path:
+    """
+    Map a training_status.json path (relative to the trainer's working directory,
+    possibly with Windows separators, e.g. results\\<run>\\ParkourRunner\\x.onnx)
+    to a path inside run_path.
+    """
+    parts = file_path.replace('\\', '/').split('/')
+    if run_path.name in parts:
+        return run_path.joinpath(*parts[parts.index(run_path.name) + 1:])
+    path = Path(*parts)
+    return path if path.is_absolute() else run_path.parent.parent / path
+
+
+def initialize_from_references(run_dirs: List[Path]) -> Dict[str, List[str]]:
+    """Run id -> runs whose configuration.yaml initializes from it."""
+    references: Dict[str, List[str]] = {}
+    for run_dir in run_dirs:
+        try:
+            with open(run_dir / 'configuration.yaml', 'r') as f:
+                config = yaml.load(f, Loader=YAML_LOADER) or {}
+        except (OSError, yaml.YAMLError):
+            continue
+        source = (config.get('checkpoint_settings') or {}).get('initialize_from')
+        if source:
+            references.setdefault(str(source), []).append(run_dir.name)
+    return references
+
+
+def _reclaimable_size(path: Path) -> Optional[int]:
+    """Bytes freed by deleting path: 0 for hardlinked files (see dedup_checkpoints.py)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size if st.st_nlink == 1 else 0
+
+
+class RunRetention:
+    """Retention plan for one run: which checkpoints are kept, which files go."""
+    
+    def __init__(self, run_path: Path, policy: RetentionPolicy, referenced_by: List[str]):
+        self.path = run_path
+        self.name = run_path.name
+        self.policy = policy
+        self.referenced_by = referenced_by
+        self.status_path = run_path / 'run_logs' / 'training_status.json'
+        self.status: Optional[Dict] = None
+        self.kept: List[Tuple[str, Dict, List[str]]] = []     # (behavior, checkpoint, reasons)
+        self.pruned: List[Tuple[str, Dict]] = []              # (behavior, checkpoint)
+        self.delete_files: List[Path] = []
+        self.reclaim_bytes = 0
+        self.missing_files = 0
+        self.skip_reason: Optional[str] = None
+    
+    def plan(self, min_age_seconds: float = 0):
+        """Decide what to keep. Sets skip_reason if the run can't be pruned."""
+        try:
+            age = time.time() - os.stat(self.status_path).st_mtime
+            with open(self.status_path, 'r') as f:
+                self.status = json.load(f)
+        except (OSError, ValueError) as e:
+            self.skip_reason = f"unreadable training_status.json ({e.__class__.__name__})"
+            return
+        if age < min_age_seconds:
+            self.skip_reason = f"training_status.json changed {age / 60:.0f} min ago (still training?)"
+            return
+        
+        protected: Set[Path] = set()
+        for behavior, data in self._behaviors():
+            final = data.get('final_checkpoint') or {}
+            for file_path in [final.get('file_path')] + list(final.get('auxillary_file_paths') or []):
+                if file_path:
+                    protected.add(resolve_checkpoint_path(file_path, self.path))
+        
+        for behavior, data in self._behaviors():
+            checkpoints = data.get('checkpoints') or []
+            reasons = self.policy.select(checkpoints)
+            if self.referenced_by and checkpoints:
+                latest = max(range(len(checkpoints)), key=lambda i: checkpoints[i].get('steps', 0))
+                reasons.setdefault(latest, []).append('initialize-from')
+            
+            for index, checkpoint in enumerate(checkpoints):
+                if index in reasons:
+                    self.kept.append((behavior, checkpoint, reasons[index]))
+                    continue
+                self.pruned.append((behavior, checkpoint))
+                for path in self._checkpoint_files(checkpoint):
+                    if path in protected:
+                        continue
+                    size = _reclaimable_size(path)
+                    if size is None:
+                        self.missing_files += 1
+                        continue
+                    self.delete_files.append(path)
+                    self.reclaim_bytes += size
+    
+    def _behaviors(self):
+        """(behavior name, status entry) pairs; skips the 'metadata' block."""
+        for name, data in (self.status or {}).items():
+            if isinstance(data, dict) and 'checkpoints' in data:
+                yield name, data
+    
+    def _checkpoint_files(self, checkpoint: Dict) -> List[Path]:
+        file_paths = [checkpoint.get('file_path')] + list(checkpoint.get('auxillary_file_paths') or [])
+        return [resolve_checkpoint_path(p, self.path) for p in file_paths if p]
+    
+    def rewrite_status(self):
+        """Drop pruned checkpoints from training_status.json (atomic replace)."""
+        pruned_ids = {id(checkpoint) for _, checkpoint in self.pruned}
+        for _, data in self._behaviors():
+            data['checkpoints'] = [c for c in data['checkpoints'] if id(c) not in pruned_ids]
+        tmp_path = self.status_path.with_name(self.status_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.status, f, indent=4)
+        os.replace(tmp_path, self.status_path)
+
+
+def format_size(bytes_size: float) -> str:
+    """Format bytes to human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes_size < 1024.0:
+            return f"{bytes_size:.1f}{unit}"
+        bytes_size /= 1024.0
+    return f"{bytes_size:.1f}TB"
+
+
+def plan_results(results_dir: Path, default: RetentionPolicy,
+                 overrides: List[Tuple[str, RetentionPolicy]],
+                 min_age_seconds: float, run_filter: Optional[List[str]] = None) -> List[RunRetention]:
+    with os.scandir(results_dir) as entries:
+        run_dirs = sorted(Path(entry.path) for entry in entries if entry.is_dir())
+    references = initialize_from_references(run_dirs)
+    
+    plans = []
+    for run_dir in run_dirs:
+        if run_filter and run_dir.name not in run_filter:
+            continue
+        if not (run_dir / 'run_logs' / 'training_status.json').exists():
+            continue
+        plan = RunRetention(run_dir, policy_for_run(run_dir.name, default, overrides),
+                            references.get(run_dir.name, []))
+        plan.plan(min_age_seconds)
+        plans.append(plan)
+    return plans
+
+
+def print_plan(plans: List[RunRetention], verbose: bool):
+    print("=" * 100)
+    print("CHECKPOINT RETENTION PLAN")
+    print("=" * 100)
+    for plan in plans:
+        if plan.skip_reason:
+            print(f"[SKIP] {plan.name:50s} {plan.skip_reason}")
+            continue
+        if not plan.kept and not plan.pruned:
+            continue
+        status = "[PRUNE]" if plan.pruned else "[OK]   "
+        print(f"{status} {plan.name:50s} keep {len(plan.kept):>3}  prune {len(plan.pruned):>3}  "
+              f"reclaim {format_size(plan.reclaim_bytes):>9s}  ({plan.policy.describe()})")
+        if plan.referenced_by:
+            print(f"      initialize-from source for: {', '.join(plan.referenced_by)}")
+        if verbose:
+            for behavior, checkpoint, reasons in plan.kept:
+                print(f"      keep  {behavior}-{checkpoint.get('steps')}  reward {_reward_str(checkpoint)}  "
+                      f"[{', '.join(reasons)}]")
+            for behavior, checkpoint in plan.pruned:
+                print(f"      prune {behavior}-{checkpoint.get('steps')}  reward {_reward_str(checkpoint)}")
+            for path in plan.delete_files:
+                print(f"         Would delete: {path}")
+    print()
+
+
+def _reward_str(checkpoint: Dict) -> str:
+    reward = checkpoint.get('reward')
+    return f"{reward:.2f}" if reward is not None else "N/A"
+
+
+def _remove(path: Path) -> Optional[str]:
+    try:
+        os.remove(path)
+        return None
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        return str(e)
+
+
+def apply_plans(plans: List[RunRetention], workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Delete pruned files (in parallel) and rewrite each run's training_status.json.
+    A run's status file is only rewritten if all of its deletions succeeded.
+    Returns (files deleted, bytes reclaimed).
+    """
+    todo = [plan for plan in plans if not plan.skip_reason and plan.pruned]
+    paths = [path for plan in todo for path in plan.delete_files]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        errors = dict(zip(paths, executor.map(_remove, paths)))
+    
+    deleted = 0
+    reclaimed = 0
+    for plan in todo:
+        failed = [(path, errors[path]) for path in plan.delete_files if errors[path]]
+        deleted += len(plan.delete_files) - len(failed)
+        reclaimed += plan.reclaim_bytes - sum(_reclaimable_size(path) or 0 for path, _ in failed)
+        if failed:
+            for path, error in failed:
+                print(f"   [FAIL] Could not delete {path}: {error}")
+            print(f"   [WARN] {plan.name}: training_status.json left unchanged")
+            continue
+        try:
+            plan.rewrite_status()
+            print(f"   [OK] {plan.name:50s} pruned {len(plan.pruned)} checkpoints ({format_size(plan.reclaim_bytes)})")
+        except OSError as e:
+            print(f"   [FAIL] {plan.name}: could not rewrite training_status.json: {e}")
+    return deleted, reclaimed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prune intermediate checkpoints per run with best-k / latest / every-N retention rules.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/prune_checkpoints.py                              # Report (default: best 3 + latest 1)
+  python utils/prune_checkpoints.py --dry-run                    # Per-checkpoint decisions and files
+  python utils/prune_checkpoints.py --best 2 --every 1000000 --prune
+  python utils/prune_checkpoints.py --policy retention.yaml --prune --yes
+  python utils/prune_checkpoints.py --run training_20251214_194855 --latest 2 --best 0 --prune
+        """
+    )
+    parser.add_argument('--best', type=int, default=None,
+                        help=f"Keep the K highest-reward checkpoints (default: {DEFAULT_POLICY['best']})")
+    parser.add_argument('--latest', type=int, default=None,
+                        help=f"Keep the N most recent checkpoints (default: {DEFAULT_POLICY['latest']})")
+    parser.add_argument('--every', type=int, default=None,
+                        help='Keep the checkpoint closest to every multiple of STEPS (default: off)')
+    parser.add_argument('--policy', type=str, default=None,
+                        help='YAML file with a default policy and per-run (glob) overrides')
+    parser.add_argument('--run', action='append', default=None,
+                        help='Only these runs (repeatable)')
+    parser.add_argument('--prune', action='store_true', help='Delete pruned checkpoints')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show every keep/prune decision and file without deleting')
+    parser.add_argument('--yes', '-y', action='store_true', help='Skip confirmation prompt')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parallel deletions (default: thread pool default)')
+    parser.add_argument('--min-age', type=float, default=DEFAULT_MIN_AGE_MINUTES,
+                        help=f'Skip runs whose training_status.json changed in the last N minutes '
+                             f'(default: {DEFAULT_MIN_AGE_MINUTES})')
+    parser.add_argument('--results-dir', type=str, default=None,
+                        help='Path to results directory (default: src/results relative to project root)')
+    
+    args = parser.parse_args()
+    
+    project_root = Path(__file__).parent.parent
+    if args.results_dir is None:
+        results_dir = project_root / 'src' / 'results'
+    else:
+        results_dir = Path(args.results_dir)
+        if not results_dir.is_absolute():
+            results_dir = project_root / results_dir
+    if not results_dir.exists():
+        print(f"[ERROR] Results directory not found: {results_dir}")
+        return
+    
+    cli_rules = {key: value for key, value in
+                 (('best', args.best), ('latest', args.latest), ('every', args.every)) if value is not None}
+    default = RetentionPolicy.from_dict(DEFAULT_POLICY)
+    overrides: List[Tuple[str, RetentionPolicy]] = []
+    if args.policy:
+        try:
+            default, overrides = load_policy_file(Path(args.policy), default)
+        except (OSError, yaml.YAMLError, ValueError, TypeError) as e:
+            print(f"[ERROR] Invalid policy file {args.policy}: {e}")
+            return
+    # Command line rules override the policy file default
+    default = RetentionPolicy.from_dict(cli_rules, default)
+    
+    plans = plan_results(results_dir, default, overrides, args.min_age * 60, args.run)
+    print_plan(plans, verbose=args.dry_run)
+    
+    active = [plan for plan in plans if not plan.skip_reason]
+    to_prune = [plan for plan in active if plan.pruned]
+    total_files = sum(len(plan.delete_files) for plan in to_prune)
+    total_bytes = sum(plan.reclaim_bytes for plan in to_prune)
+    total_missing = sum(plan.missing_files for plan in to_prune)
+    print(f"Default policy: {default.describe()}")
+    print(f"Runs: {len(plans)} with checkpoints, {len(to_prune)} to prune, "
+          f"{len(plans) - len(active)} skipped")
+    print(f"Checkpoints: {sum(len(p.kept) for p in active)} kept, {sum(len(p.pruned) for p in active)} pruned")
+    print(f"Reclaimable: {format_size(total_bytes)} in {total_files} files"
+          + (f" ({total_missing} listed files already missing)" if total_missing else ""))
+    print()
+    
+    if not to_prune:
+        print("[OK] Nothing to prune")
+        return
+    if not args.prune or args.dry_run:
+        print("Tip: Run with --prune to delete, or --dry-run to see every file")
+        return
+    
+    if not args.yes:
+        response = input(f"\n[WARNING] Prune {sum(len(p.pruned) for p in to_prune)} checkpoints "
+                         f"from {len(to_prune)} runs? [y/N]: ")
+        if response.lower() != 'y':
+            print("[CANCEL] Pruning cancelled")
+            return
+    
+    print("=" * 100)
+    print("PRUNING CHECKPOINTS")
+    print("=" * 100)
+    start = time.perf_counter()
+    deleted, reclaimed = apply_plans(to_prune, workers=args.workers)
+    print()
+    print(f"[OK] Deleted {deleted} files in {time.perf_counter() - start:.2f}s, "
+          f"freed {format_size(reclaimed)} of disk space")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Offline counterfactual reward recomputation over logged episodes.
+
+Every reward term in ParkourAgent.OnActionReceived is a CharacterConfig weight
+times an event count (meters of progress, rolling steps, low-stamina steps,
+decisions, falls...). Dividing each logged component in reward_components.json
+by the weight it was trained with recovers those counts. Re-weighting them is
+then one matrix product, so hundreds of candidate weightings can be screened
+over every logged episode in one batch, without retraining.
+
+The low-stamina threshold (hardcoded 0.2 in ParkourAgent) can also be varied:
+the penalty step counts are re-estimated from the stamina samples of
+stamina_trajectories.json, pooled per run.
+
+Outcomes come from each reward entry itself (targetReachReward > 0: success,
+fallPenalty < 0: failure). episodeNumber counts per agent, so with several
+agents it doesn't identify an episode and the other logs can't be joined on it.
+
+Note: this answers "how would these exact episodes have been scored?", not
+"what would a policy trained on these weights do". Use it to discard weightings
+that don't separate good episodes from bad ones before spending training time.
+
+Usage:
+    python utils/reward_counterfactual.py training_20251214_194855 --grid timePenalty=-0.001,-0.005,-0.01
+    python utils/reward_counterfactual.py training_20251214_194855 --weights-file candidates.json
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Path setup
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+RESULTS_DIR = PROJECT_ROOT / "src" / "results"
+
+# reward_components.json key -> CharacterConfig weight that scales it
+COMPONENT_WEIGHTS = [
+    ('progressReward', 'progressRewardMultiplier'),
+    ('rollBaseReward', 'rollBaseReward'),
+    ('rollStyleBonus', 'rollStyleBonus'),
+    ('targetReachReward', 'targetReachReward'),
+    ('groundedReward', 'groundedReward'),
+    ('lowStaminaPenalty', 'lowStaminaPenalty'),
+    ('timePenalty', 'timePenalty'),
+    ('fallPenalty', 'fallPenalty'),
+]
+COMPONENTS = [component for component, _ in COMPONENT_WEIGHTS]
+WEIGHT_NAMES = [weight for _, weight in COMPONENT_WEIGHTS]
+
+# CharacterConfig.cs defaults (groundedReward is hardcoded in ParkourAgent.cs)
+DEFAULT_WEIGHTS = {
+    'progressRewardMultiplier': 0.1,
+    'rollBaseReward': 0.5,
+    'rollStyleBonus': 1.5,
+    'targetReachReward': 10.0,
+    'groundedReward': 0.001,
+    'lowStaminaPenalty': -0.002,
+    'timePenalty': -0.001,
+    'fallPenalty': -1.0,
+}
+
+# ParkourAgent: normalizedStamina < 0.2f
+DEFAULT_LOW_STAMINA_THRESHOLD = 0.2
+DEFAULT_MAX_STAMINA = 100.0
+
+THRESHOLD_KEY = 'lowStaminaThreshold'
+
+
+class EpisodeLog:
+    """Logged episodes of one or more runs as dense arrays."""
+    
+    def __init__(self):
+        self.run_ids: List[str] = []
+        self.components = np.zeros((0, len(COMPONENTS)))
+        self.success = np.zeros(0, dtype=bool)
+        self.has_outcome = np.zeros(0, dtype=bool)
+        # Index into run_ids of each episode
+        self.run_index = np.zeros(0, dtype=np.int64)
+        # Normalized stamina samples of each run (all episodes and agents pooled)
+        self.stamina: List[np.ndarray] = []
+    
+    def __len__(self) -> int:
+        return len(self.components)
+
+
+def _load_json(path: Path, key: str) -> List[Dict]:
+    if not path.exists():
+        return []
+    with open(path, 'r') as f:
+        return json.load(f).get(key) or []
+
+
+def load_run(run_path: Path, log: EpisodeLog, max_stamina: float):
+    """Append a run's reward_components.json (+ pooled stamina samples) to `log`."""
+    run_logs = run_path / "run_logs"
+    rewards = _load_json(run_logs / "reward_components.json", 'rewards')
+    if not rewards:
+        print(f"  ⚠ {run_path.name}: no reward_components.json entries, skipping")
+        return
+    
+    components = np.array([[entry.get(name, 0.0) for name in COMPONENTS] for entry in rewards], dtype=np.float64)
+    
+    # Outcome of each entry from its own terms: the episode ends on the target or on a fall
+    reached = components[:, COMPONENTS.index('targetReachReward')] > 0
+    fell = components[:, COMPONENTS.index('fallPenalty')] < 0
+    ambiguous = int((reached & fell).sum())
+    if ambiguous:
+        raise ValueError(f"{run_path.name}: {ambiguous} reward entries have both targetReachReward "
+                         f"and fallPenalty; cannot tell success from failure")
+    
+    trajectories = _load_json(run_logs / "stamina_trajectories.json", 'trajectories')
+    samples = [p.get('stamina', 0.0) for entry in trajectories for p in entry.get('dataPoints') or []]
+    
+    log.run_index = np.concatenate([log.run_index, np.full(len(rewards), len(log.run_ids))])
+    log.run_ids.append(run_path.name)
+    log.components = np.vstack([log.components, components])
+    log.success = np.concatenate([log.success, reached])
+    log.has_outcome = np.concatenate([log.has_outcome, reached | fell])
+    log.stamina.append(np.asarray(samples, dtype=np.float64) / max_stamina)
+    print(f"  ✓ {run_path.name}: {len(rewards):,} episodes "
+          f"({int(reached.sum()):,} reached the target, {int(fell.sum()):,} fell, "
+          f"{len(samples):,} stamina samples)")
+
+
+def event_counts(log: EpisodeLog, base_weights: Dict[str, float]) -> np.ndarray:
+    """Per-episode event counts: logged component / weight it was logged with."""
+    base = np.array([base_weights[name] for name in WEIGHT_NAMES], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        counts = np.where(base != 0.0, log.components / base, 0.0)
+    return counts
+
+
+def low_stamina_shift(log: EpisodeLog, thresholds: np.ndarray, base_threshold: float) -> np.ndarray:
+    """
+    Change in the fraction of steps spent below each threshold, relative to the
+    base threshold, estimated from each run's pooled stamina samples.
+    Shape (episodes, thresholds); 0 for runs without samples.
+    """
+    shift = np.zeros((len(log.run_ids), len(thresholds)))
+    for i, samples in enumerate(log.stamina):
+        if len(samples):
+            below = (samples[:, None] < thresholds[None, :]).mean(axis=0)
+            shift[i] = below - (samples < base_threshold).mean()
+    return shift[log.run_index]
+
+
+def recompute_returns(log: EpisodeLog, counts: np.ndarray, candidates: List[Dict],
+                      base_threshold: float) -> np.ndarray:
+    """
+    Episode returns under every candidate weight set, shape (episodes, candidates).
+    
+    Each candidate is a dict of weight overrides (WEIGHT_NAMES plus optional
+    lowStaminaThreshold); unspecified weights keep their base values.
+    """
+    weights = np.array([[candidate['weights'][name] for name in WEIGHT_NAMES] for candidate in candidates])
+    returns = counts @ weights.T
+    
+    thresholds = np.array([candidate['weights'].get(THRESHOLD_KEY, base_threshold) for candidate in candidates])
+    changed = thresholds != base_threshold
+    if changed.any():
+        low_index = WEIGHT_NAMES.index('lowStaminaPenalty')
+        # timePenalty is applied every step, so its count is the episode length in steps
+        steps = counts[:, WEIGHT_NAMES.index('timePenalty'), None]
+        shift = low_stamina_shift(log, thresholds[changed], base_threshold)
+        low_counts = np.clip(counts[:, low_index, None] + steps * shift, 0.0, steps)
+        delta = (low_counts - counts[:, low_index, None]) * weights[changed, low_index][None, :]
+        returns[:, changed] += delta
+    return returns
+
+
+def summarize(log: EpisodeLog, returns: np.ndarray, baseline: np.ndarray) -> List[Dict]:
+    """Screening statistics for each candidate column of `returns`."""
+    stats = []
+    labelled = log.has_outcome
+    success = log.success & labelled
+    failure = ~log.success & labelled
+    baseline_ranks = _ranks(baseline)
+    
+    for j in range(returns.shape[1]):
+        column = returns[:, j]
+        entry = {
+            'mean': float(column.mean()),
+            'std': float(column.std()),
+            'median': float(np.median(column)),
+            'success_mean': float(column[success].mean()) if success.any() else None,
+            'failure_mean': float(column[failure].mean()) if failure.any() else None,
+            'separation': None,
+            'rank_correlation': float(np.corrcoef(baseline_ranks, _ranks(column))[0, 1]) if len(column) > 1 else None,
+        }
+        if success.any() and failure.any():
+            pooled = np.sqrt((column[success].var() + column[failure].var()) / 2.0)
+            # Cohen's d: how strongly the weighting ranks successful episodes above failed ones
+            entry['separation'] = float((column[success].mean() - column[failure].mean()) / pooled) if pooled > 0 else None
+        stats.append(entry)
+    return stats
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(values))
+    ranks[np.argsort(values, kind='stable')] = np.arange(len(values))
+    return ranks
+
+
+def parse_assignment(text: str) -> Tuple[str, List[float]]:
+    """'timePenalty=-0.001,-0.005' -> ('timePenalty', [-0.001, -0.005])."""
+    if '=' not in text:
+        raise ValueError(f"Expected NAME=VALUE[,VALUE...], got '{text}'")
+    name, values = text.split('=', 1)
+    name = name.strip()
+    if name not in WEIGHT_NAMES and name != THRESHOLD_KEY:
+        raise ValueError(f"Unknown weight '{name}' (choose from {', '.join(WEIGHT_NAMES + [THRESHOLD_KEY])})")
+    return name, [float(v) for v in values.split(',') if v.strip()]
+
+
+def build_candidates(base_weights: Dict[str, float], base_threshold: float, sets: List[str],
+                     grids: List[str], weights_file: Optional[str]) -> List[Dict]:
+    """Baseline + named --set candidates + --grid cartesian product + weights file entries."""
+    base = dict(base_weights)
+    base[THRESHOLD_KEY] = base_threshold
+    candidates = [{'name': 'baseline', 'weights': dict(base)}]
+    
+    for spec in sets:
+        name, _, assignments = spec.partition(':')
+        if not assignments:
+            name, assignments = f"set_{len(candidates)}", spec
+        weights = dict(base)
+        for assignment in assignments.split(';'):
+            key, values = parse_assignment(assignment)
+            weights[key] = values[0]
+        candidates.append({'name': name, 'weights': weights})
+    
+    if grids:
+        axes = [parse_assignment(grid) for grid in grids]
+        for combo in itertools.product(*[values for _, values in axes]):
+            weights = dict(base)
+            parts = []
+            for (key, _), value in zip(axes, combo):
+                weights[key] = value
+                parts.append(f"{key}={value:g}")
+            candidates.append({'name': ' '.join(parts), 'weights': weights, 'grid': True})
+    
+    if weights_file:
+        with open(weights_file, 'r') as f:
+            entries = json.load(f)
+        for i, entry in enumerate(entries):
+            weights = dict(base)
+            for key, value in entry.get('weights', {}).items():
+                if key not in weights:
+                    raise ValueError(f"Unknown weight '{key}' in {weights_file}")
+                weights[key] = float(value)
+            candidates.append({'name': entry.get('name', f"file_{i}"), 'weights': weights})
+    
+    return candidates
+
+
+def candidate_label(candidate: Dict, baseline: Dict) -> str:
+    """
+    Name of a named candidate; for grid candidates (whose names list every axis,
+    so they share long prefixes) only the weights that differ from the baseline.
+    """
+    if not candidate.get('grid'):
+        return candidate['name']
+    changed = [f"{key}={value:g}" for key, value in candidate['weights'].items()
+               if value != baseline['weights'].get(key)]
+    return ' '.join(changed) or '(baseline weights)'
+
+
+def print_report(candidates: List[Dict], stats: List[Dict], sort_key: str, top: int):
+    """Print candidates sorted by a screening statistic."""
+    order = list(range(len(candidates)))
+    if sort_key != 'none':
+        order.sort(key=lambda i: (stats[i][sort_key] is None, -(stats[i][sort_key] or 0.0)))
+    
+    def fmt(value, width=10):
+        return f"{value:>{width}.3f}" if value is not None else f"{'-':>{width}}"
+    
+    labels = {i: candidate_label(candidates[i], candidates[0]) for i in order[:top]}
+    # Labels are never cut: rows of a grid would become indistinguishable
+    width = max([len(label) for label in labels.values()] + [40])
+    print("=" * (width + 66))
+    print(f"{'#':>5} {'Candidate':<{width}} {'Mean':>10} {'Std':>10} {'Success':>10} {'Failed':>10} "
+          f"{'Separation':>10} {'RankCorr':>8}")
+    print("-" * (width + 66))
+    for i in order[:top]:
+        s = stats[i]
+        print(f"{i:>5} {labels[i]:<{width}} {fmt(s['mean'])} {fmt(s['std'])} {fmt(s['success_mean'])} "
+              f"{fmt(s['failure_mean'])} {fmt(s['separation'])} {fmt(s['rank_correlation'], 8)}")
+    if len(order) > top:
+        print(f"... {len(order) - top} more (use --top)")
+    print("#: candidate index (the 'index' column of --output)")
+
+
+def write_output(path: Path, candidates: List[Dict], stats: List[Dict]):
+    """Write candidates and their statistics as CSV or JSON (by extension)."""
+    rows = []
+    for index, (candidate, s) in enumerate(zip(candidates, stats)):
+        rows.append({'index': index, 'name': candidate['name'], **candidate['weights'], **s})
+    if path.suffix == '.csv':
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+    print(f"✓ Wrote {len(rows)} candidates to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Screen alternative reward weights against logged episodes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Sweep time penalty x style bonus (9 candidates)
+  python utils/reward_counterfactual.py training_20251214_194855 \\
+      --grid timePenalty=-0.001,-0.005,-0.01 --grid rollStyleBonus=0,1.5,3
+  
+  # Named candidates (';' separates weights in one set)
+  python utils/reward_counterfactual.py training_20251214_194855 \\
+      --set "progress_x2:progressRewardMultiplier=0.2" \\
+      --set "harsh_stamina:lowStaminaPenalty=-0.01;lowStaminaThreshold=0.3"
+  
+  # Candidates from a file: [{"name": "...", "weights": {"timePenalty": -0.002}}, ...]
+  python utils/reward_counterfactual.py training_20251214_194855 --weights-file candidates.json --output results.csv
+
+Weights: progressRewardMultiplier, rollBaseReward, rollStyleBonus, targetReachReward,
+         groundedReward, lowStaminaPenalty, timePenalty, fallPenalty, lowStaminaThreshold
+        """
+    )
+    parser.add_argument('run_ids', nargs='+', help='Run directories (names under --results-dir) to pool')
+    parser.add_argument('--results-dir', type=str, default=str(RESULTS_DIR),
+                        help='Path to results directory (default: src/results)')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME:W=V;W=V',
+                        help='Named candidate weight set (repeatable)')
+    parser.add_argument('--grid', action='append', default=[], metavar='W=V1,V2,...',
+                        help='Grid axis; all axes are combined (repeatable)')
+    parser.add_argument('--weights-file', type=str, default=None, help='JSON list of candidate weight sets')
+    parser.add_argument('--base-weights', type=str, default=None,
+                        help='JSON file with the weights the runs were trained with (default: CharacterConfig defaults)')
+    parser.add_argument('--max-stamina', type=float, default=DEFAULT_MAX_STAMINA,
+                        help=f'CharacterConfig.maxStamina of the runs (default: {DEFAULT_MAX_STAMINA:g})')
+    parser.add_argument('--sort', choices=['separation', 'mean', 'rank_correlation', 'none'], default='separation',
+                        help='Statistic to rank candidates by (default: separation)')
+    parser.add_argument('--top', type=int, default=30, help='Candidates to print (default: 30)')
+    parser.add_argument('--output', type=str, default=None, help='Write all candidates to .csv or .json')
+    
+    args = parser.parse_args()
+    
+    base_weights = dict(DEFAULT_WEIGHTS)
+    base_threshold = DEFAULT_LOW_STAMINA_THRESHOLD
+    if args.base_weights:
+        with open(args.base_weights, 'r') as f:
+            overrides = json.load(f)
+        base_threshold = float(overrides.pop(THRESHOLD_KEY, base_threshold))
+        unknown = set(overrides) - set(base_weights)
+        if unknown:
+            print(f"[FAIL] Unknown base weights: {', '.join(sorted(unknown))}")
+            sys.exit(1)
+        base_weights.update({k: float(v) for k, v in overrides.items()})
+    
+    try:
+        candidates = build_candidates(base_weights, base_threshold, args.set, args.grid, args.weights_file)
+    except ValueError as e:
+        print(f"[FAIL] {e}")
+        sys.exit(1)
+    
+    print("Loading logged episodes...")
+    results_dir = Path(args.results_dir)
+    log = EpisodeLog()
+    for run_id in args.run_ids:
+        run_path = results_dir / run_id
+        if not run_path.exists():
+            print(f"  ⚠ {run_id}: not found in {results_dir}")
+            continue
+        try:
+            load_run(run_path, log, args.max_stamina)
+        except ValueError as e:
+            print(f"[FAIL] {e}")
+            sys.exit(1)
+    
+    if len(log) == 0:
+        print("[FAIL] No logged episodes found (runs need reward_components.json from TrainingLogger)")
+        sys.exit(1)
+    
+    if not any(len(samples) for samples in log.stamina) and any(
+            c['weights'][THRESHOLD_KEY] != base_threshold for c in candidates):
+        print(f"  ⚠ No stamina trajectories: {THRESHOLD_KEY} changes will have no effect")
+    
+    counts = event_counts(log, base_weights)
+    returns = recompute_returns(log, counts, candidates, base_threshold)
+    stats = summarize(log, returns, returns[:, 0])
+    
+    print()
+    print(f"Screened {len(candidates):,} weight sets over {len(log):,} episodes "
+          f"({int(log.has_outcome.sum()):,} with success/failure outcomes)")
+    print_report(candidates, stats, args.sort, args.top)
+    
+    if args.output:
+        write_output(Path(args.output), candidates, stats)
+
+
+if __name__ == "__main__":
+    main()
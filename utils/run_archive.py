@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Archive cold runs into single-file bundles, and read runs from either form.
+
+An old run is a directory of many small files. `archive` packs runs that have
+been inactive for a while into one compressed zip per run
+(src/results/<run_id>.run.zip), holding:
+- <run_id>/...   every file of the run (JSON/YAML deflated, checkpoints stored)
+- bundle.json    manifest: run id, archive time, file list with sizes/mtimes
+
+The zip central directory is the member index, so a reader opens a bundle once
+and then seeks straight to one member (e.g. run_logs/timers.json) without
+unpacking anything else.
+
+Readers (dashboard, generate_latex_figures.py) call open_run(), which returns a
+pathlib.Path for a run directory or a zipfile.Path for a bundle. Both support
+`/`, .exists(), .open('r') and .name, so the same code reads both.
+
+Usage:
+    python utils/run_archive.py list                                 # Directories and bundles
+    python utils/run_archive.py archive --older-than 30              # Pack runs idle for 30+ days
+    python utils/run_archive.py archive --run training_20251127_075636 --dry-run
+    python utils/run_archive.py restore training_20251127_075636     # Unpack on demand
+"""
+
+import os
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+ARCHIVE_SUFFIX = '.run.zip'
+MANIFEST_NAME = 'bundle.json'
+BUNDLE_VERSION = 1
+# Already-dense binaries: deflating them costs time for a few percent
+STORED_SUFFIXES = ('.onnx', '.pt', '.zip', '.npy')
+DEFAULT_INACTIVE_DAYS = 30
+
+RunRoot = Union[Path, zipfile.Path]
+
+_bundle_cache: Dict[str, Tuple[Tuple[int, int], zipfile.ZipFile]] = {}
+_bundle_lock = threading.Lock()
+
+
+def bundle_path(results_dir: Path, run_id: str) -> Path:
+    return results_dir / f"{run_id}{ARCHIVE_SUFFIX}"
+
+
+def open_bundle(path: Path) -> zipfile.ZipFile:
+    """
+    Open a bundle, reusing the ZipFile (and its parsed central directory) while
+    the file keeps the same mtime and size.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _bundle_lock:
+        cached = _bundle_cache.get(str(path))
+        if cached and cached[0] == key:
+            return cached[1]
+        bundle = zipfile.ZipFile(path, 'r')
+        if cached:
+            cached[1].close()
+        _bundle_cache[str(path)] = (key, bundle)
+        return bundle
+
+
+def _close_bundle(path: Path):
+    with _bundle_lock:
+        cached = _bundle_cache.pop(str(path), None)
+    if cached:
+        cached[1].close()
+
+
+def open_run(results_dir: Path, run_id: str) -> Optional[RunRoot]:
+    """Root of a run: its directory if present, else its bundle, else None."""
+    if not run_id or '/' in run_id or '\\' in run_id or run_id.startswith('.'):
+        return None
+    run_dir = results_dir / run_id
+    if run_dir.is_dir():
+        return run_dir
+    archive = bundle_path(results_dir, run_id)
+    if archive.is_file():
+        try:
+            return zipfile.Path(open_bundle(archive), at=f"{run_id}/")
+        except (OSError, zipfile.BadZipFile):
+            return None
+    return None
+
+
+def list_runs(results_dir: Path) -> List[RunRoot]:
+    """All runs (directories and bundles), sorted by run id."""
+    if not results_dir.exists():
+        return []
+    run_ids = set()
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                run_ids.add(entry.name)
+            elif entry.name.endswith(ARCHIVE_SUFFIX):
+                run_ids.add(entry.name[:-len(ARCHIVE_SUFFIX)])
+    runs = []
+    for run_id in sorted(run_ids):
+        root = open_run(results_dir, run_id)
+        if root is not None:
+            runs.append(root)
+    return runs
+
+
+def is_archived(run_root: RunRoot) -> bool:
+    return isinstance(run_root, zipfile.Path)
+
+
+def run_mtime(run_root: RunRoot) -> float:
+    """Modification time of a run directory, or the archive time of a bundle."""
+    if is_archived(run_root):
+        try:
+            manifest = json.loads(run_root.root.read(MANIFEST_NAME))
+            return float(manifest['source_mtime'])
+        except (KeyError, ValueError):
+            return os.stat(run_root.root.filename).st_mtime
+    return run_root.stat().st_mtime
+
+
+def _walk_files(run_dir: Path) -> List[Tuple[str, os.stat_result]]:
+    """(posix relative path, stat) for every file under run_dir."""
+    files = []
+    stack = [str(run_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    rel = Path(entry.path).relative_to(run_dir).as_posix()
+                    files.append((rel, entry.stat(follow_symlinks=False)))
+    return sorted(files)
+
+
+def last_activity(run_dir: Path) -> float:
+    """Newest mtime of any file in the run (the directory's own mtime if empty)."""
+    files = _walk_files(run_dir)
+    return max((st.st_mtime for _, st in files), default=run_dir.stat().st_mtime)
+
+
+def archive_run(run_dir: Path, compresslevel: int = 6, remove: bool = True) -> Tuple[int, int]:
+    """
+    Pack run_dir into <results>/<run_id>.run.zip, verify it, then delete run_dir.
+    Returns (original bytes, bundle bytes).
+    """
+    run_id = run_dir.name
+    archive = bundle_path(run_dir.parent, run_id)
+    files = _walk_files(run_dir)
+    tmp_path = archive.with_name(archive.name + '.tmp')
+    
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'run_id': run_id,
+        'archived_at': time.time(),
+        'source_mtime': run_dir.stat().st_mtime,
+        'files': [{'path': rel, 'size': st.st_size, 'mtime': st.st_mtime} for rel, st in files],
+    }
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                             compresslevel=compresslevel, allowZip64=True) as bundle:
+            bundle.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+            for rel, _ in files:
+                compress = zipfile.ZIP_STORED if rel.endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+                bundle.write(run_dir / rel, f"{run_id}/{rel}", compress_type=compress)
+        with zipfile.ZipFile(tmp_path, 'r') as bundle:
+            bad_member = bundle.testzip()
+            if bad_member is not None:
+                raise zipfile.BadZipFile(f"CRC mismatch in {bad_member}")
+        os.replace(tmp_path, archive)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    
+    if remove:
+        shutil.rmtree(run_dir)
+    return sum(st.st_size for _, st in files), archive.stat().st_size
+
+
+def restore_run(results_dir: Path, run_id: str, keep_bundle: bool = False) -> int:
+    """Unpack a bundle back into <results>/<run_id>/ (file mtimes restored). Returns file count."""
+    archive = bundle_path(results_dir, run_id)
+    run_dir = results_dir / run_id
+    if run_dir.exists():
+        raise FileExistsError(f"{run_dir} already exists")
+    _close_bundle(archive)
+    
+    tmp_dir = results_dir / f".{run_id}.restoring"
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    try:
+        with zipfile.ZipFile(archive, 'r') as bundle:
+            manifest = json.loads(bundle.read(MANIFEST_NAME))
+            prefix = f"{run_id}/"
+            for member in bundle.infolist():
+                if not member.filename.startswith(prefix) or member.is_dir():
+                    continue
+                rel = member.filename[len(prefix):]
+                if rel.startswith('/') or '..' in rel.split('/'):
+                    raise zipfile.BadZipFile(f"Unsafe member path: {member.filename}")
+                target = tmp_dir / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with bundle.open(member) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+        for entry in manifest.get('files', []):
+            target = tmp_dir / entry['path']
+            if target.exists():
+                os.utime(target, (entry['mtime'], entry['mtime']))
+        os.replace(tmp_dir, run_dir)
+        if 'source_mtime' in manifest:
+            os.utime(run_dir, (manifest['source_mtime'], manifest['source_mtime']))
+    except BaseException:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        raise
+    
+    if not keep_bundle:
+        archive.unlink()
+    return len(manifest.get('files', []))
+
+
+def format_size(bytes_size: float) -> str:
+    """Format bytes to human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes_size < 1024.0:
+            return f"{bytes_size:.1f}{unit}"
+        bytes_size /= 1024.0
+    return f"{bytes_size:.1f}TB"
+
+
+def _resolve_results_dir(results_dir: Optional[str]) -> Path:
+    project_root = Path(__file__).parent.parent
+    if results_dir is None:
+        return project_root / 'src' / 'results'
+    path = Path(results_dir)
+    return path if path.is_absolute() else project_root / path
+
+
+def cmd_list(results_dir: Path):
+    print("=" * 100)
+    print(f"{'Run':<50} {'Form':<8} {'Files':>7} {'Size':>10} {'Idle':>8}")
+    print("-" * 100)
+    now = time.time()
+    for root in list_runs(results_dir):
+        if is_archived(root):
+            manifest = json.loads(root.root.read(MANIFEST_NAME))
+            files = len(manifest.get('files', []))
+            size = os.stat(root.root.filename).st_size
+            idle = now - max((f['mtime'] for f in manifest.get('files', [])), default=manifest['archived_at'])
+            form = 'bundle'
+        else:
+            entries = _walk_files(root)
+            files = len(entries)
+            size = sum(st.st_size for _, st in entries)
+            idle = now - max((st.st_mtime for _, st in entries), default=root.stat().st_mtime)
+            form = 'dir'
+        print(f"{root.name:<50} {form:<8} {files:>7} {format_size(size):>10} {idle / 86400:>6.0f}d")
+
+
+def cmd_archive(results_dir: Path, args):
+    with os.scandir(results_dir) as entries:
+        run_dirs = sorted(Path(entry.path) for entry in entries if entry.is_dir() and not entry.name.startswith('.'))
+    if args.run:
+        run_dirs = [run_dir for run_dir in run_dirs if run_dir.name in args.run]
+    
+    cutoff = time.time() - args.older_than * 86400
+    candidates = []
+    for run_dir in run_dirs:
+        if bundle_path(results_dir, run_dir.name).exists():
+            print(f"[SKIP] {run_dir.name}: bundle already exists")
+            continue
+        activity = last_activity(run_dir)
+        if args.run or activity < cutoff:
+            candidates.append((run_dir, activity))
+    
+    if not candidates:
+        print(f"[OK] No runs inactive for more than {args.older_than:g} days")
+        return
+    
+    print("=" * 100)
+    print("DRY RUN - Would archive the following runs:" if args.dry_run else "ARCHIVING RUNS")
+    print("=" * 100)
+    total_before = 0
+    total_after = 0
+    for run_dir, activity in candidates:
+        last = datetime.fromtimestamp(activity).strftime('%Y-%m-%d')
+        if args.dry_run:
+            files = _walk_files(run_dir)
+            size = sum(st.st_size for _, st in files)
+            print(f"   Would archive: {run_dir.name:50s} {len(files):>5} files  {format_size(size):>10s}  last active {last}")
+            continue
+        try:
+            before, after = archive_run(run_dir, compresslevel=args.level, remove=not args.keep_dir)
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"   [FAIL] {run_dir.name}: {e}")
+            continue
+        total_before += before
+        total_after += after
+        print(f"   [OK] {run_dir.name:50s} {format_size(before):>10s} -> {format_size(after):>10s}  last active {last}")
+    
+    if not args.dry_run and total_before:
+        print()
+        print(f"[OK] Archived {len(candidates)} runs: {format_size(total_before)} -> {format_size(total_after)} "
+              f"({100 * (1 - total_after / total_before):.0f}% smaller)")
+
+
+def cmd_restore(results_dir: Path, args):
+    for run_id in args.run_ids:
+        if not bundle_path(results_dir, run_id).exists():
+            print(f"[FAIL] No bundle for {run_id}")
+            continue
+        try:
+            count = restore_run(results_dir, run_id, keep_bundle=args.keep_bundle)
+            print(f"[OK] Restored {run_id} ({count} files)")
+        except (OSError, zipfile.BadZipFile, KeyError, ValueError) as e:
+            print(f"[FAIL] {run_id}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archive inactive runs into single-file bundles, list and restore them.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/run_archive.py list
+  python utils/run_archive.py archive --older-than 30 --dry-run
+  python utils/run_archive.py archive --older-than 30
+  python utils/run_archive.py archive --run training_20251127_075636 --keep-dir
+  python utils/run_archive.py restore training_20251127_075636
+        """
+    )
+    parser.add_argument('--results-dir', type=str, default=None,
+                        help='Path to results directory (default: src/results relative to project root)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    subparsers.add_parser('list', help='List run directories and bundles')
+    
+    archive_parser = subparsers.add_parser('archive', help='Pack inactive runs into bundles')
+    archive_parser.add_argument('--older-than', type=float, default=DEFAULT_INACTIVE_DAYS,
+                                help=f'Days since the last file change (default: {DEFAULT_INACTIVE_DAYS})')
+    archive_parser.add_argument('--run', action='append', default=None,
+                                help='Archive these runs regardless of age (repeatable)')
+    archive_parser.add_argument('--level', type=int, default=6, help='Deflate level 1-9 (default: 6)')
+    archive_parser.add_argument('--keep-dir', action='store_true', help='Keep the run directory after packing')
+    archive_parser.add_argument('--dry-run', action='store_true', help='Show what would be archived')
+    
+    restore_parser = subparsers.add_parser('restore', help='Unpack bundles back into run directories')
+    restore_parser.add_argument('run_ids', nargs='+', help='Runs to restore')
+    restore_parser.add_argument('--keep-bundle', action='store_true', help='Keep the bundle after restoring')
+    
+    args = parser.parse_args()
+    
+    results_dir = _resolve_results_dir(args.results_dir)
+    if not results_dir.exists():
+        print(f"[ERROR] Results directory not found: {results_dir}")
+        return
+    
+    if args.command == 'list':
+        cmd_list(results_dir)
+    elif args.command == 'archive':
+        cmd_archive(results_dir, args)
+    elif args.command == 'restore':
+        cmd_restore(results_dir, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+On-disk catalog (SQLite) of every run in the results directory, with a query CLI.
+
+One row per run (directories and archived bundles): mode, timestamps, config
+hash, key hyperparameters, final gauges, checkpoint count, disk size. Plus
+per-run checkpoints and gauges tables. Stored in <results-dir>/.run_catalog.sqlite.
+
+`update` is incremental: a run is re-read only when its configuration.yaml,
+timers.json or training_status.json (or its bundle) changes mtime or size, or
+when its total size, file count or any event file or checkpoint changes (the
+fingerprint check_failed_runs.py uses with integrity checks). Runs still training (run_liveness.py)
+are listed with live=1 and re-read on every update until they finish.
+Queries only read the database, so they stay in the milliseconds at 10k runs.
+
+Usage:
+    python utils/run_catalog.py update                    # Index new/changed runs
+    python utils/run_catalog.py query --mode training --where hidden_units=256 --sort reward --limit 5
+    python utils/run_catalog.py show training_20251214_194855
+    python utils/run_catalog.py sql "SELECT hidden_units, AVG(reward) FROM runs GROUP BY 1"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+from check_failed_runs import YAML_LOADER, directory_size, run_fingerprint
+from run_archive import is_archived, list_runs, run_mtime
+from run_liveness import live_status
+from timers_stream import read_timer_sections
+
+CATALOG_FILENAME = '.run_catalog.sqlite'
+# Bump when the schema or the extracted fields change (forces a full re-index)
+CATALOG_VERSION = 1
+
+# Hyperparameter columns: column -> path inside the behavior settings
+HYPERPARAMETERS = {
+    'trainer_type': ('trainer_type',),
+    'max_steps': ('max_steps',),
+    'time_horizon': ('time_horizon',),
+    'learning_rate': ('hyperparameters', 'learning_rate'),
+    'learning_rate_schedule': ('hyperparameters', 'learning_rate_schedule'),
+    'batch_size': ('hyperparameters', 'batch_size'),
+    'buffer_size': ('hyperparameters', 'buffer_size'),
+    'beta': ('hyperparameters', 'beta'),
+    'epsilon': ('hyperparameters', 'epsilon'),
+    'lambd': ('hyperparameters', 'lambd'),
+    'num_epoch': ('hyperparameters', 'num_epoch'),
+    'hidden_units': ('network_settings', 'hidden_units'),
+    'num_layers': ('network_settings', 'num_layers'),
+    'normalize': ('network_settings', 'normalize'),
+    'gamma': ('reward_signals', 'extrinsic', 'gamma'),
+}
+
+# Final gauge columns: column -> gauge name without the behavior prefix (first match wins)
+KEY_GAUGES = {
+    'reward': ('Environment.CumulativeReward.mean', 'Episode.TotalReward.mean'),
+    'episode_length': ('Environment.EpisodeLength.mean',),
+    'total_steps': ('Step.sum', 'Step.mean'),
+    'entropy': ('Policy.Entropy.mean',),
+    'policy_loss': ('Losses.PolicyLoss.mean',),
+    'value_loss': ('Losses.ValueLoss.mean',),
+}
+
+RUN_COLUMNS = [
+    ('run_id', 'TEXT PRIMARY KEY'),
+    ('mode', 'TEXT'),
+    ('archived', 'INTEGER'),
+    ('live', 'INTEGER'),
+    ('behavior', 'TEXT'),
+    ('start_time', 'REAL'),
+    ('end_time', 'REAL'),
+    ('duration', 'REAL'),
+    ('mtime', 'REAL'),
+    ('config_hash', 'TEXT'),
+] + [(name, 'NUMERIC') for name in HYPERPARAMETERS] + [
+    ('reward', 'REAL'),
+    ('reward_max', 'REAL'),
+] + [(name, 'REAL') for name in KEY_GAUGES if name != 'reward'] + [
+    ('num_checkpoints', 'INTEGER'),
+    ('final_step', 'INTEGER'),
+    ('best_checkpoint_reward', 'REAL'),
+    ('size_bytes', 'INTEGER'),
+    ('file_count', 'INTEGER'),
+    ('fingerprint', 'TEXT'),
+    ('indexed_at', 'REAL'),
+]
+COLUMN_NAMES = [name for name, _ in RUN_COLUMNS]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS runs ({', '.join(f'{name} {kind}' for name, kind in RUN_COLUMNS)});
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id TEXT, steps INTEGER, reward REAL, creation_time REAL, file_path TEXT, final INTEGER);
+CREATE TABLE IF NOT EXISTS gauges (
+    run_id TEXT, name TEXT, value REAL, min REAL, max REAL, count INTEGER);
+CREATE INDEX IF NOT EXISTS runs_mode_reward ON runs (mode, reward);
+CREATE INDEX IF NOT EXISTS runs_start_time ON runs (start_time);
+CREATE INDEX IF NOT EXISTS runs_hidden_units ON runs (hidden_units);
+CREATE INDEX IF NOT EXISTS runs_config_hash ON runs (config_hash);
+CREATE INDEX IF NOT EXISTS checkpoints_run ON checkpoints (run_id);
+CREATE INDEX IF NOT EXISTS gauges_run ON gauges (run_id);
+CREATE INDEX IF NOT EXISTS gauges_name ON gauges (name, value);
+"""
+
+DEFAULT_QUERY_COLUMNS = ['run_id', 'mode', 'start_time', 'reward', 'total_steps', 'hidden_units',
+                         'learning_rate', 'num_checkpoints', 'size_bytes']
+
+
+def format_size(bytes_size: float) -> str:
+    """Format bytes to human-readable size."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(bytes_size) < 1024.0:
+            return f"{bytes_size:.1f}{unit}"
+        bytes_size /= 1024.0
+    return f"{bytes_size:.1f}TB"
+
+
+def _dig(data: Any, path: Sequence[str]) -> Any:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _sql_value(value: Any) -> Any:
+    """Store scalars as-is (bools as 0/1), anything else as JSON text."""
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def config_hash(config: Dict) -> str:
+    """Hash of the configuration without checkpoint_settings (run id, results dir, resume flags)."""
+    relevant = {key: value for key, value in config.items() if key != 'checkpoint_settings'}
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def _read_json(path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    try:
+        with path.open('r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def catalog_fingerprint(run_root) -> str:
+    """Changes whenever the files a catalog row is built from change."""
+    if is_archived(run_root):
+        st = os.stat(run_root.root.filename)
+        return json.dumps(['bundle', st.st_mtime_ns, st.st_size])
+    # The tree part keeps size_bytes / file_count current after pruning, dedup or new event data
+    return json.dumps(run_fingerprint(run_root, tree=True))
+
+
+def index_run(run_root) -> Tuple[Dict, List[Tuple], List[Tuple]]:
+    """(runs row, checkpoint rows, gauge rows) for one run directory or bundle."""
+    run_id = run_root.name
+    row: Dict[str, Any] = dict.fromkeys(COLUMN_NAMES)
+    row.update(run_id=run_id, archived=int(is_archived(run_root)), live=0, indexed_at=time.time())
+    
+    live = live_status(run_root)
+    if live is not None:
+        # Files are still being written: record it as live and re-read on the next update
+        row.update(live=1, mode='training', start_time=live.get('started'), total_steps=live.get('step'),
+                   reward=live.get('reward'), mtime=live.get('updated'))
+        return row, [], []
+    
+    row['fingerprint'] = catalog_fingerprint(run_root)
+    try:
+        row['mtime'] = run_mtime(run_root)
+    except OSError:
+        pass
+    
+    config = None
+    config_path = run_root / 'configuration.yaml'
+    if config_path.exists():
+        try:
+            with config_path.open('r') as f:
+                config = yaml.load(f, Loader=YAML_LOADER)
+        except (OSError, yaml.YAMLError):
+            config = None
+    behavior = None
+    if isinstance(config, dict):
+        behaviors = config.get('behaviors') or {}
+        behavior = next(iter(behaviors), None)
+        settings = behaviors.get(behavior) or {}
+        for column, path in HYPERPARAMETERS.items():
+            row[column] = _sql_value(_dig(settings, path))
+        row['config_hash'] = config_hash(config)
+        row['mode'] = 'inference' if (config.get('checkpoint_settings') or {}).get('inference') else 'training'
+    else:
+        row['mode'] = 'inference' if 'inference' in run_id.lower() else 'training'
+    
+    gauge_rows = []
+    timers_path = run_root / 'run_logs' / 'timers.json'
+    if timers_path.exists():
+        try:
+            timers = read_timer_sections(timers_path)
+        except (OSError, ValueError):
+            timers = {}
+        gauges = timers.get('gauges') or {}
+        metadata = timers.get('metadata') or {}
+        if behavior is None and gauges:
+            behavior = next(iter(gauges)).split('.', 1)[0]
+        prefix = f"{behavior}." if behavior else ''
+        for name, data in gauges.items():
+            if isinstance(data, dict):
+                short = name[len(prefix):] if prefix and name.startswith(prefix) else name
+                gauge_rows.append((run_id, short, data.get('value'), data.get('min'),
+                                   data.get('max'), data.get('count')))
+        by_name = {g[1]: g for g in gauge_rows}
+        for column, names in KEY_GAUGES.items():
+            gauge = next((by_name[n] for n in names if n in by_name), None)
+            if gauge is not None:
+                row[column] = gauge[2]
+                if column == 'reward':
+                    row['reward_max'] = gauge[4]
+        try:
+            start = float(metadata.get('start_time_seconds') or 0) or None
+            end = float(metadata.get('end_time_seconds') or 0) or None
+        except (TypeError, ValueError):
+            start = end = None
+        row.update(start_time=start, end_time=end, duration=end - start if start and end else None)
+    row['behavior'] = behavior
+    
+    checkpoint_rows = []
+    status = _read_json(run_root / 'run_logs' / 'training_status.json') or {}
+    for data in status.values():
+        if not isinstance(data, dict):
+            continue
+        for checkpoint in data.get('checkpoints', []):
+            checkpoint_rows.append((run_id, checkpoint.get('steps'), checkpoint.get('reward'),
+                                    checkpoint.get('creation_time'), checkpoint.get('file_path'), 0))
+        final = data.get('final_checkpoint')
+        if isinstance(final, dict):
+            checkpoint_rows.append((run_id, final.get('steps'), final.get('reward'),
+                                    final.get('creation_time'), final.get('file_path'), 1))
+    regular = [c for c in checkpoint_rows if not c[5]]
+    row['num_checkpoints'] = len(regular)
+    if checkpoint_rows:
+        row['final_step'] = max((c[1] for c in checkpoint_rows if c[1] is not None), default=None)
+        rewards = [c[2] for c in checkpoint_rows if c[2] is not None]
+        row['best_checkpoint_reward'] = max(rewards) if rewards else None
+    
+    if is_archived(run_root):
+        row['size_bytes'] = os.stat(run_root.root.filename).st_size
+        row['file_count'] = sum(1 for info in run_root.root.infolist()
+                                if info.filename.startswith(f"{run_id}/") and not info.is_dir())
+    else:
+        row['size_bytes'], row['file_count'] = directory_size(run_root)
+    
+    return row, checkpoint_rows, gauge_rows
+
+
+class RunCatalog:
+    """SQLite catalog of the runs in one results directory."""
+    
+    def __init__(self, results_dir: Path, path: Optional[Path] = None):
+        self.results_dir = results_dir
+        self.path = path or results_dir / CATALOG_FILENAME
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        # WAL: the dashboard and CLI queries can read while an update writes
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self._ensure_schema()
+    
+    def _ensure_schema(self):
+        version = None
+        try:
+            found = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            version = int(found['value']) if found else None
+        except sqlite3.OperationalError:
+            pass  # New database
+        if version != CATALOG_VERSION:
+            with self.conn:
+                for table in ('runs', 'checkpoints', 'gauges', 'meta'):
+                    self.conn.execute(f'DROP TABLE IF EXISTS {table}')
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CATALOG_VERSION),))
+    
+    def close(self):
+        self.conn.close()
+    
+    def update(self, full: bool = False, workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Bring the catalog in line with the results directory.
+        Returns counts of added, updated, unchanged and removed runs.
+        """
+        known = {r['run_id']: (r['fingerprint'], r['live'])
+                 for r in self.conn.execute('SELECT run_id, fingerprint, live FROM runs')}
+        roots = list_runs(self.results_dir)
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        
+        stale = []
+        for root in roots:
+            previous = known.get(root.name)
+            if previous is None:
+                stats['added'] += 1
+            elif full or previous[1] or previous[0] != catalog_fingerprint(root):
+                stats['updated'] += 1
+            else:
+                stats['unchanged'] += 1
+                continue
+            stale.append(root)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            indexed = list(executor.map(index_run, stale))
+        
+        removed = set(known) - {root.name for root in roots}
+        stats['removed'] = len(removed)
+        placeholders = ', '.join('?' * len(COLUMN_NAMES))
+        with self.conn:
+            for run_id in list(removed) + [root.name for root in stale]:
+                for table in ('runs', 'checkpoints', 'gauges'):
+                    self.conn.execute(f'DELETE FROM {table} WHERE run_id = ?', (run_id,))
+            for row, checkpoint_rows, gauge_rows in indexed:
+                self.conn.execute(f'INSERT INTO runs ({", ".join(COLUMN_NAMES)}) VALUES ({placeholders})',
+                                  [row[name] for name in COLUMN_NAMES])
+                self.conn.executemany('INSERT INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)', checkpoint_rows)
+                self.conn.executemany('INSERT INTO gauges VALUES (?, ?, ?, ?, ?, ?)', gauge_rows)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('updated_at', ?)", (str(time.time()),))
+        return stats
+    
+    def query(self, where: Sequence[str] = (), mode: Optional[str] = None, sort: Optional[str] = None,
+              limit: Optional[int] = None, columns: Optional[Sequence[str]] = None,
+              gauge_filters: Sequence[str] = ()) -> List[sqlite3.Row]:
+        """
+        Runs matching every `column<op>value` condition (ops: = != > >= < <= ~ for LIKE).
+        sort is a column name, '-column' for descending. gauge_filters use gauge names
+        (e.g. 'Episode.MaxDistance.mean>20') against the final gauges table.
+        """
+        columns = list(columns or DEFAULT_QUERY_COLUMNS)
+        for column in columns:
+            self._check_column(column)
+        clauses, params = [], []
+        if mode:
+            clauses.append('mode = ?')
+            params.append(mode)
+        for condition in where:
+            column, op, value = self._parse_condition(condition)
+            self._check_column(column)
+            clauses.append(f'{column} LIKE ?' if op == '~' else f'{column} {op} ?')
+            params.append(value)
+        for condition in gauge_filters:
+            name, op, value = self._parse_condition(condition, name_pattern=r'[\w.]+')
+            sql_op = 'LIKE' if op == '~' else op
+            clauses.append(f'run_id IN (SELECT run_id FROM gauges WHERE name = ? AND value {sql_op} ?)')
+            params.extend([name, value])
+        
+        sql = f'SELECT {", ".join(columns)} FROM runs'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        if sort:
+            descending = sort.startswith('-')
+            column = sort.lstrip('-+')
+            self._check_column(column)
+            # NULLs last either way
+            sql += f' ORDER BY {column} IS NULL, {column} {"DESC" if descending else "ASC"}'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+    
+    def run(self, run_id: str) -> Optional[Dict]:
+        """Full catalog entry of one run, with its checkpoints and gauges."""
+        found = self.conn.execute('SELECT * FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+        if found is None:
+            return None
+        entry = dict(found)
+        entry['checkpoints'] = [dict(r) for r in self.conn.execute(
+            'SELECT steps, reward, creation_time, file_path, final FROM checkpoints '
+            'WHERE run_id = ? ORDER BY final, steps', (run_id,))]
+        entry['gauges'] = {r['name']: {'value': r['value'], 'min': r['min'], 'max': r['max'], 'count': r['count']}
+                           for r in self.conn.execute('SELECT * FROM gauges WHERE run_id = ? ORDER BY name',
+                                                      (run_id,))}
+        return entry
+    
+    @staticmethod
+    def _check_column(column: str):
+        if column not in COLUMN_NAMES:
+            raise ValueError(f"Unknown column '{column}' (available: {', '.join(COLUMN_NAMES)})")
+    
+    @staticmethod
+    def _parse_condition(condition: str, name_pattern: str = r'\w+') -> Tuple[str, str, Any]:
+        match = re.match(rf'^\s*({name_pattern})\s*(>=|<=|!=|=|>|<|~)\s*(.*)$', condition)
+        if not match:
+            raise ValueError(f"Bad condition '{condition}' (expected e.g. hidden_units=256, reward>50)")
+        name, op, value = match.groups()
+        for cast in (int, float):
+            try:
+                return name, op, cast(value)
+            except ValueError:
+                pass
+        if value.lower() in ('true', 'false'):
+            return name, op, int(value.lower() == 'true')
+        return name, op, value
+
+
+def _format_cell(column: str, value: Any) -> str:
+    if value is None:
+        return '-'
+    if column in ('start_time', 'end_time', 'mtime', 'indexed_at'):
+        return time.strftime('%Y-%m-%d %H:%M', time.localtime(value))
+    if column == 'size_bytes':
+        return format_size(value)
+    if column == 'duration':
+        return f"{value / 60:.1f}min"
+    if column in ('total_steps', 'final_step', 'max_steps') and isinstance(value, (int, float)):
+        return f"{int(value):,}"
+    if isinstance(value, float):
+        return f"{value:.4g}" if abs(value) < 1e-2 or abs(value) >= 1e6 else f"{value:.2f}"
+    return str(value)
+
+
+def print_table(rows: Sequence[sqlite3.Row], columns: Sequence[str]):
+    cells = [[_format_cell(c, row[c]) for c in columns] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    print('  '.join(c.ljust(w) for c, w in zip(columns, widths)))
+    print('  '.join('-' * w for w in widths))
+    for r in cells:
+        print('  '.join(v.ljust(w) for v, w in zip(r, widths)))
+
+
+def _resolve_results_dir(results_dir: Optional[str]) -> Path:
+    project_root = Path(__file__).parent.parent
+    if results_dir is None:
+        return project_root / 'src' / 'results'
+    path = Path(results_dir)
+    return path if path.is_absolute() else project_root / path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="SQLite catalog of all runs: incremental indexing and fast queries.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/run_catalog.py update                                    # Index new/changed runs
+  python utils/run_catalog.py update --full                             # Re-read every run
+  python utils/run_catalog.py query --mode training --where hidden_units=256 --sort reward --limit 5
+  python utils/run_catalog.py query --where "learning_rate<0.0003" --where "run_id~training_202512%"
+  python utils/run_catalog.py query --gauge "Episode.MaxDistance.mean>20" --columns run_id,reward
+  python utils/run_catalog.py query --update --sort size_bytes --limit 10    # Refresh, then query
+  python utils/run_catalog.py show training_20251214_194855
+  python utils/run_catalog.py sql "SELECT config_hash, COUNT(*), MAX(reward) FROM runs GROUP BY 1"
+  python utils/run_catalog.py columns                                   # List queryable columns
+        """
+    )
+    parser.add_argument('--results-dir', type=str, default=None,
+                        help='Path to results directory (default: src/results relative to project root)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    update = subparsers.add_parser('update', help='Index new and changed runs, drop deleted ones')
+    update.add_argument('--full', action='store_true', help='Re-read every run')
+    update.add_argument('--workers', type=int, default=None, help='Runs read in parallel')
+    
+    query = subparsers.add_parser('query', help='List runs matching conditions')
+    query.add_argument('--mode', choices=['training', 'inference'], default=None)
+    query.add_argument('--where', action='append', default=[], metavar='COLUMN<OP>VALUE',
+                       help='Condition, ops: = != > >= < <= ~ (LIKE). Repeatable')
+    query.add_argument('--gauge', action='append', default=[], metavar='NAME<OP>VALUE',
+                       help='Condition on a final gauge, e.g. "Episode.MaxDistance.mean>20". Repeatable')
+    query.add_argument('--sort', type=str, default='start_time',
+                       help='Column to sort by, descending (default: start_time)')
+    query.add_argument('--asc', action='store_true', help='Sort ascending')
+    query.add_argument('--limit', type=int, default=None)
+    query.add_argument('--columns', type=str, default=None, help='Comma-separated columns to show')
+    query.add_argument('--json', action='store_true', help='Print rows as JSON')
+    query.add_argument('--update', action='store_true', help='Run an incremental update first')
+    
+    show = subparsers.add_parser('show', help='Everything the catalog knows about one run')
+    show.add_argument('run_id')
+    
+    sql = subparsers.add_parser('sql', help='Run a read-only SQL statement')
+    sql.add_argument('statement')
+    
+    subparsers.add_parser('columns', help='List the columns of the runs table')
+    
+    args = parser.parse_args()
+    results_dir = _resolve_results_dir(args.results_dir)
+    if not results_dir.exists():
+        print(f"[ERROR] Results directory not found: {results_dir}")
+        sys.exit(2)
+    
+    if args.command == 'columns':
+        for name, kind in RUN_COLUMNS:
+            print(f"{name:28s} {kind.split()[0]}")
+        print("\nTables: runs, checkpoints (run_id, steps, reward, creation_time, file_path, final), "
+              "gauges (run_id, name, value, min, max, count)")
+        return
+    
+    catalog = RunCatalog(results_dir)
+    try:
+        if args.command == 'update' or (args.command == 'query' and args.update):
+            start = time.perf_counter()
+            stats = catalog.update(full=getattr(args, 'full', False), workers=getattr(args, 'workers', None))
+            elapsed = time.perf_counter() - start
+            print(f"[OK] Catalog updated in {elapsed:.2f}s: {stats['added']} added, {stats['updated']} updated, "
+                  f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+            if args.command == 'update':
+                return
+            print()
+        
+        if args.command == 'query':
+            columns = args.columns.split(',') if args.columns else DEFAULT_QUERY_COLUMNS
+            start = time.perf_counter()
+            try:
+                rows = catalog.query(where=args.where, mode=args.mode,
+                                     sort=args.sort if args.asc else f"-{args.sort}", limit=args.limit,
+                                     columns=columns, gauge_filters=args.gauge)
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                sys.exit(2)
+            elapsed = (time.perf_counter() - start) * 1000
+            if args.json:
+                print(json.dumps([dict(row) for row in rows], indent=2))
+                return
+            if rows:
+                print_table(rows, columns)
+            print(f"\n{len(rows)} runs ({elapsed:.1f} ms)")
+        
+        elif args.command == 'show':
+            entry = catalog.run(args.run_id)
+            if entry is None:
+                print(f"[ERROR] Run not in catalog: {args.run_id} (run 'update' first?)")
+                sys.exit(1)
+            print(json.dumps(entry, indent=2, default=str))
+        
+        elif args.command == 'sql':
+            readonly = sqlite3.connect(f"file:{catalog.path.as_posix()}?mode=ro", uri=True)
+            try:
+                cursor = readonly.execute(args.statement)
+                header = [d[0] for d in cursor.description or []]
+                rows = cursor.fetchall()
+            except sqlite3.Error as e:
+                print(f"[ERROR] {e}")
+                sys.exit(2)
+            finally:
+                readonly.close()
+            if header:
+                print('\t'.join(header))
+            for row in rows:
+                print('\t'.join('-' if v is None else str(v) for v in row))
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tell in-progress runs apart from finished or crashed ones before parsing them.
+
+Training wrappers (src/train_with_progress.py, src/train_sim.py) keep
+run_logs/heartbeat.json fresh while a run trains (see src/run_heartbeat.py).
+A run is live when its heartbeat says "running" and was updated within a few
+beat intervals (and, on this machine, its trainer process still exists).
+
+Runs without a heartbeat (started with plain mlagents-learn, or before the
+heartbeat existed) are treated as live while their logs/event files were
+written to in the last RECENT_WRITE_WINDOW seconds, which needs a few scandirs
+and no file reads.
+
+Live runs get a cheap status built from the heartbeat alone, so scanners never
+parse (or flag, or delete) files that are still being written.
+
+Usage:
+    python utils/run_liveness.py                    # List live runs
+    python utils/run_liveness.py --all              # Every run with its liveness
+"""
+
+import argparse
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HEARTBEAT_FILENAME = 'heartbeat.json'
+# Heartbeat older than this many beat intervals (and at least STALE_MIN seconds) = dead run
+STALE_INTERVALS = 4
+STALE_MIN = 60.0
+DEFAULT_INTERVAL = 15.0
+# Runs without a heartbeat: live if anything was written this recently
+RECENT_WRITE_WINDOW = 300.0
+
+HOSTNAME = socket.gethostname()
+
+
+def read_heartbeat(run_path: Path) -> Optional[Dict]:
+    """Parsed run_logs/heartbeat.json, or None if missing or unreadable."""
+    try:
+        with open(run_path / 'run_logs' / HEARTBEAT_FILENAME, 'r') as f:
+            heartbeat = json.load(f)
+        return heartbeat if isinstance(heartbeat, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_exists(pid: int) -> Optional[bool]:
+    """True/False on POSIX; None where it can't be checked cheaply (os.kill on Windows terminates)."""
+    if os.name != 'posix' or not pid:
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists but owned by someone else
+    return True
+
+
+def _latest_write(run_path: Path) -> Optional[float]:
+    """Newest mtime among run_logs/ files and files one level below the run (event files, checkpoints)."""
+    latest = None
+    for directory in (run_path, run_path / 'run_logs'):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if directory == run_path and entry.name != 'run_logs':
+                                with os.scandir(entry.path) as children:
+                                    mtimes = [c.stat().st_mtime for c in children if c.is_file()]
+                                if mtimes:
+                                    latest = max(latest or 0.0, max(mtimes))
+                        else:
+                            latest = max(latest or 0.0, entry.stat().st_mtime)
+                    except OSError:
+                        pass  # Vanished mid-scan
+        except OSError:
+            pass
+    return latest
+
+
+def live_status(run_path: Path, now: Optional[float] = None,
+                recent_window: float = RECENT_WRITE_WINDOW) -> Optional[Dict]:
+    """
+    Cheap status of a live run, or None if the run is not in progress.
+    Archived runs (zipfile.Path from run_archive.open_run) are never live.
+    """
+    if not isinstance(run_path, Path):
+        return None
+    now = time.time() if now is None else now
+    heartbeat = read_heartbeat(run_path)
+    
+    if heartbeat is not None:
+        if heartbeat.get('state') != 'running':
+            return None
+        updated = float(heartbeat.get('updated') or 0)
+        interval = float(heartbeat.get('interval') or DEFAULT_INTERVAL)
+        if now - updated > max(STALE_INTERVALS * interval, STALE_MIN):
+            return None
+        if heartbeat.get('host') == HOSTNAME and _pid_exists(heartbeat.get('pid')) is False:
+            return None
+        step = heartbeat.get('step')
+        max_steps = heartbeat.get('max_steps')
+        return {
+            'run_id': run_path.name,
+            'source': 'heartbeat',
+            'trainer': heartbeat.get('trainer'),
+            'phase': heartbeat.get('phase'),
+            'started': heartbeat.get('started'),
+            'updated': updated,
+            'age_seconds': max(now - updated, 0.0),
+            'step': step,
+            'max_steps': max_steps,
+            'progress': step / max_steps if step and max_steps else None,
+            'reward': heartbeat.get('reward'),
+        }
+    
+    latest = _latest_write(run_path)
+    if latest is None or now - latest > recent_window:
+        return None
+    return {
+        'run_id': run_path.name,
+        'source': 'recent-writes',
+        'trainer': None,
+        'phase': None,
+        'started': None,
+        'updated': latest,
+        'age_seconds': max(now - latest, 0.0),
+        'step': None,
+        'max_steps': None,
+        'progress': None,
+        'reward': None,
+    }
+
+
+def describe(status: Dict) -> str:
+    """One-line summary, e.g. 'step 1,200,000/3,000,000 (40.0%), updated 12s ago'."""
+    parts = []
+    if status['step'] is not None:
+        steps = f"step {status['step']:,}"
+        if status['max_steps']:
+            steps += f"/{status['max_steps']:,}"
+        if status['progress'] is not None:
+            steps += f" ({status['progress'] * 100:.1f}%)"
+        parts.append(steps)
+    if status['phase'] and status['phase'] != 'training':
+        parts.append(status['phase'])
+    if status['source'] == 'recent-writes':
+        parts.append(f"no heartbeat, files written {status['age_seconds']:.0f}s ago")
+    else:
+        parts.append(f"updated {status['age_seconds']:.0f}s ago")
+    return ', '.join(parts)
+
+
+def find_live_runs(results_dir: Path) -> List[Dict]:
+    """Live status of every in-progress run directory in results_dir."""
+    live = []
+    if not results_dir.exists():
+        return live
+    with os.scandir(results_dir) as entries:
+        run_dirs = sorted(Path(e.path) for e in entries if e.is_dir() and not e.name.startswith('.'))
+    for run_dir in run_dirs:
+        status = live_status(run_dir)
+        if status is not None:
+            live.append(status)
+    return live
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List runs that are still training (heartbeat or recent writes).",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/run_liveness.py                  # Live runs only
+  python utils/run_liveness.py --all            # Every run
+  python utils/run_liveness.py --json           # Machine-readable
+        """
+    )
+    parser.add_argument('--results-dir', type=str, default=None,
+                        help='Path to results directory (default: src/results relative to project root)')
+    parser.add_argument('--all', action='store_true', help='Also list runs that are not live')
+    parser.add_argument('--json', action='store_true', help='Print live statuses as JSON')
+    
+    args = parser.parse_args()
+    
+    project_root = Path(__file__).parent.parent
+    if args.results_dir is None:
+        results_dir = project_root / 'src' / 'results'
+    else:
+        results_dir = Path(args.results_dir)
+        if not results_dir.is_absolute():
+            results_dir = project_root / results_dir
+    
+    if not results_dir.exists():
+        print(f"[ERROR] Results directory not found: {results_dir}")
+        return
+    
+    if args.json:
+        print(json.dumps(find_live_runs(results_dir), indent=2))
+        return
+    
+    with os.scandir(results_dir) as entries:
+        run_dirs = sorted(Path(e.path) for e in entries if e.is_dir() and not e.name.startswith('.'))
+    
+    live_count = 0
+    for run_dir in run_dirs:
+        status = live_status(run_dir)
+        if status is not None:
+            live_count += 1
+            print(f"[LIVE] {run_dir.name:50s} {describe(status)}")
+        elif args.all:
+            heartbeat = read_heartbeat(run_dir)
+            state = heartbeat.get('state', 'unknown') if heartbeat else 'no heartbeat'
+            if state == 'running':
+                state = 'stale heartbeat (crashed?)'
+            print(f"[OK] {run_dir.name:50s} {state}")
+    
+    if live_count == 0:
+        print("[OK] No live runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Streaming partial reader for ML-Agents timers.json files.
+
+check_failed_runs.py, the dashboard and generate_latex_figures.py only need the
+top-level "gauges" and "metadata" sections, but json.load builds the whole
+timer tree ("children", nested once per profiled call site) first. This reader
+walks the top-level object incrementally and:
+- decodes only the requested sections (with the stdlib C decoder)
+- skips other values by bracket matching, without building Python objects
+- stops reading the file as soon as every requested section was found
+
+mlagents-learn writes "gauges" and "metadata" before the timer tree, so for real
+runs only the first few KB of the file are read. If a file puts a large value
+before them, skipping it in Python would be slower than the C decoder, so past
+SKIP_LIMIT bytes the reader falls back to a plain json.load.
+
+Usage:
+    from timers_stream import read_timer_sections
+    timers = read_timer_sections(path)             # {'gauges': ..., 'metadata': ...}
+    
+    python utils/timers_stream.py --benchmark                  # Synthetic large files
+    python utils/timers_stream.py --benchmark path/to/timers.json
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_SECTIONS = ('gauges', 'metadata')
+CHUNK_SIZE = 64 * 1024
+# Bytes of skipped values after which a full json.load is cheaper
+SKIP_LIMIT = 4 * 1024 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# A string (possibly cut off by the end of the buffer) or a bracket
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[\[\]{}]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+# Scalars end at the next delimiter
+_SCALAR_END = re.compile(r'[,}\]\s]')
+
+_DECODER = json.JSONDecoder()
+
+
+class _SkipTooLarge(Exception):
+    """Raised when skipping would cost more than decoding the whole file."""
+
+
+class _Reader:
+    """Character buffer over a text file that grows on demand."""
+    
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.skipped = 0
+    
+    def more(self) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def skip_whitespace(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.more():
+                return
+    
+    def peek(self) -> str:
+        self.skip_whitespace()
+        if self.pos >= len(self.buf):
+            raise ValueError("Unexpected end of timers file")
+        return self.buf[self.pos]
+    
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found '{self.buf[self.pos]}'")
+        self.pos += 1
+    
+    def read_string(self) -> str:
+        self.peek()
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match:
+                self.pos = match.end()
+                return json.loads(match.group())
+            if not self.more():
+                raise ValueError("Unterminated string in timers file")
+    
+    def decode_value(self) -> Any:
+        """Decode one JSON value, reading more of the file until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end >= len(self.buf) and not self.eof and self.buf[self.pos] not in '{["':
+                self.more()
+                continue
+            self.pos = end
+            return value
+    
+    def skip_value(self):
+        """Skip one JSON value without building it."""
+        first = self.peek()
+        if first == '"':
+            self.read_string()
+            return
+        if first not in '{[':
+            while True:
+                match = _SCALAR_END.search(self.buf, self.pos)
+                if match:
+                    self.pos = match.start()
+                    return
+                if not self.more():
+                    self.pos = len(self.buf)
+                    return
+        
+        depth = 0
+        while True:
+            for match in _TOKEN.finditer(self.buf, self.pos):
+                token = match.group()
+                if token[0] == '"':
+                    if len(token) < 2 or token[-1] != '"' or match.end() == len(self.buf) and token.endswith('\\"'):
+                        # String cut off by the end of the buffer: resume from its start
+                        self.pos = match.start()
+                        break
+                    continue
+                depth += 1 if token in '{[' else -1
+                if depth == 0:
+                    self.pos = match.end()
+                    return
+            else:
+                self.pos = len(self.buf)
+            self.skipped += self.chunk_size
+            if self.skipped > SKIP_LIMIT:
+                raise _SkipTooLarge()
+            if not self.more():
+                raise ValueError("Unexpected end of timers file while skipping a value")
+
+
+def _open_text(path):
+    """Open a filesystem path, or a zipfile.Path member of an archived run."""
+    if isinstance(path, (str, os.PathLike)):
+        return open(path, 'r', encoding='utf-8')
+    return path.open('r', encoding='utf-8')
+
+
+def read_timer_sections(path, sections: Iterable[str] = DEFAULT_SECTIONS,
+                        chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Read only the given top-level sections of a timers.json file.
+    
+    path may also be a zipfile.Path inside an archived run (run_archive.py).
+    Returns {section: value} for the sections present in the file (missing ones
+    are left out, like dict.get on a fully loaded file). Raises ValueError /
+    json.JSONDecodeError on malformed JSON in the part that was read.
+    """
+    wanted = set(sections)
+    try:
+        return _stream_sections(path, wanted, chunk_size)
+    except _SkipTooLarge:
+        with _open_text(path) as f:
+            timers = json.load(f)
+        if not isinstance(timers, dict):
+            raise ValueError("timers file is not a JSON object")
+        return {key: timers[key] for key in wanted if key in timers}
+
+
+def _stream_sections(path: Path, wanted: set, chunk_size: int) -> Dict[str, Any]:
+    found: Dict[str, Any] = {}
+    with _open_text(path) as f:
+        reader = _Reader(f, chunk_size)
+        reader.more()
+        reader.expect('{')
+        if reader.peek() == '}':
+            return found
+        while wanted - found.keys():
+            key = reader.read_string()
+            reader.expect(':')
+            if key in wanted:
+                found[key] = reader.decode_value()
+            else:
+                reader.skip_value()
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == '}':
+                break
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' in timers file, found '{separator}'")
+    return found
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+def _synthetic_timers(depth: int, fanout: int, gauges_first: bool) -> Dict:
+    """A timers.json-shaped document with a deep, wide timer tree."""
+    def node(level: int) -> Dict:
+        out = {'total': 1.25, 'count': 1000, 'self': 0.5}
+        if level < depth:
+            out['children'] = {f"TorchPolicy.evaluate_{level}_{i}": node(level + 1) for i in range(fanout)}
+        return out
+    
+    gauges = {f"ParkourRunner.Metric{i}.mean": {'value': 1.0, 'min': 0.0, 'max': 2.0, 'count': 100}
+              for i in range(50)}
+    metadata = {'timer_format_version': '0.1.0', 'start_time_seconds': '1765759737',
+                'end_time_seconds': '1765766096'}
+    tree = node(0)
+    if gauges_first:
+        return {'name': 'root', 'gauges': gauges, 'metadata': metadata, **tree}
+    return {'name': 'root', **tree, 'gauges': gauges, 'metadata': metadata}
+
+
+def _time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(paths: List[Path], repeat: int):
+    """Compare json.load with read_timer_sections on each file."""
+    print("=" * 100)
+    print(f"{'File':<44} {'Size':>10} {'json.load':>12} {'streaming':>12} {'Speedup':>9}")
+    print("-" * 100)
+    for path in paths:
+        def full():
+            with open(path, 'r') as f:
+                timers = json.load(f)
+            return {key: timers[key] for key in DEFAULT_SECTIONS if key in timers}
+        
+        assert full() == read_timer_sections(path), f"Section mismatch for {path}"
+        full_time = _time(full, repeat)
+        stream_time = _time(lambda: read_timer_sections(path), repeat)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        name = str(path) if len(str(path)) <= 44 else '...' + str(path)[-41:]
+        print(f"{name:<44} {size_mb:>8.1f}MB {full_time * 1000:>10.2f}ms {stream_time * 1000:>10.2f}ms "
+              f"{full_time / stream_time:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Streaming reader for timers.json gauges/metadata, with a benchmark",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/timers_stream.py --benchmark                                   # Synthetic large files
+  python utils/timers_stream.py --benchmark src/results/*/run_logs/timers.json
+  python utils/timers_stream.py src/results/training_20251214_194855/run_logs/timers.json
+        """
+    )
+    parser.add_argument('files', nargs='*', help='timers.json files (print sections, or benchmark them)')
+    parser.add_argument('--benchmark', action='store_true', help='Compare against json.load')
+    parser.add_argument('--sections', type=str, default=','.join(DEFAULT_SECTIONS),
+                        help='Comma-separated top-level sections to read (default: gauges,metadata)')
+    parser.add_argument('--repeat', type=int, default=5, help='Benchmark repetitions, best is kept (default: 5)')
+    
+    args = parser.parse_args()
+    
+    if not args.benchmark:
+        if not args.files:
+            parser.print_help()
+            return
+        sections = [s.strip() for s in args.sections.split(',') if s.strip()]
+        for path in args.files:
+            print(json.dumps(read_timer_sections(Path(path), sections), indent=2))
+        return
+    
+    paths = [Path(p) for p in args.files]
+    tmp_dir: Optional[tempfile.TemporaryDirectory] = None
+    if not paths:
+        tmp_dir = tempfile.TemporaryDirectory()
+        print("Generating synthetic timers.json files...")
+        for label, depth, fanout, gauges_first in [('small', 4, 4, True), ('large', 6, 8, True),
+                                                   ('large_tree_first', 6, 8, False)]:
+            path = Path(tmp_dir.name) / f"timers_{label}.json"
+            with open(path, 'w') as f:
+                json.dump(_synthetic_timers(depth, fanout, gauges_first), f, indent=4)
+            paths.append(path)
+    
+    try:
+        run_benchmark(paths, args.repeat)
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Training-health anomaly detector over the step-indexed scalar series of runs.
+
+check_failed_runs.py catches runs that crashed or never learned. This script
+catches runs that trained but went wrong:
+- entropy_collapse     smoothed policy entropy falls below a fraction of its
+                       starting level and never recovers
+- value_loss_blowup    value loss becomes non-finite or jumps far above its
+                       trailing mean
+- reward_regression    smoothed reward drops well below its peak and stays there
+- timeout_stuck        episode length stuck at the episode timeout
+
+Every run's series is loaded into one NaN-padded (runs x points) matrix per
+metric, and each check is a handful of numpy operations over all runs at once
+(trailing means via cumulative sums, "holds until the end" via a reversed
+logical_and.accumulate). Each flag reports the step where the anomaly starts.
+
+Series (run_logs/, as written by extract_tensorboard_data.py / train_sim.py):
+- entropy_over_time.json      entropy
+- losses_over_time.json       value_loss
+- reward_components.json      totalReward per episode (else checkpoint rewards)
+- episode_data.json           length per episode
+
+Usage:
+    python utils/training_health.py                       # All runs (directories and bundles)
+    python utils/training_health.py training_20251214_194855 --verbose
+    python utils/training_health.py --output health.json  # Exit code 1 if any run is flagged
+    python utils/training_health.py --results-dir /mnt/runs/results
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from run_archive import list_runs, open_run
+
+RESULTS_DIR = Path(__file__).parent.parent / "src" / "results"
+
+# CharacterConfig.episodeTimeout (seconds), the unit of episode_data.json lengths
+DEFAULT_EPISODE_TIMEOUT = 100.0
+
+DEFAULT_THRESHOLDS = {
+    'window': 10,                 # Minimum points in the trailing smoothing window ...
+    'window_fraction': 0.05,      # ... grown to this fraction of each run's points
+    'entropy_collapse_ratio': 0.1,  # Smoothed entropy < ratio x starting entropy
+    'value_loss_factor': 10.0,    # Value loss > factor x mean of the previous window
+    'reward_drop_ratio': 0.5,     # Lost > ratio of the start-to-peak reward gain
+    'timeout_ratio': 0.95,        # Episode length >= ratio x timeout ...
+    'timeout_points': 20,         # ... for this many consecutive episodes
+}
+
+METRICS = ('entropy', 'value_loss', 'reward', 'episode_length')
+
+
+# ----------------------------------------------------------------------
+# Loading
+# ----------------------------------------------------------------------
+
+def _read_json(path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    try:
+        with path.open('r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _points(records: List[Dict], step_key: str, value_key: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(steps, values) sorted by step; missing/null values become NaN."""
+    pairs = [(r.get(step_key), r.get(value_key)) for r in records if r.get(step_key) is not None]
+    if not pairs:
+        return np.empty(0), np.empty(0)
+    steps = np.array([p[0] for p in pairs], dtype=np.float64)
+    values = np.array([np.nan if p[1] is None else p[1] for p in pairs], dtype=np.float64)
+    order = np.argsort(steps, kind='stable')
+    return steps[order], values[order]
+
+
+def load_run_series(run_root) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """metric -> (steps, values) for one run (directory or archived bundle)."""
+    logs = run_root / "run_logs"
+    series: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    
+    entropy = _read_json(logs / "entropy_over_time.json")
+    if entropy:
+        series['entropy'] = _points(entropy.get('data', []), 'step', 'entropy')
+    
+    losses = _read_json(logs / "losses_over_time.json")
+    if losses:
+        series['value_loss'] = _points(losses.get('data', []), 'step', 'value_loss')
+    
+    rewards = _read_json(logs / "reward_components.json")
+    if rewards and rewards.get('rewards'):
+        series['reward'] = _points(rewards['rewards'], 'stepCount', 'totalReward')
+    else:
+        status = _read_json(logs / "training_status.json") or {}
+        checkpoints = [c for data in status.values() if isinstance(data, dict)
+                       for c in data.get('checkpoints', [])]
+        if checkpoints:
+            series['reward'] = _points(checkpoints, 'steps', 'reward')
+    
+    episodes = _read_json(logs / "episode_data.json")
+    if episodes:
+        series['episode_length'] = _points(episodes.get('episodes', []), 'stepCount', 'length')
+    
+    return {name: s for name, s in series.items() if len(s[0])}
+
+
+def stack_series(series: List[Optional[Tuple[np.ndarray, np.ndarray]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pad per-run (steps, values) into (runs x max_len) matrices, NaN where a run has no point."""
+    length = max((len(s[0]) for s in series if s is not None), default=0)
+    steps = np.full((len(series), length), np.nan)
+    values = np.full((len(series), length), np.nan)
+    for row, s in enumerate(series):
+        if s is not None:
+            steps[row, :len(s[0])] = s[0]
+            values[row, :len(s[1])] = s[1]
+    return steps, values
+
+
+# ----------------------------------------------------------------------
+# Vectorized building blocks (all operate along axis 1, one row per run)
+# ----------------------------------------------------------------------
+
+def rolling_mean(values: np.ndarray, window, min_periods=None) -> np.ndarray:
+    """
+    Trailing NaN-aware mean over `window` points (an int, or one per row);
+    NaN where fewer than min_periods (default: half the window) values.
+    """
+    window = np.broadcast_to(np.asarray(window, dtype=np.int64), (values.shape[0],))[:, None]
+    min_periods = np.maximum(1, window // 2) if min_periods is None else min_periods
+    finite = np.isfinite(values)
+    filled = np.where(finite, values, 0.0)
+    pad = np.zeros((values.shape[0], 1))
+    sums = np.concatenate([pad, np.cumsum(filled, axis=1)], axis=1)
+    counts = np.concatenate([pad, np.cumsum(finite, axis=1)], axis=1)
+    upper = np.broadcast_to(np.arange(1, values.shape[1] + 1), values.shape)
+    lower = np.maximum(upper - window, 0)
+    window_sums = np.take_along_axis(sums, upper, axis=1) - np.take_along_axis(sums, lower, axis=1)
+    window_counts = np.take_along_axis(counts, upper, axis=1) - np.take_along_axis(counts, lower, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = window_sums / window_counts
+    return np.where(window_counts >= min_periods, mean, np.nan)
+
+
+def first_true(mask: np.ndarray) -> np.ndarray:
+    """Index of the first True per row, -1 if none."""
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), -1)
+
+
+def persistent_onset(mask: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """First index from which mask holds at every valid point until the end of the row."""
+    holds = mask | ~valid
+    until_end = np.flip(np.logical_and.accumulate(np.flip(holds, axis=1), axis=1), axis=1)
+    return first_true(until_end & valid & mask)
+
+
+def sustained_onset(mask: np.ndarray, points: int) -> np.ndarray:
+    """Start index of the first run of `points` consecutive True values, -1 if none."""
+    if mask.shape[1] < points:
+        return np.full(mask.shape[0], -1)
+    counts = np.concatenate([np.zeros((mask.shape[0], 1), dtype=np.int64),
+                             np.cumsum(mask, axis=1)], axis=1)
+    full = (counts[:, points:] - counts[:, :-points]) == points
+    return first_true(full)
+
+
+def row_windows(values: np.ndarray, t: Dict) -> np.ndarray:
+    """Per-run smoothing window: t['window'] points, or window_fraction of the run's points if larger."""
+    points = np.isfinite(values).sum(axis=1)
+    return np.maximum(t['window'], np.ceil(points * t['window_fraction'])).astype(np.int64)
+
+
+def _first_valid(values: np.ndarray) -> np.ndarray:
+    finite = np.isfinite(values)
+    index = first_true(finite)
+    return np.where(index >= 0, values[np.arange(len(values)), np.maximum(index, 0)], np.nan)
+
+
+# ----------------------------------------------------------------------
+# Detectors: each returns (onset index per run, detail per run)
+# ----------------------------------------------------------------------
+
+def detect_entropy_collapse(entropy: np.ndarray, t: Dict) -> Tuple[np.ndarray, List[str]]:
+    smoothed = rolling_mean(entropy, row_windows(entropy, t))
+    start = _first_valid(smoothed)
+    threshold = t['entropy_collapse_ratio'] * start
+    mask = smoothed < threshold[:, None]
+    onset = persistent_onset(mask, np.isfinite(smoothed))
+    details = [f"entropy {start[i]:.3f} -> {np.nanmin(smoothed[i]):.3f} (< {threshold[i]:.3f})"
+               if onset[i] >= 0 else "" for i in range(len(onset))]
+    return onset, details
+
+
+def detect_value_loss_blowup(value_loss: np.ndarray, t: Dict) -> Tuple[np.ndarray, List[str]]:
+    present = ~np.isnan(value_loss)          # inf counts as present (and as a blow-up)
+    previous = np.concatenate([np.full((len(value_loss), 1), np.nan),
+                               rolling_mean(value_loss, row_windows(value_loss, t))[:, :-1]], axis=1)
+    with np.errstate(invalid='ignore'):
+        spike = value_loss > t['value_loss_factor'] * previous
+    mask = present & (~np.isfinite(value_loss) | spike)
+    onset = first_true(mask)
+    details = []
+    for i, index in enumerate(onset):
+        if index < 0:
+            details.append("")
+        elif not np.isfinite(value_loss[i, index]):
+            details.append(f"value loss became {value_loss[i, index]}")
+        else:
+            details.append(f"value loss {value_loss[i, index]:.3g} vs trailing mean {previous[i, index]:.3g}")
+    return onset, details
+
+
+def detect_reward_regression(reward: np.ndarray, t: Dict) -> Tuple[np.ndarray, List[str]]:
+    smoothed = rolling_mean(reward, row_windows(reward, t))
+    start = _first_valid(smoothed)
+    peak = np.fmax.accumulate(np.where(np.isfinite(smoothed), smoothed, -np.inf), axis=1)
+    gain = peak - start[:, None]
+    with np.errstate(invalid='ignore'):
+        mask = (gain > 0) & (peak - smoothed > t['reward_drop_ratio'] * gain)
+    onset = persistent_onset(mask, np.isfinite(smoothed))
+    details = []
+    for i, index in enumerate(onset):
+        if index < 0:
+            details.append("")
+        else:
+            details.append(f"reward peak {peak[i, index]:.2f} -> {smoothed[i, np.isfinite(smoothed[i])][-1]:.2f} "
+                           f"(start {start[i]:.2f})")
+    return onset, details
+
+
+def detect_timeout_stuck(length: np.ndarray, t: Dict, episode_timeout: float) -> Tuple[np.ndarray, List[str]]:
+    with np.errstate(invalid='ignore'):
+        mask = length >= t['timeout_ratio'] * episode_timeout
+    onset = sustained_onset(mask, t['timeout_points'])
+    details = [f"{t['timeout_points']}+ consecutive episodes >= {t['timeout_ratio'] * episode_timeout:.0f}s"
+               if index >= 0 else "" for index in onset]
+    return onset, details
+
+
+DETECTORS = {
+    'entropy_collapse': ('entropy', detect_entropy_collapse),
+    'value_loss_blowup': ('value_loss', detect_value_loss_blowup),
+    'reward_regression': ('reward', detect_reward_regression),
+    'timeout_stuck': ('episode_length', detect_timeout_stuck),
+}
+
+
+def analyze_runs(run_series: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]], thresholds: Dict,
+                 episode_timeout: float = DEFAULT_EPISODE_TIMEOUT) -> Dict[str, List[Dict]]:
+    """Run every detector across all runs at once. Returns run_id -> list of anomalies."""
+    run_ids = list(run_series)
+    anomalies: Dict[str, List[Dict]] = {run_id: [] for run_id in run_ids}
+    for anomaly, (metric, detector) in DETECTORS.items():
+        rows = [run_id for run_id in run_ids if metric in run_series[run_id]]
+        if not rows:
+            continue
+        steps, values = stack_series([run_series[run_id][metric] for run_id in rows])
+        if anomaly == 'timeout_stuck':
+            onset, details = detector(values, thresholds, episode_timeout)
+        else:
+            onset, details = detector(values, thresholds)
+        for row in np.flatnonzero(onset >= 0):
+            anomalies[rows[row]].append({
+                'anomaly': anomaly,
+                'step': int(steps[row, onset[row]]),
+                'detail': details[row],
+            })
+    for found in anomalies.values():
+        found.sort(key=lambda a: a['step'])
+    return anomalies
+
+
+def write_output(path: Path, anomalies: Dict[str, List[Dict]]):
+    if path.suffix == '.csv':
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['run_id', 'anomaly', 'step', 'detail'])
+            for run_id, found in anomalies.items():
+                for a in found:
+                    writer.writerow([run_id, a['anomaly'], a['step'], a['detail']])
+    else:
+        with open(path, 'w') as f:
+            json.dump({'runs': anomalies}, f, indent=2)
+    print(f"[OK] Wrote {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Flag runs whose entropy collapsed, value loss blew up, reward regressed or episodes stuck at timeout.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/training_health.py                                  # All runs
+  python utils/training_health.py training_20251214_194855 -v      # One run, show series coverage
+  python utils/training_health.py --window 20 --reward-drop 0.3    # Stricter reward regression
+  python utils/training_health.py --output health.csv              # Export flagged runs
+  python utils/training_health.py --results-dir /mnt/runs/results  # Another results volume
+        """
+    )
+    parser.add_argument('runs', nargs='*', help='Run ids (default: all runs in the results directory)')
+    parser.add_argument('--window', type=int, default=DEFAULT_THRESHOLDS['window'],
+                        help=f"Minimum smoothing window in points (default: {DEFAULT_THRESHOLDS['window']})")
+    parser.add_argument('--window-fraction', type=float, default=DEFAULT_THRESHOLDS['window_fraction'],
+                        help="Grow the window to this fraction of each run's points (default: %(default)s)")
+    parser.add_argument('--entropy-ratio', type=float, default=DEFAULT_THRESHOLDS['entropy_collapse_ratio'],
+                        help='Collapse when smoothed entropy < ratio x start (default: %(default)s)')
+    parser.add_argument('--value-loss-factor', type=float, default=DEFAULT_THRESHOLDS['value_loss_factor'],
+                        help='Blow-up when value loss > factor x trailing mean (default: %(default)s)')
+    parser.add_argument('--reward-drop', type=float, default=DEFAULT_THRESHOLDS['reward_drop_ratio'],
+                        help='Regression when reward lost > ratio of its start-to-peak gain (default: %(default)s)')
+    parser.add_argument('--episode-timeout', type=float, default=DEFAULT_EPISODE_TIMEOUT,
+                        help='Episode timeout in seconds (default: %(default)s, CharacterConfig.episodeTimeout)')
+    parser.add_argument('--timeout-points', type=int, default=DEFAULT_THRESHOLDS['timeout_points'],
+                        help='Consecutive timed-out episodes to flag (default: %(default)s)')
+    parser.add_argument('--output', type=str, default=None, help='Write anomalies to .json or .csv')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Show which series each run has')
+    parser.add_argument('--results-dir', type=str, default=None,
+                        help='Path to results directory (default: src/results relative to project root)')
+    
+    args = parser.parse_args()
+    
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    thresholds.update({
+        'window': args.window,
+        'window_fraction': args.window_fraction,
+        'entropy_collapse_ratio': args.entropy_ratio,
+        'value_loss_factor': args.value_loss_factor,
+        'reward_drop_ratio': args.reward_drop,
+        'timeout_points': args.timeout_points,
+    })
+    
+    results_dir = RESULTS_DIR
+    if args.results_dir is not None:
+        results_dir = Path(args.results_dir)
+        if not results_dir.is_absolute():
+            results_dir = RESULTS_DIR.parent.parent / results_dir
+    if not results_dir.exists():
+        print(f"[ERROR] Results directory not found: {results_dir}")
+        sys.exit(2)
+    
+    if args.runs:
+        roots = []
+        for run_id in args.runs:
+            root = open_run(results_dir, run_id)
+            if root is None:
+                print(f"[ERROR] Run not found: {run_id}")
+                sys.exit(2)
+            roots.append(root)
+    else:
+        roots = list_runs(results_dir)
+    
+    run_series = {root.name: load_run_series(root) for root in roots}
+    with_series = {run_id: series for run_id, series in run_series.items() if series}
+    anomalies = analyze_runs(with_series, thresholds, args.episode_timeout)
+    
+    print("=" * 100)
+    print("TRAINING HEALTH REPORT")
+    print("=" * 100)
+    print(f"Runs: {len(run_series)} ({len(with_series)} with scalar series)")
+    flagged = {run_id: found for run_id, found in anomalies.items() if found}
+    print(f"[WARN] Flagged: {len(flagged)}" if flagged else "[OK] Flagged: 0")
+    print()
+    
+    for run_id in sorted(with_series):
+        found = anomalies[run_id]
+        if found:
+            print(f"[FAIL] {run_id}")
+            for a in found:
+                print(f"      - {a['anomaly']:<18} from step {a['step']:>10,}  {a['detail']}")
+        elif args.verbose or args.runs:
+            print(f"[OK] {run_id}")
+        if args.verbose:
+            coverage = ', '.join(f"{m} ({len(with_series[run_id][m][0])} pts)"
+                                 for m in METRICS if m in with_series[run_id])
+            print(f"      series: {coverage}")
+    
+    if args.output:
+        print()
+        write_output(Path(args.output), {run_id: found for run_id, found in anomalies.items() if found})
+    
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()